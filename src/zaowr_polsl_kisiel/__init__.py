@@ -4,17 +4,17 @@ image processing, calculation of disparity/depth maps, calculation of optical fl
 
 Modules:
 
-- `calibration`: Tools for single and stereo camera calibration.
+- `calibration`: Tools for single and stereo camera calibration (including the coverage-driven selection of the calibration views).
 
-- `content_loaders`: Functions to load and validate calibration data from files, load the ground truth `.pgm` or `.pfm` file,  save the disparity map, write a .ply file and load depth map calibration.
+- `content_loaders`: Functions to load and validate calibration data from files, load the ground truth `.pgm` or `.pfm` file,  save the disparity map, write (point clouds and meshes) and load a .ply file, save and load rectification maps (binary, memory-mapped) and load depth map calibration.
 
 - `custom_exceptions`: Custom exceptions for error handling.
 
-- `image_processing`: Utilities for image rectification, distortion removal, disparity map calculation, color difference map calculation, disparity map comparison, depth map conversion (disparity to depth), disparity map normalization, depth map normalization, depth map to disparity map conversion, depth map decoding, color point cloud creation.
+- `image_processing`: Utilities for image rectification (single pair, whole session or video stream) and rectification quality check, distortion removal (single image or whole directory), disparity map calculation, color difference map calculation, disparity map comparison, depth map conversion (disparity to depth), disparity map normalization, depth map normalization, depth map to disparity map conversion, depth map decoding, color point cloud creation, point cloud downsampling and outlier removal, triangle mesh creation, export of point cloud sequences, depth map fusion (TSDF).
 
 - `optical_flow`: Tools to calculate the Optical Flow using **Sparse** (Shi-Tomasi corner detection and Lucas-Kanade optical flow) and **Dense** (Farneback optical flow) Optical Flow** algorithms. Tool to list available camera ports and the ones that are working (and can be used as a feed fot the optical flow algorithms).
 
-- `tools`: Additional tools, such as ArUco dictionary identification, performance measurement, image cropping, image display using matplotlib, get points form photo using mouse click (pixel coordinates), get map value for points (e.g. disparity, depth).
+- `tools`: Additional tools, such as ArUco dictionary identification, performance measurement, image cropping, image display using matplotlib, get points form photo using mouse click (pixel coordinates), get map value for points (e.g. disparity, depth), region statistics of depth maps (summed-area tables), spatial index over point clouds (radius, k-nearest and box queries).
 
 Status: Development
 
@@ -49,6 +49,7 @@ from .calibration import (
     calibrate_camera, # calibrate single camera
     stereo_calibration, # stereo calibration
     calculate_fov, # calculate fov - horizontal and vertical
+    select_calibration_views, # select the calibration views covering the image and the poses of the board
 )
 
 from . import custom_exceptions
@@ -60,18 +61,25 @@ from .content_loaders import (
     save_calibration, # save calibration parameters (used for all types of params - single, stereo, rectification, etc.)
     load_calibration, # load calibration parameters for single camera
     load_stereo_calibration, # load stereo calibration
-    load_rectification_maps, # load rectification maps
+    load_rectification_maps, # load rectification maps (binary map store or JSON)
+    save_rectification_maps, # save rectification maps to the binary map store
+    rectification_maps_key, # key (hash of the stereo calibration) of the rectification maps in the binary map store
     save_disparity_map, # save disparity map
     load_pgm_file, # load the ground truth .pgm file
     load_pfm_file, # load the ground truth .pfm file
     write_ply_file, # write .ply file
+    load_ply_file, # load .ply file (memory-mapped if binary)
     load_depth_map_calibration, # load depth map calibration
 )
 
 from . import image_processing
 from .image_processing import (
     remove_distortion, # remove distortion from single image
+    remove_distortion_batch, # remove distortion from all images in a directory (threaded)
     stereo_rectify, # rectify stereo image after stereo calibration
+    stereo_rectify_batch, # rectify all stereo pairs of a session (threaded)
+    stereo_rectify_stream, # rectify a synchronized stereo video stream (generator)
+    check_rectification_quality, # check the stereo rectification on the detected corners
     calculate_disparity_map, # calculate disparity map using StereoBM, StereoSGBM, Custom Block Matching
     calculate_color_difference_map, # calculate color difference map
     plot_disparity_map_comparison, # plot disparity map comparison
@@ -81,6 +89,11 @@ from .image_processing import (
     depth_to_disparity_map, # convert depth map to disparity map
     decode_depth_map, # decode depth map
     create_color_point_cloud, # create color point cloud with specified max depth
+    voxel_downsample, # downsample point cloud using a voxel grid
+    remove_point_cloud_outliers, # remove outliers from point cloud (grid-accelerated)
+    create_depth_mesh, # create colored triangle mesh from disparity map (streamed in bands)
+    export_ply_sequence, # convert a sequence of disparity frames (folder or video) to a sequence of PLY files
+    TSDFVolume, # fuse depth maps and camera poses into a sparse voxel-hashed TSDF (point cloud / mesh extraction)
 )
 
 from . import optical_flow
@@ -103,4 +116,6 @@ from .tools import (
     get_image_points, # get points form photo using mouse click (pixel coordinates)
     get_map_value_for_points, # get map value for points (e.g. disparity, depth)
     configure_qt_platform, # configure the `QT_QPA_PLATFORM` environment variable to 'xcb' on Linux (suppress warnings about Wayland plugins)
+    RegionDepthStatistics, # region statistics (mean, std, median) of a depth map using summed-area tables
+    PointCloudIndex, # spatial index over a point cloud (radius, k-nearest and box queries)
 )
\ No newline at end of file
@@ -10,6 +10,8 @@ Functions:
 
 - `calculate_fov`: Calculates the horizontal and vertical field of view of a camera.
 
+- `select_calibration_views`: Selects a subset of the calibration views covering the image and the poses of the board.
+
 Usage:
     - Import this module to perform calibration-related operations on camera systems.
     - Use the functions provided to calibrate single cameras and stereo camera systems for depth estimation.
@@ -19,7 +21,9 @@ __all__ = [
     "calibrate_camera",
     "stereo_calibration",
     "calculate_fov",
+    "select_calibration_views",
 ]
 
 from .calibrate_camera import calibrate_camera  # calibrate single camera
 from .stereo_calibration import stereo_calibration, calculate_fov  # stereo calibration and FOV
+from .select_calibration_views import select_calibration_views  # greedy max-coverage selection of the calibration views
@@ -10,10 +10,43 @@ from sys import stdout
 from os.path import basename
 
 
+from .corner_detection import _detect_corners, _skip_reason
+from .reprojection import _calibrate_views
+from .select_calibration_views import select_calibration_views
 from ..custom_exceptions.exceptions import CalibrationImagesNotFound, CalibrationParamsPathNotProvided, CharucoCalibrationError
 
 colorama_init(autoreset=True)
 
+
+def _load_previous_calibration(
+        previousCalibrationParamsPath: str,
+        objP: np.ndarray = None
+) -> tuple[list, list, np.ndarray, np.ndarray]:
+    """
+    Load the previous calibration of the camera for the incremental calibration - the intrinsics (the initial guess of
+    the solve) and, for chessboards (`objP` provided), the detected corners of the previous views.
+
+    :raises ValueError: If the previous views were taken with a different chessboard.
+
+    :return: Object points and image points of the previous views, camera matrix and distortion coefficients.
+    """
+    from ..content_loaders import load_calibration
+
+    print(Fore.GREEN + "\nLoading the previous calibration parameters...")
+
+    previousCalibrationParams = load_calibration(previousCalibrationParamsPath)
+
+    if objP is None:
+        return [], [], previousCalibrationParams["cameraMatrix"], previousCalibrationParams["distortionCoefficients"]
+
+    objPoints = [np.asarray(obj, dtype=np.float32).reshape(-1, 3) for obj in previousCalibrationParams["objPoints"]]
+    imgPoints = [np.asarray(img, dtype=np.float32).reshape(-1, 1, 2) for img in previousCalibrationParams["imgPoints"]]
+
+    if any(obj.shape != objP.shape or not np.allclose(obj, objP) for obj in objPoints):
+        raise ValueError("Invalid previous calibration. The previous views were taken with a different chessboard.")
+
+    return objPoints, imgPoints, previousCalibrationParams["cameraMatrix"], previousCalibrationParams["distortionCoefficients"]
+
 def calibrate_camera(
     chessBoardSize: tuple[int, int],
     squareRealDimensions: float,
@@ -34,6 +67,16 @@ def calibrate_camera(
     charucoDictName: str = "DICT_6X6_250",
     markerLength: float = 20.0,
     displayIds: bool = False,
+    workers: int = 1,
+    cornerCacheDirPath: str = "",
+    detectionScale: int = 1,
+    minSharpness: float = 0.0,
+    fastCheck: bool = False,
+    selectViews: bool = False,
+    maxViews: int = None,
+    pruneOutliers: bool = False,
+    pruneTimeBudget: float = 30.0,
+    previousCalibrationParamsPath: str = "",
 ) -> None:
     """
     Calibrate the camera using chessboard images or ChArUco board images. Optionally, save the calibration parameters
@@ -50,7 +93,7 @@ def calibrate_camera(
     :param bool saveCalibrationParams: If True, save the calibration parameters to a JSON file. Defaults to False.
     :param str calibrationParamsPath: Path to save the calibration parameters, required if saveCalibrationParams is True.
     :param bool displayFoundCorners: If True, displays the calibration images with detected corners. Defaults to False.
-    :param bool displayMSE: If True, prints the Mean Square Error (MSE) for each image during calibration. Defaults to False.
+    :param bool displayMSE: If True, prints the mean squared reprojection error (px^2) of all corners and the RMS reprojection error of every view. Defaults to False.
     :param bool improveSubPix: If True, refines the detected corners to sub-pixel precision. Defaults to True.
     :param bool showListOfImagesWithChessboardFound: If True, prints the list of images where a chessboard was detected.
         Defaults to False.
@@ -61,12 +104,22 @@ def calibrate_camera(
     :param float markerLength: The length of the ArUco marker side in real-world units. Only applicable if `useCharuco`
         is True. Defaults to 20.0.
     :param bool displayIds: If True and `useCharuco` is enabled, displays corner IDs alongside detected corners of the chessboard (ids on markers are always shown). Defaults to False.
+    :param int workers: Number of processes detecting the corners. With more than 1 worker the images are processed in parallel (the detector is rebuilt in every process), the results are collected in the order of the files, so the calibration is the same as with 1 worker. Defaults to 1 (serial detection).
+    :param str cornerCacheDirPath: Directory of the corner-detection cache. If provided, the detected corners are saved there (one compressed `.npz` per image, keyed by the image path, modification time and size, the board geometry and the detector parameters) and reused by the following runs, so a re-calibration with different flags does not repeat the detection. Defaults to "" (no cache).
+    :param int detectionScale: Coarse-to-fine chessboard detection - the board is searched for in the image reduced `detectionScale` times already during decoding (1, 2, 4 or 8), the found corners are scaled back and refined with `cv.cornerSubPix` at the full resolution (always, regardless of `improveSubPix`). Images without the board are never decoded at the full resolution. Not supported for ChArUco boards. Defaults to 1 (detection at the full resolution).
+    :param float minSharpness: Prefilter - images with the variance of the Laplacian (computed on a thumbnail resized to 640 px on the longer side, whatever the resolution and `detectionScale`) lower than `minSharpness` are rejected as blurred before the detection. Defaults to 0.0 (disabled).
+    :param bool fastCheck: Prefilter - images in which `cv.findChessboardCorners` with `cv.CALIB_CB_FAST_CHECK` does not find the chessboard in the thumbnail are rejected before the full detection (useful for frames of a video, most of which do not contain the board). Not supported for ChArUco boards. Defaults to False.
+    :param bool selectViews: Calibrate on a subset of the views selected by `select_calibration_views` (greedy max-coverage of the image and of the poses of the board) instead of all the views with the board found - many near-duplicate views (e.g. frames of a video) make the calibration slow without improving the accuracy. Defaults to False.
+    :param int maxViews: Maximum number of the views selected if `selectViews` is True. Defaults to None (as many as needed for the full coverage).
+    :param bool pruneOutliers: Iteratively remove the view with the largest reprojection error and recalibrate, as long as the RMS error drops by at least 1% (at least 3 views are kept). Defaults to False.
+    :param float pruneTimeBudget: Time budget of the pruning in seconds (checked before every recalibration). Defaults to 30.0.
+    :param str previousCalibrationParamsPath: Path to the parameters of a previous calibration of the camera (saved by this function) for the incremental calibration - only the images in `calibImgDirPath` (the new views) are processed, the corners of the previous views are taken from the file (chessboard only - the parameters of ChArUco calibrations do not keep the views, so only the new views are used) and the solve is warm-started from the previous intrinsics with `cv.CALIB_USE_INTRINSIC_GUESS`. Defaults to "" (calibration from scratch).
 
     :return: None
 
     :raises CalibrationImagesNotFound: If no images are found in the specified directory.
     :raises CharucoCalibrationError: If ChArUco marker detection fails or no valid markers are detected.
-    :raises ValueError: If an invalid ArUco dictionary name is provided when `useCharuco` is True.
+    :raises ValueError: If an invalid ArUco dictionary name is provided when `useCharuco` is True, `workers` is not a positive integer, `detectionScale` is invalid or the previous calibration used a different chessboard.
 
     Notes:
     - Calibration assumes that all images are taken with the same camera and resolution.
@@ -87,36 +140,32 @@ def calibrate_camera(
 
     if useCharuco:
         try:
-            arucoDict = getattr(aruco, charucoDictName)
-            dictionary = aruco.getPredefinedDictionary(arucoDict)
-            board = aruco.CharucoBoard(chessBoardSize, squareRealDimensions, markerLength, dictionary)
-            # board.setLegacyPattern(True)  # comment this line to create the new template
-
-            # Set up the charuco detector
-            charucoParams = aruco.CharucoParameters()
-            detectorParams = aruco.DetectorParameters()
-            refineParams = aruco.RefineParameters()
-
-            if improveSubPix:
-                charucoParams.tryRefineMarkers = True
-                charucoParams.minMarkers = 0
-                detectorParams.adaptiveThreshConstant = 19
-                detectorParams.cornerRefinementMethod = aruco.CORNER_REFINE_SUBPIX
-                detectorParams.cornerRefinementMinAccuracy = 0.001
-                detectorParams.cornerRefinementMaxIterations = 30
-                detectorParams.cornerRefinementWinSize = 11
-
-            charucoDetector = aruco.CharucoDetector(board, charucoParams, detectorParams, refineParams)
-            charucoDetector.setBoard(board)
-
             objPoints = []  # 3D points in real world space
             imgPoints = []  # 2D points in image plane
             imgSize = None
             chessboardFound = []
             chessboardSkipped = []
+            chessboardRejected = {}  # images rejected by the prefilter
+
+            detections = _detect_corners(
+                images,
+                chessBoardSize,
+                squareRealDimensions,
+                improveSubPix=improveSubPix,
+                terminationCriteria=terminationCriteria,
+                useCharuco=True,
+                charucoDictName=charucoDictName,
+                markerLength=markerLength,
+                workers=workers,
+                cacheDirPath=cornerCacheDirPath,
+                detectionScale=detectionScale,
+                minSharpness=minSharpness,
+                fastCheck=fastCheck,
+            )
 
-            for fileName in tqdm(
-                    images,
+            for detection in tqdm(
+                    detections,
+                    total=len(images),
                     desc=Style.RESET_ALL + "Processing images...",
                     dynamic_ncols=True,
                     bar_format="{l_bar}{bar}{r_bar}",
@@ -125,29 +174,27 @@ def calibrate_camera(
                     position=0
             ):
 
+                fileName = detection["fileName"]
                 baseFileName = basename(fileName)
-                img = cv.imread(fileName)
-                grayImg = cv.cvtColor(img, cv.COLOR_BGR2GRAY)
 
                 if imgSize is None:
-                    imgSize = grayImg.shape[::-1]
+                    imgSize = detection["imgSize"]
 
                 tqdm.write(Fore.GREEN + f"\nProcessing image '{baseFileName}'.", nolock=True, file=stdout)
 
-                charucoCorners, charucoIds, arucoCorners, arucoIds = charucoDetector.detectBoard(grayImg)
-
-                if (
-                        (charucoCorners is None) or (len(charucoCorners) <= 0)
-                        or (charucoIds is None) or (len(charucoIds) <= 0)
-                        or (arucoCorners is None) or (len(arucoCorners) <= 0)
-                        or (arucoIds is None) or (len(arucoIds) <= 4)
-                ):
-                    tqdm.write(Fore.RED + f"Skipped image '{baseFileName}' due to insufficient ChArUco markers.", nolock=True, file=stdout)
+                if not detection["found"]:
+                    tqdm.write(Fore.RED + f"Skipped image '{baseFileName}' {_skip_reason(detection, 'due to insufficient ChArUco markers')}.", nolock=True, file=stdout)
                     chessboardSkipped.append(baseFileName)
+                    if detection["rejectedBy"] is not None:
+                        chessboardRejected[baseFileName] = detection["rejectedBy"]
                     continue
 
                 tqdm.write(Fore.GREEN + f"Success!", nolock=True, file=stdout)
                 if displayFoundCorners:
+                    img = cv.imread(fileName)
+                    charucoCorners, charucoIds = detection["charucoCorners"], detection["charucoIds"]
+                    arucoCorners, arucoIds = detection["arucoCorners"], detection["arucoIds"]
+
                     if displayIds:
                         imgWithMarkers = aruco.drawDetectedMarkers(img, arucoCorners, arucoIds)
 
@@ -163,11 +210,9 @@ def calibrate_camera(
                     cv.imshow("Detected ChArUco Markers", imgWithMarkers)
                     cv.waitKey(0)
 
-                objectPoints, imagePoints = board.matchImagePoints(charucoCorners, charucoIds)
-
                 chessboardFound.append(baseFileName)
-                objPoints.append(objectPoints)
-                imgPoints.append(imagePoints)
+                objPoints.append(detection["objPoints"])
+                imgPoints.append(detection["imgPoints"])
 
 
 
@@ -177,30 +222,31 @@ def calibrate_camera(
             if not objPoints or not imgPoints:
                 raise ValueError("No valid chessboard patterns found in the provided images.")
 
+            previousCameraMatrix, previousDistortionCoefficients = None, None
+            if previousCalibrationParamsPath:
+                _, _, previousCameraMatrix, previousDistortionCoefficients = _load_previous_calibration(previousCalibrationParamsPath)
+                print(Fore.YELLOW + "\nThe previous ChArUco views are not stored in the calibration parameters, only the intrinsics are reused")
+
+            if selectViews:
+                selected = select_calibration_views(objPoints, imgPoints, imgSize, maxViews=maxViews)["selected"]
+                objPoints = [objPoints[i] for i in selected]
+                imgPoints = [imgPoints[i] for i in selected]
+
             print(Fore.GREEN + "\nCalibrating camera...")
-            rms, cameraMatrix, distortionCoefficients, rotationVectors, translationVectors = cv.calibrateCamera(
-                    objPoints,
-                    imgPoints,
-                    imgSize,
-                    None,
-                    None
-                )
+            views, calibration, errors = _calibrate_views(
+                objPoints, imgPoints, imgSize, pruneOutliers, pruneTimeBudget, previousCameraMatrix, previousDistortionCoefficients
+            )
+            rms, cameraMatrix, distortionCoefficients, rotationVectors, translationVectors = calibration
 
-            mse = 0
-            for i in range(len(objPoints)):
-                imgPoints2, _ = cv.projectPoints(
-                    objPoints[i],
-                    rotationVectors[i],
-                    translationVectors[i],
-                    cameraMatrix,
-                    distortionCoefficients,
-                )
-                error = cv.norm(imgPoints[i], imgPoints2, cv.NORM_L2) / len(imgPoints2)
-                mse += error
+            if len(views) < len(objPoints):
+                print(Fore.YELLOW + f"\nPruned {len(objPoints) - len(views)} views with the largest reprojection errors (RMS: {errors['rms']:.4f} px)")
+                objPoints = [objPoints[i] for i in views]
+                imgPoints = [imgPoints[i] for i in views]
 
-            mse = mse / len(objPoints)
+            mse = errors["mse"]
             if displayMSE:
-                print(f"\nMean reprojection error: {mse}")
+                print(f"\nMean squared reprojection error: {mse}")
+                print(f"Reprojection error of the views (RMS): {np.round(errors['perView'], 4).tolist()}")
 
             if saveCalibrationParams:
                 try:
@@ -254,26 +300,36 @@ def calibrate_camera(
         imgSize = None
         chessboardFound = [] # list of images with chessboard detected properly
         chessboardSkipped = []
+        chessboardRejected = {}  # images rejected by the prefilter
+
+        detections = _detect_corners(
+            images,
+            chessBoardSize,
+            squareRealDimensions,
+            improveSubPix=improveSubPix,
+            terminationCriteria=terminationCriteria,
+            workers=workers,
+            cacheDirPath=cornerCacheDirPath,
+            detectionScale=detectionScale,
+            minSharpness=minSharpness,
+            fastCheck=fastCheck,
+        )
 
-        for fileName in tqdm(images, desc=Style.RESET_ALL + "Processing images...", dynamic_ncols=True, bar_format="{l_bar}{bar}{r_bar}", colour="green", file=stdout, position=0):
+        for detection in tqdm(detections, total=len(images), desc=Style.RESET_ALL + "Processing images...", dynamic_ncols=True, bar_format="{l_bar}{bar}{r_bar}", colour="green", file=stdout, position=0):
 
+            fileName = detection["fileName"]
             baseFileName = basename(fileName)
-            img = cv.imread(fileName)
-            grayImg = cv.cvtColor(img, cv.COLOR_BGR2GRAY)
 
             if imgSize is None:
-                imgSize = grayImg.shape[::-1]
+                imgSize = detection["imgSize"]
 
             tqdm.write(Fore.GREEN + f"\nProcessing image '{baseFileName}'.", nolock=True, file=stdout)
 
-            # Find the chess board corners
-            ret, corners = cv.findChessboardCorners(
-                grayImg, (chessBoardSize[0], chessBoardSize[1]), None
-            )
-
-            if not ret:
-                tqdm.write(Fore.RED + f"Skipped image '{baseFileName}' because corners were not found.", nolock=True, file=stdout)
+            if not detection["found"]:
+                tqdm.write(Fore.RED + f"Skipped image '{baseFileName}' {_skip_reason(detection, 'because corners were not found')}.", nolock=True, file=stdout)
                 chessboardSkipped.append(baseFileName)
+                if detection["rejectedBy"] is not None:
+                    chessboardRejected[baseFileName] = detection["rejectedBy"]
                 continue
 
             tqdm.write(Fore.GREEN + f"Success!", nolock=True, file=stdout)
@@ -281,45 +337,58 @@ def calibrate_camera(
             chessboardFound.append(baseFileName)
             objPoints.append(objP)
 
-            if improveSubPix:
-                corners = cv.cornerSubPix(
-                    grayImg, corners, (11, 11), (-1, -1), terminationCriteria
-                )
+            # Refined to sub-pixel precision during the detection (if `improveSubPix` is True)
+            corners = detection["corners"]
 
             imgPoints.append(corners)
 
             if displayFoundCorners:
                 # Draw and display the corners
+                img = cv.imread(fileName)
                 cv.drawChessboardCorners(
-                    img, (chessBoardSize[0], chessBoardSize[1]), corners, ret
+                    img, (chessBoardSize[0], chessBoardSize[1]), corners, True
                 )
                 cv.imshow("Current Image", img)
                 cv.waitKey(500)
 
+        previousCameraMatrix, previousDistortionCoefficients = None, None
+        if previousCalibrationParamsPath:
+            previousObjPoints, previousImgPoints, previousCameraMatrix, previousDistortionCoefficients = _load_previous_calibration(
+                previousCalibrationParamsPath, objP
+            )
+            print(Fore.GREEN + f"\nAdding {len(objPoints)} new views to {len(previousObjPoints)} views of the previous calibration...")
+
+            objPoints = previousObjPoints + objPoints
+            imgPoints = previousImgPoints + imgPoints
+
+            if imgSize is None:
+                imgSize = cv.imread(images[0]).shape[1::-1]
+
         if not objPoints or not imgPoints:
             raise ValueError("No valid chessboard patterns found in the provided images.")
 
+        if selectViews:
+            selected = select_calibration_views(objPoints, imgPoints, imgSize, maxViews=maxViews)["selected"]
+            objPoints = [objPoints[i] for i in selected]
+            imgPoints = [imgPoints[i] for i in selected]
+
         # overall RMS re-projection error, camera matrix, distortion coefficients, rotation vectors, translation vectors
         print(Fore.GREEN + "\nCalibrating camera...")
-        rms, cameraMatrix, distortionCoefficients, rotationVectors, translationVectors = (
-            cv.calibrateCamera(objPoints, imgPoints, imgSize, None, None)
+        views, calibration, errors = _calibrate_views(
+            objPoints, imgPoints, imgSize, pruneOutliers, pruneTimeBudget, previousCameraMatrix, previousDistortionCoefficients
         )
+        rms, cameraMatrix, distortionCoefficients, rotationVectors, translationVectors = calibration
 
-        mse = 0
-        for i in range(len(objPoints)):
-            imgPoints2, _ = cv.projectPoints(
-                objPoints[i],
-                rotationVectors[i],
-                translationVectors[i],
-                cameraMatrix,
-                distortionCoefficients,
-            )
-            error = cv.norm(imgPoints[i], imgPoints2, cv.NORM_L2) / len(imgPoints2)
-            mse += error
+        if len(views) < len(objPoints):
+            print(Fore.YELLOW + f"\nPruned {len(objPoints) - len(views)} views with the largest reprojection errors (RMS: {errors['rms']:.4f} px)")
+            objPoints = [objPoints[i] for i in views]
+            imgPoints = [imgPoints[i] for i in views]
 
-        mse = mse / len(objPoints)
+        # Mean of the squared reprojection errors of all corners (px^2)
+        mse = errors["mse"]
         if displayMSE:
-            print(f"\nMean reprojection error: {mse}")
+            print(f"\nMean squared reprojection error: {mse}")
+            print(f"Reprojection error of the views (RMS): {np.round(errors['perView'], 4).tolist()}")
 
         if saveCalibrationParams:
             try:
@@ -354,4 +423,7 @@ def calibrate_camera(
         print(Fore.GREEN + "\nList of images with chessboard found:\n")
         print(chessboardFound)
         print(Fore.RED + "\nList of images skipped:\n")
-        print(chessboardSkipped)
\ No newline at end of file
+        print(chessboardSkipped)
+        if chessboardRejected:
+            print(Fore.YELLOW + "\nList of images rejected by the prefilter:\n")
+            print(chessboardRejected)
\ No newline at end of file
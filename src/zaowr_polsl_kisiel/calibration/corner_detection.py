@@ -0,0 +1,538 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha1
+from json import dumps as jdumps
+from typing import Any, Iterator
+
+import cv2 as cv
+import numpy as np
+from cv2 import aruco
+
+# Flags of `cv.imread` decoding the image directly at a reduced size (coarse-to-fine detection)
+_REDUCED_GRAYSCALE = {
+    2: cv.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+# Longer side of the thumbnail used by the prefilter - every image (full or reduced, see `detectionScale`) is resized to it,
+# so the thresholds do not depend on the resolution of the images
+_THUMBNAIL_SIZE = 640
+
+# Descriptions of the prefilters (`rejectedBy` of the detection results)
+_PREFILTERS = {
+    "blur": "blurred image",
+    "fastCheck": "no chessboard found by the fast check",
+}
+
+# State of the detection in the current process (set by `_init_worker` in the worker processes)
+_workerState: dict[str, Any] = {}
+
+
+def _prepare_detection(
+        detectionParams: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    Build everything needed to detect the corners from the (picklable) description of the board - the ChArUco board
+    and detector (OpenCV objects can not be sent to other processes, so every worker builds its own).
+
+    :raises AttributeError: If the ArUco dictionary name is invalid.
+    """
+    state = dict(detectionParams)
+
+    if detectionParams["useCharuco"]:
+        arucoDict = getattr(aruco, detectionParams["charucoDictName"])
+        dictionary = aruco.getPredefinedDictionary(arucoDict)
+        board = aruco.CharucoBoard(
+            detectionParams["chessBoardSize"], detectionParams["squareRealDimensions"], detectionParams["markerLength"], dictionary
+        )
+        # board.setLegacyPattern(True)  # comment this line to create the new template
+
+        # Set up the charuco detector
+        charucoParams = aruco.CharucoParameters()
+        detectorParams = aruco.DetectorParameters()
+        refineParams = aruco.RefineParameters()
+
+        if detectionParams["improveSubPix"]:
+            charucoParams.tryRefineMarkers = True
+            charucoParams.minMarkers = 0
+            detectorParams.adaptiveThreshConstant = 19
+            detectorParams.cornerRefinementMethod = aruco.CORNER_REFINE_SUBPIX
+            detectorParams.cornerRefinementMinAccuracy = 0.001
+            detectorParams.cornerRefinementMaxIterations = 30
+            detectorParams.cornerRefinementWinSize = 11
+
+        charucoDetector = aruco.CharucoDetector(board, charucoParams, detectorParams, refineParams)
+        charucoDetector.setBoard(board)
+
+        state["board"] = board
+        state["charucoDetector"] = charucoDetector
+
+    return state
+
+
+def _prefilter(
+        grayImg: np.ndarray,
+        state: dict[str, Any],
+        result: dict[str, Any]
+) -> bool:
+    """
+    Cheap rejection of unusable images (e.g. frames of a video) before the full detection. Both checks are done on
+    a thumbnail (longer side of `_THUMBNAIL_SIZE` pixels, smaller images - e.g. reduced by `detectionScale` - are scaled up):
+
+    - **blur** - the variance of the Laplacian (`sharpness` of the result) is lower than `minSharpness`,
+    - **fastCheck** - `cv.findChessboardCorners` with `cv.CALIB_CB_FAST_CHECK` does not find the chessboard.
+
+    The name of the filter that rejected the image is set as `rejectedBy` of the result.
+
+    :return: True if the image was rejected.
+    """
+    if state["minSharpness"] <= 0 and not state["fastCheck"]:
+        return False
+
+    scale = _THUMBNAIL_SIZE / max(grayImg.shape)
+    if scale == 1:
+        thumbnail = grayImg
+
+    else:
+        thumbnail = cv.resize(grayImg, None, fx=scale, fy=scale, interpolation=cv.INTER_AREA if scale < 1 else cv.INTER_LINEAR)
+
+    if state["minSharpness"] > 0:
+        result["sharpness"] = float(cv.Laplacian(thumbnail, cv.CV_64F).var())
+
+        if result["sharpness"] < state["minSharpness"]:
+            result["rejectedBy"] = "blur"
+            return True
+
+    if state["fastCheck"]:
+        chessBoardSize = state["chessBoardSize"]
+        ret, _ = cv.findChessboardCorners(
+            thumbnail, (chessBoardSize[0], chessBoardSize[1]),
+            cv.CALIB_CB_ADAPTIVE_THRESH + cv.CALIB_CB_NORMALIZE_IMAGE + cv.CALIB_CB_FAST_CHECK
+        )
+
+        if not ret:
+            result["rejectedBy"] = "fastCheck"
+            return True
+
+    return False
+
+
+def _skip_reason(
+        detection: dict[str, Any],
+        notFound: str
+) -> str:
+    """
+    Reason of skipping the image for the report - the prefilter that rejected it, or `notFound` if the full detection failed.
+    """
+    if detection.get("rejectedBy") is None:
+        return notFound
+
+    reason = _PREFILTERS[detection["rejectedBy"]]
+    if detection["rejectedBy"] == "blur":
+        reason += f", sharpness {detection['sharpness']:.1f}"
+
+    return f"rejected by the {detection['rejectedBy']} prefilter ({reason})"
+
+
+def _detect_image(
+        fileName: str,
+        state: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    Detect the chessboard (or ChArUco board) corners in a single image.
+
+    With `detectionScale > 1` (chessboard only) the board is searched for in a copy of the image reduced already during
+    decoding (`cv.IMREAD_REDUCED_GRAYSCALE_<scale>`), the full image is read only if the board was found - the corners
+    are scaled back to the full resolution and always refined with `cv.cornerSubPix` there. Unusable images are rejected
+    by `_prefilter` before the detection (if enabled).
+
+    :return: Dictionary with the file name, image size (None if the full image was not read), whether the board was found, the prefilter that rejected the image (**rejectedBy**, None if not rejected) and the detected points (chessboard: **corners**; ChArUco: **objPoints**, **imgPoints**, **charucoCorners**, **charucoIds**, **arucoCorners**, **arucoIds**).
+    """
+    result = {
+        "fileName": fileName,
+        "imgSize": None,
+        "found": False,
+        "rejectedBy": None,
+    }
+
+    if state["useCharuco"]:
+        grayImg = cv.cvtColor(cv.imread(fileName), cv.COLOR_BGR2GRAY)
+        result["imgSize"] = grayImg.shape[::-1]
+
+        if _prefilter(grayImg, state, result):
+            return result
+
+        charucoCorners, charucoIds, arucoCorners, arucoIds = state["charucoDetector"].detectBoard(grayImg)
+
+        if (
+                (charucoCorners is None) or (len(charucoCorners) <= 0)
+                or (charucoIds is None) or (len(charucoIds) <= 0)
+                or (arucoCorners is None) or (len(arucoCorners) <= 0)
+                or (arucoIds is None) or (len(arucoIds) <= 4)
+        ):
+            return result
+
+        objectPoints, imagePoints = state["board"].matchImagePoints(charucoCorners, charucoIds)
+
+        result.update(
+            found=True,
+            objPoints=objectPoints,
+            imgPoints=imagePoints,
+            charucoCorners=charucoCorners,
+            charucoIds=charucoIds,
+            arucoCorners=arucoCorners,
+            arucoIds=arucoIds,
+        )
+
+    else:
+        chessBoardSize = state["chessBoardSize"]
+        detectionScale = state["detectionScale"]
+
+        if detectionScale > 1:
+            # Coarse detection - most of the time is spent in images without the board, they are never read in full
+            reducedImg = cv.imread(fileName, _REDUCED_GRAYSCALE[detectionScale])
+
+            if _prefilter(reducedImg, state, result):
+                return result
+
+            ret, corners = cv.findChessboardCorners(reducedImg, (chessBoardSize[0], chessBoardSize[1]), None)
+
+            if not ret:
+                return result
+
+            grayImg = cv.cvtColor(cv.imread(fileName), cv.COLOR_BGR2GRAY)
+
+            # Pixel `i` of the reduced image covers the pixels `[i * scale, (i + 1) * scale)` of the full image
+            corners = (corners + 0.5) * detectionScale - 0.5
+            improveSubPix = True
+
+        else:
+            grayImg = cv.cvtColor(cv.imread(fileName), cv.COLOR_BGR2GRAY)
+
+            if _prefilter(grayImg, state, result):
+                result["imgSize"] = grayImg.shape[::-1]
+                return result
+
+            # Find the chess board corners
+            ret, corners = cv.findChessboardCorners(
+                grayImg, (chessBoardSize[0], chessBoardSize[1]), None
+            )
+
+            if not ret:
+                result["imgSize"] = grayImg.shape[::-1]
+                return result
+
+            improveSubPix = state["improveSubPix"]
+
+        result["imgSize"] = grayImg.shape[::-1]
+
+        if improveSubPix:
+            corners = cv.cornerSubPix(
+                grayImg, corners, (11, 11), (-1, -1), state["terminationCriteria"]
+            )
+
+        result.update(found=True, corners=corners)
+
+    return result
+
+
+# Arrays of the detection results stored in the corner cache
+_CACHED_ARRAYS = ["corners", "objPoints", "imgPoints", "charucoCorners", "charucoIds", "arucoCorners", "arucoIds"]
+
+
+def _cache_path(
+        fileName: str,
+        detectionParams: dict[str, Any],
+        cacheDirPath: str
+) -> str:
+    """
+    Path of the cached detection of the image - the key is a hash of the image (path, modification time and size),
+    the board geometry and detector parameters (and the OpenCV version), so a changed image or detection setting
+    never reuses stale corners.
+    """
+    stat = os.stat(fileName)
+    digest = sha1()
+    digest.update(f"{os.path.abspath(fileName)}|{stat.st_mtime_ns}|{stat.st_size}|{cv.__version__}".encode("utf-8"))
+    digest.update(jdumps(detectionParams, sort_keys=True).encode("utf-8"))
+
+    return os.path.join(cacheDirPath, f"{digest.hexdigest()}.npz")
+
+
+def _load_cached_detection(
+        cachePath: str,
+        fileName: str
+) -> dict[str, Any]:
+    with np.load(cachePath) as cached:
+        result = {
+            "fileName": fileName,
+            "imgSize": tuple(int(size) for size in cached["imgSize"]) or None,
+            "found": bool(cached["found"]),
+            "rejectedBy": str(cached["rejectedBy"]) or None,
+        }
+        if "sharpness" in cached:
+            result["sharpness"] = float(cached["sharpness"])
+
+        for name in _CACHED_ARRAYS:
+            if name in cached:
+                result[name] = cached[name]
+
+    if "arucoCorners" in result:
+        # `detectBoard` returns the marker corners as a tuple of (1, 4, 2) arrays
+        result["arucoCorners"] = tuple(result["arucoCorners"])
+
+    return result
+
+
+def _save_cached_detection(
+        cachePath: str,
+        result: dict[str, Any]
+) -> None:
+    arrays = {name: np.asarray(result[name]) for name in _CACHED_ARRAYS if name in result}
+    if "sharpness" in result:
+        arrays["sharpness"] = np.asarray(result["sharpness"])
+
+    # Written to a temporary file and renamed, so an interrupted run never leaves a broken entry
+    temporaryPath = f"{cachePath}.{os.getpid()}.tmp"
+    with open(temporaryPath, "wb") as file:
+        np.savez_compressed(file, found=result["found"], imgSize=np.asarray(result["imgSize"] or (), dtype=int),
+                            rejectedBy=result["rejectedBy"] or "", **arrays)
+
+    os.replace(temporaryPath, cachePath)
+
+
+def _init_worker(
+        detectionParams: dict[str, Any]
+) -> None:
+    """
+    Initializer of the worker processes - rebuild the detector once per worker.
+    """
+    # The images are processed in parallel by the workers, OpenCV threads would only compete for the same cores
+    cv.setNumThreads(1)
+    _workerState.clear()
+    _workerState.update(_prepare_detection(detectionParams))
+
+
+def _detect_in_worker(
+        fileName: str
+) -> dict[str, Any]:
+    return _detect_image(fileName, _workerState)
+
+
+def _detection_params(
+        chessBoardSize: tuple[int, int],
+        squareRealDimensions: float,
+        improveSubPix: bool,
+        terminationCriteria: tuple[Any, int, float],
+        useCharuco: bool,
+        charucoDictName: str,
+        markerLength: float,
+        detectionScale: int = 1,
+        minSharpness: float = 0.0,
+        fastCheck: bool = False,
+) -> dict[str, Any]:
+    """
+    Picklable description of the board and the detection settings (sent to the worker processes).
+    """
+    return {
+        "chessBoardSize": tuple(int(size) for size in chessBoardSize),
+        "squareRealDimensions": float(squareRealDimensions),
+        "improveSubPix": improveSubPix,
+        "terminationCriteria": tuple(terminationCriteria),
+        "useCharuco": useCharuco,
+        "charucoDictName": charucoDictName,
+        "markerLength": float(markerLength),
+        "detectionScale": int(detectionScale),
+        "minSharpness": float(minSharpness),
+        "fastCheck": bool(fastCheck),
+    }
+
+
+def _map_detections(
+        images: list[str],
+        detectionParams: dict[str, Any],
+        workers: int
+) -> Iterator[dict[str, Any]]:
+    """
+    Detect the corners in the images by a pool of `workers` processes, the results are yielded in the order of `images`.
+    """
+    with ProcessPoolExecutor(max_workers=min(workers, len(images)), initializer=_init_worker, initargs=(detectionParams,)) as executor:
+        # `map` yields the results in the order of the images, small chunks keep the progress bar moving
+        yield from executor.map(_detect_in_worker, images, chunksize=max(1, len(images) // (workers * 8)))
+
+
+def _run_detections(
+        images: list[str],
+        detectionParams: dict[str, Any],
+        state: dict[str, Any],
+        workers: int,
+        cacheDirPath: str = ""
+) -> Iterator[dict[str, Any]]:
+    """
+    Detect the corners in the images (serially or by a pool of processes), the results are yielded in the order of
+    `images`. If `cacheDirPath` is provided, cached detections are loaded from it and only the remaining images are
+    processed (their results are added to the cache).
+    """
+    cachePaths = [None] * len(images)
+    if cacheDirPath:
+        os.makedirs(cacheDirPath, exist_ok=True)
+        cachePaths = [_cache_path(fileName, detectionParams, cacheDirPath) for fileName in images]
+
+    isCached = [cachePath is not None and os.path.isfile(cachePath) for cachePath in cachePaths]
+    missing = [fileName for fileName, cached in zip(images, isCached) if not cached]
+
+    if workers == 1 or len(missing) <= 1:
+        detections = (_detect_image(fileName, state) for fileName in missing)
+    else:
+        detections = _map_detections(missing, detectionParams, workers)
+
+    for fileName, cachePath, cached in zip(images, cachePaths, isCached):
+        if cached:
+            yield _load_cached_detection(cachePath, fileName)
+            continue
+
+        result = next(detections)
+        if cachePath is not None:
+            _save_cached_detection(cachePath, result)
+
+        yield result
+
+
+def _check_workers(
+        workers: int
+) -> None:
+    if not isinstance(workers, int) or isinstance(workers, bool) or workers <= 0:
+        raise ValueError("Invalid workers. It must be a positive integer.")
+
+
+def _check_detection_scale(
+        detectionScale: int,
+        useCharuco: bool
+) -> None:
+    if detectionScale != 1 and detectionScale not in _REDUCED_GRAYSCALE:
+        raise ValueError(f"Invalid detectionScale. It must be one of: 1, {', '.join(map(str, _REDUCED_GRAYSCALE))}.")
+
+    if detectionScale != 1 and useCharuco:
+        raise ValueError("Invalid detectionScale. The coarse-to-fine detection is supported only for chessboards.")
+
+
+def _check_prefilter(
+        minSharpness: float,
+        fastCheck: bool,
+        useCharuco: bool
+) -> None:
+    if minSharpness < 0:
+        raise ValueError("Invalid minSharpness. It must not be negative.")
+
+    if fastCheck and useCharuco:
+        raise ValueError("Invalid fastCheck. The fast check is supported only for chessboards.")
+
+
+def _detect_corners(
+        images: list[str],
+        chessBoardSize: tuple[int, int],
+        squareRealDimensions: float,
+        improveSubPix: bool = True,
+        terminationCriteria: tuple[Any, int, float] = (
+            cv.TERM_CRITERIA_EPS + cv.TERM_CRITERIA_MAX_ITER,
+            30,
+            0.001,
+        ),
+        useCharuco: bool = False,
+        charucoDictName: str = "DICT_6X6_250",
+        markerLength: float = 20.0,
+        workers: int = 1,
+        cacheDirPath: str = "",
+        detectionScale: int = 1,
+        minSharpness: float = 0.0,
+        fastCheck: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """
+    Detect the chessboard (or ChArUco board) corners in the images. With `workers > 1` the images are processed by
+    a pool of processes (every worker rebuilds the detector from the description of the board), otherwise serially in
+    the current process. The results are yielded in the order of `images` in both cases and the detection itself is the
+    same, so the calibration results do not depend on the number of workers. With `cacheDirPath` the detections are
+    reused between runs (see `_cache_path`). With `detectionScale > 1` the chessboard is detected coarse-to-fine (see
+    `_detect_image`) and with `minSharpness` / `fastCheck` unusable images are rejected early (see `_prefilter`).
+
+    :raises AttributeError: If the ArUco dictionary name is invalid.
+    :raises ValueError: If `workers` is not a positive integer or `detectionScale` (or the prefilter settings) is invalid.
+
+    :return: Iterator of the detection results (see `_detect_image`).
+    """
+    _check_workers(workers)
+    _check_detection_scale(detectionScale, useCharuco)
+    _check_prefilter(minSharpness, fastCheck, useCharuco)
+
+    detectionParams = _detection_params(
+        chessBoardSize, squareRealDimensions, improveSubPix, terminationCriteria, useCharuco, charucoDictName, markerLength,
+        detectionScale, minSharpness, fastCheck
+    )
+
+    # Built in the current process too - invalid parameters are reported before any worker is started
+    state = _prepare_detection(detectionParams)
+
+    yield from _run_detections(images, detectionParams, state, workers, cacheDirPath)
+
+
+def _detect_stereo_corners(
+        images_left: list[str],
+        images_right: list[str],
+        chessBoardSize: tuple[int, int],
+        squareRealDimensions: float,
+        improveSubPix: bool = True,
+        terminationCriteria: tuple[Any, int, float] = (
+            cv.TERM_CRITERIA_EPS + cv.TERM_CRITERIA_MAX_ITER,
+            30,
+            0.001,
+        ),
+        useCharuco: bool = False,
+        charucoDictName: str = "DICT_6X6_250",
+        markerLength: float = 20.0,
+        workers: int = 1,
+        cacheDirPath: str = "",
+        detectionScale: int = 1,
+        minSharpness: float = 0.0,
+        fastCheck: bool = False,
+) -> Iterator[tuple[dict[str, Any], dict[str, Any] | None]]:
+    """
+    Detect the corners in the stereo pairs (`images_left[i]`, `images_right[i]`).
+
+    With `workers == 1` the pairs are processed serially and the right image is only processed if the board was found
+    in the left one. With `workers > 1` the left and right images of all pairs are processed by a pool of processes
+    (both images of a pair at the same time), the pairs are yielded in order. In both cases a pair is used only if
+    the board was found in both images. With `cacheDirPath` the detections are reused between runs (see `_cache_path`)
+    and with `detectionScale > 1` the chessboard is detected coarse-to-fine (see `_detect_image`). With `minSharpness`
+    / `fastCheck` unusable images are rejected early (see `_prefilter`).
+
+    :raises AttributeError: If the ArUco dictionary name is invalid.
+    :raises ValueError: If `workers` is not a positive integer or `detectionScale` (or the prefilter settings) is invalid.
+
+    :return: Iterator of `(left, right)` detection results (see `_detect_image`), `right` is None if it was not processed.
+    """
+    _check_workers(workers)
+    _check_detection_scale(detectionScale, useCharuco)
+    _check_prefilter(minSharpness, fastCheck, useCharuco)
+
+    detectionParams = _detection_params(
+        chessBoardSize, squareRealDimensions, improveSubPix, terminationCriteria, useCharuco, charucoDictName, markerLength,
+        detectionScale, minSharpness, fastCheck
+    )
+
+    # Built in the current process too - invalid parameters are reported before any worker is started
+    state = _prepare_detection(detectionParams)
+
+    pairs = list(zip(images_left, images_right))
+
+    if workers == 1 or len(pairs) == 0:
+        for fileName_left, fileName_right in pairs:
+            left = next(_run_detections([fileName_left], detectionParams, state, 1, cacheDirPath))
+            right = next(_run_detections([fileName_right], detectionParams, state, 1, cacheDirPath)) if left["found"] else None
+            yield left, right
+
+        return
+
+    # Interleaved (left, right, left, right, ...), so both images of a pair are processed at the same time
+    detections = _run_detections([fileName for pair in pairs for fileName in pair], detectionParams, state, workers, cacheDirPath)
+    for left in detections:
+        yield left, next(detections)
@@ -0,0 +1,190 @@
+from time import perf_counter
+from typing import Any, Callable
+
+import cv2 as cv
+import numpy as np
+
+# Pruning stops if removing the worst view lowers the RMS by less than this fraction
+_PRUNE_TOLERANCE = 0.01
+
+# Minimum number of views kept by the pruning
+_PRUNE_MIN_VIEWS = 3
+
+
+def _rotation_matrices(
+        rotationVectors: np.ndarray
+) -> np.ndarray:
+    """
+    Rodrigues formula for all rotation vectors `(views, 3)` at once.
+
+    :return: Rotation matrices `(views, 3, 3)`.
+    """
+    theta = np.linalg.norm(rotationVectors, axis=1)
+    axis = rotationVectors / np.where(theta > 1e-12, theta, 1.0)[:, None]
+
+    K = np.zeros((len(rotationVectors), 3, 3))
+    K[:, 0, 1], K[:, 0, 2] = -axis[:, 2], axis[:, 1]
+    K[:, 1, 0], K[:, 1, 2] = axis[:, 2], -axis[:, 0]
+    K[:, 2, 0], K[:, 2, 1] = -axis[:, 1], axis[:, 0]
+
+    sin, cos = np.sin(theta)[:, None, None], np.cos(theta)[:, None, None]
+
+    return np.eye(3) + sin * K + (1.0 - cos) * (K @ K)
+
+
+def _reprojection_errors(
+        objPoints: list,
+        imgPoints: list,
+        rotationVectors: list,
+        translationVectors: list,
+        cameraMatrix: np.ndarray,
+        distortionCoefficients: np.ndarray
+) -> dict[str, Any]:
+    """
+    Reprojection errors of all views in one pass - the object points of every view are moved to the camera coordinates
+    (vectorized Rodrigues formula), then all of them are projected by a single `cv.projectPoints` call.
+
+    :return: Dictionary with the error of every corner in pixels (**perCorner**, concatenated in the order of the views), the index of the view of every corner (**views**), the RMS error of every view (**perView**), the mean squared error (**mse**, px^2) and the RMS error (**rms**, px - the same as returned by `cv.calibrateCamera`) of all corners.
+    """
+    counts = np.array([len(np.asarray(points).reshape(-1, 3)) for points in objPoints])
+    views = np.repeat(np.arange(len(objPoints)), counts)
+
+    points3d = np.concatenate([np.asarray(points, dtype=np.float64).reshape(-1, 3) for points in objPoints])
+    points2d = np.concatenate([np.asarray(points, dtype=np.float64).reshape(-1, 2) for points in imgPoints])
+
+    R = _rotation_matrices(np.asarray(rotationVectors, dtype=np.float64).reshape(-1, 3))
+    T = np.asarray(translationVectors, dtype=np.float64).reshape(-1, 3)
+    pointsCamera = np.einsum("nij,nj->ni", R[views], points3d) + T[views]
+
+    projected, _ = cv.projectPoints(
+        pointsCamera, np.zeros(3), np.zeros(3), np.asarray(cameraMatrix, dtype=np.float64),
+        np.asarray(distortionCoefficients, dtype=np.float64)
+    )
+
+    squaredErrors = np.sum((projected.reshape(-1, 2) - points2d) ** 2, axis=1)
+    mse = float(squaredErrors.mean())
+
+    return {
+        "perCorner": np.sqrt(squaredErrors),
+        "views": views,
+        "perView": np.sqrt(np.bincount(views, squaredErrors, minlength=len(objPoints)) / np.maximum(counts, 1)),
+        "mse": mse,
+        "rms": float(np.sqrt(mse)),
+    }
+
+
+def _prune_views(
+        calibrate: Callable[[list[int]], tuple[float, np.ndarray, Any]],
+        numViews: int,
+        timeBudget: float
+) -> tuple[list[int], Any]:
+    """
+    Prune-and-recalibrate loop - the view with the largest error is removed and the camera is recalibrated as long as
+    the RMS error drops by at least `_PRUNE_TOLERANCE` (relative), at least `_PRUNE_MIN_VIEWS` views are left and
+    the time budget is not exceeded (checked before every recalibration).
+
+    :param calibrate: Calibrate on the given views, returns the RMS error, the errors of the views and the calibration.
+    :param int numViews: Number of all views.
+    :param float timeBudget: Time budget of the pruning in seconds.
+
+    :return: Kept views and the calibration on them.
+    """
+    start = perf_counter()
+
+    views = list(range(numViews))
+    rms, perView, calibration = calibrate(views)
+
+    while len(views) > _PRUNE_MIN_VIEWS and perf_counter() - start < timeBudget:
+        worst = int(np.argmax(perView))
+        candidate = views[:worst] + views[worst + 1:]
+
+        candidateRms, candidatePerView, candidateCalibration = calibrate(candidate)
+        if rms - candidateRms < _PRUNE_TOLERANCE * rms:
+            break
+
+        views, rms, perView, calibration = candidate, candidateRms, candidatePerView, candidateCalibration
+
+    return views, calibration
+
+
+def _calibrate_views(
+        objPoints: list,
+        imgPoints: list,
+        imgSize: tuple[int, int],
+        pruneOutliers: bool = False,
+        pruneTimeBudget: float = 30.0,
+        cameraMatrix: np.ndarray = None,
+        distortionCoefficients: np.ndarray = None
+) -> tuple[list[int], tuple, dict[str, Any]]:
+    """
+    Calibrate a single camera (`cv.calibrateCamera`) and compute the reprojection errors, optionally pruning the worst
+    views (see `_prune_views`). If `cameraMatrix` is provided, the solve is warm-started from it (and from
+    `distortionCoefficients`) with `cv.CALIB_USE_INTRINSIC_GUESS`.
+
+    :return: Kept views, the result of `cv.calibrateCamera` on them and the reprojection errors (see `_reprojection_errors`).
+    """
+    def calibrate(views: list[int]) -> tuple[float, np.ndarray, Any]:
+        objPoints_views, imgPoints_views = [objPoints[i] for i in views], [imgPoints[i] for i in views]
+        if cameraMatrix is None:
+            calibration = cv.calibrateCamera(objPoints_views, imgPoints_views, imgSize, None, None)
+
+        else:
+            # The initial guess is modified in place by OpenCV - every solve starts from a copy
+            calibration = cv.calibrateCamera(
+                objPoints_views, imgPoints_views, imgSize, np.array(cameraMatrix, dtype=np.float64),
+                None if distortionCoefficients is None else np.array(distortionCoefficients, dtype=np.float64),
+                flags=cv.CALIB_USE_INTRINSIC_GUESS
+            )
+
+        errors = _reprojection_errors(objPoints_views, imgPoints_views, calibration[3], calibration[4], calibration[1], calibration[2])
+
+        return errors["rms"], errors["perView"], (calibration, errors)
+
+    if pruneOutliers:
+        views, (calibration, errors) = _prune_views(calibrate, len(objPoints), pruneTimeBudget)
+
+    else:
+        views = list(range(len(objPoints)))
+        _, _, (calibration, errors) = calibrate(views)
+
+    return views, calibration, errors
+
+
+def _calibrate_stereo_views(
+        objPoints: list,
+        imgPoints_left: list,
+        imgPoints_right: list,
+        imgSize: tuple[int, int],
+        pruneOutliers: bool = False,
+        pruneTimeBudget: float = 30.0
+) -> tuple[list[int], tuple, tuple, dict[str, Any], dict[str, Any]]:
+    """
+    Calibrate both cameras of a stereo pair on the same views and compute the reprojection errors, optionally pruning
+    the worst views (the error of a view is the larger of its left and right errors, see `_prune_views`).
+
+    :return: Kept views, the results of `cv.calibrateCamera` of the left and right camera and their reprojection errors.
+    """
+    def calibrate(views: list[int]) -> tuple[float, np.ndarray, Any]:
+        objPoints_views = [objPoints[i] for i in views]
+        results = []
+        for imgPoints in (imgPoints_left, imgPoints_right):
+            imgPoints_views = [imgPoints[i] for i in views]
+            calibration = cv.calibrateCamera(objPoints_views, imgPoints_views, imgSize, None, None)
+            errors = _reprojection_errors(objPoints_views, imgPoints_views, calibration[3], calibration[4], calibration[1], calibration[2])
+            results.append((calibration, errors))
+
+        (_, errors_left), (_, errors_right) = results
+        rms = float(np.sqrt(0.5 * (errors_left["mse"] + errors_right["mse"])))
+
+        return rms, np.maximum(errors_left["perView"], errors_right["perView"]), results
+
+    if pruneOutliers:
+        views, results = _prune_views(calibrate, len(objPoints), pruneTimeBudget)
+
+    else:
+        views = list(range(len(objPoints)))
+        _, _, results = calibrate(views)
+
+    (calibration_left, errors_left), (calibration_right, errors_right) = results
+
+    return views, calibration_left, calibration_right, errors_left, errors_right
@@ -0,0 +1,208 @@
+from typing import Any
+
+import cv2 as cv
+import matplotlib.pyplot as plt
+import numpy as np
+from colorama import Fore, init as colorama_init
+
+colorama_init(autoreset=True)
+
+
+def _coverage_cells(
+        imgPoints: list,
+        imageSize: tuple[int, int],
+        gridSize: tuple[int, int]
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Cells of the image grid covered by every view and the heatmap of all corners, computed for all views at once
+    from the concatenated corner arrays.
+
+    :return: Boolean matrix `(views, cells)` and the heatmap (number of corners per cell, shape `(rows, columns)`).
+    """
+    numViews = len(imgPoints)
+    columns, rows = gridSize
+    width, height = imageSize
+
+    points = [np.asarray(view, dtype=np.float64).reshape(-1, 2) for view in imgPoints]
+    counts = np.array([len(view) for view in points])
+    points = np.concatenate(points) if numViews > 0 else np.empty((0, 2))
+    views = np.repeat(np.arange(numViews), counts)
+
+    cellX = np.clip((points[:, 0] * columns / width).astype(int), 0, columns - 1)
+    cellY = np.clip((points[:, 1] * rows / height).astype(int), 0, rows - 1)
+
+    covered = np.zeros((numViews, columns * rows), dtype=bool)
+    covered[views, cellY * columns + cellX] = True
+
+    heatmap, _, _ = np.histogram2d(points[:, 1], points[:, 0], bins=(rows, columns), range=((0, height), (0, width)))
+
+    return covered, heatmap
+
+
+def _pose_bins(
+        objPoints: list,
+        imgPoints: list,
+        imageSize: tuple[int, int],
+        tiltBinSize: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Bin the tilt of the board in every view. The tilt (rotation around the `x` and `y` axes of the camera) is computed
+    from the homography between the (planar) board and the image, normalized by an approximate camera matrix (focal
+    length equal to the longer side of the image, principal point in the center) - the calibration is not known yet,
+    but the approximation is good enough to tell the poses apart.
+
+    :return: Boolean matrix `(views, poseBins)` (views with less than 4 corners have no pose) and the tilts in degrees `(views, 2)`.
+    """
+    width, height = imageSize
+    focalLength = float(max(width, height))
+    approxCameraMatrix_inv = np.linalg.inv(np.array([[focalLength, 0, width / 2], [0, focalLength, height / 2], [0, 0, 1]]))
+
+    # Bins centered at zero tilt (the most common, frontal pose is not split between two bins)
+    halfBins = int(np.ceil(90.0 / tiltBinSize))
+    binsPerAxis = 2 * halfBins + 1
+    covered = np.zeros((len(imgPoints), binsPerAxis ** 2), dtype=bool)
+    tilts = np.full((len(imgPoints), 2), np.nan)
+
+    for view, (obj, img) in enumerate(zip(objPoints, imgPoints)):
+        obj = np.asarray(obj, dtype=np.float64).reshape(-1, 3)
+        img = np.asarray(img, dtype=np.float64).reshape(-1, 2)
+        if len(obj) < 4 or len(obj) != len(img):
+            continue
+
+        H, _ = cv.findHomography(obj[:, :2], img)
+        if H is None:
+            continue
+
+        H = approxCameraMatrix_inv @ H
+        r1, r2 = H[:, 0] / np.linalg.norm(H[:, 0]), H[:, 1] / np.linalg.norm(H[:, 1])
+        normal = np.cross(r1, r2)
+        normal *= np.sign(normal[2]) if normal[2] != 0 else 1.0
+
+        tilts[view] = np.degrees(np.arctan2(normal[1], normal[2])), np.degrees(np.arctan2(normal[0], normal[2]))
+
+        binX, binY = np.clip(np.round(tilts[view] / tiltBinSize).astype(int) + halfBins, 0, binsPerAxis - 1)
+        covered[view, binX * binsPerAxis + binY] = True
+
+    return covered, tilts
+
+
+def select_calibration_views(
+    objPoints: list,
+    imgPoints: list,
+    imageSize: tuple[int, int],
+    imgPoints_right: list = None,
+    maxViews: int = None,
+    gridSize: tuple[int, int] = (8, 6),
+    tiltBinSize: float = 15.0,
+    coverageDepth: int = 2,
+    verbose: bool = True,
+    showHeatmaps: bool = False,
+) -> dict[str, Any]:
+    """
+    Select a small subset of the detected views that covers the image and the poses of the board as well as all the
+    views - hundreds of near-duplicate views (e.g. frames of a video) make `cv.calibrateCamera` and `cv.stereoCalibrate`
+    slow without improving the accuracy.
+
+    Every view covers:
+
+    - the cells of a `gridSize` grid of the image in which it has corners (of both images for stereo views - `imgPoints_right`),
+    - a bin of the tilt of the board (rotation around the `x` and `y` axes, `tiltBinSize` degrees).
+
+    The views are picked greedily (max-coverage) - always the view covering the most cells and pose bins that are not
+    yet covered `coverageDepth` times - until everything the views can cover is covered or `maxViews` views are selected.
+
+    :param list objPoints: Object points of the views (one array of shape `(N, 1, 3)` or `(N, 3)` per view, planar board).
+    :param list imgPoints: Corners detected in the (left) images (one array of shape `(N, 1, 2)` per view).
+    :param tuple[int, int] imageSize: Size of the images (width, height).
+    :param list imgPoints_right: Corners detected in the right images of stereo views. Default is None (mono).
+    :param int maxViews: Maximum number of selected views. Default is None (no limit - as many as needed for the full coverage).
+    :param tuple[int, int] gridSize: Number of the cells of the image grid (columns, rows). Default is (8, 6).
+    :param float tiltBinSize: Size of the tilt bins in degrees. Default is 15.0.
+    :param int coverageDepth: Number of the selected views that should cover every cell and pose bin. Default is 2.
+    :param bool verbose: Print the summary. Default is True.
+    :param bool showHeatmaps: Plot the coverage heatmaps of all and of the selected views. Default is False.
+
+    :raises ValueError: Raises ValueError if:
+        - the numbers of views in `objPoints`, `imgPoints` (and `imgPoints_right`) differ,
+        - **`maxViews`**, **`coverageDepth`**, **`tiltBinSize`** or **`gridSize`** is not positive.
+
+    :return: Dictionary with the indices of the selected views (**selected**, in the original order), the order in which they were picked (**order**), the fraction of the grid cells (**coverage**, **coverageSelected**) and the number of pose bins (**poseBins**, **poseBinsSelected**) covered by all and by the selected views, the tilts of the views in degrees (**tilts**) and the heatmaps of the corners (**heatmap**, **heatmapSelected**, and **heatmap_right**, **heatmapSelected_right** for stereo views).
+    """
+    if len(objPoints) != len(imgPoints) or (imgPoints_right is not None and len(imgPoints_right) != len(imgPoints)):
+        raise ValueError(Fore.RED + "\nAll point lists must have the same number of views!\n")
+
+    if maxViews is not None and maxViews <= 0:
+        raise ValueError(Fore.RED + "\n`maxViews` must be positive!\n")
+
+    if coverageDepth <= 0 or tiltBinSize <= 0 or gridSize[0] <= 0 or gridSize[1] <= 0:
+        raise ValueError(Fore.RED + "\n`coverageDepth`, `tiltBinSize` and `gridSize` must be positive!\n")
+
+    imageSize = tuple(int(size) for size in imageSize)
+    numViews = len(imgPoints)
+
+    cells, heatmap = _coverage_cells(imgPoints, imageSize, gridSize)
+    poses, tilts = _pose_bins(objPoints, imgPoints, imageSize, tiltBinSize)
+    elements = [cells, poses]
+
+    if imgPoints_right is not None:
+        cells_right, heatmap_right = _coverage_cells(imgPoints_right, imageSize, gridSize)
+        elements.insert(1, cells_right)
+
+    # Every column is a cell (or pose bin) which should be covered `coverageDepth` times (if the views can cover it)
+    covers = np.concatenate(elements, axis=1).astype(np.int32)
+    remaining = np.minimum(covers.sum(axis=0), coverageDepth)
+
+    order = []
+    available = np.ones(numViews, dtype=bool)
+    while available.any() and (maxViews is None or len(order) < maxViews):
+        gains = np.where(available, covers @ (remaining > 0), -1)
+        view = int(np.argmax(gains))
+        if gains[view] <= 0:
+            break
+
+        order.append(view)
+        available[view] = False
+        remaining = np.maximum(remaining - covers[view], 0)
+
+    selected = sorted(order)
+
+    _, heatmapSelected = _coverage_cells([imgPoints[view] for view in selected], imageSize, gridSize)
+    results = {
+        "selected": selected,
+        "order": order,
+        "coverage": float(cells.any(axis=0).mean()) if numViews > 0 else 0.0,
+        "coverageSelected": float(cells[selected].any(axis=0).mean()) if selected else 0.0,
+        "poseBins": int(poses.any(axis=0).sum()),
+        "poseBinsSelected": int(poses[selected].any(axis=0).sum()),
+        "tilts": tilts.tolist(),
+        "heatmap": heatmap,
+        "heatmapSelected": heatmapSelected,
+    }
+
+    if imgPoints_right is not None:
+        _, heatmapSelected_right = _coverage_cells([imgPoints_right[view] for view in selected], imageSize, gridSize)
+        results["heatmap_right"] = heatmap_right
+        results["heatmapSelected_right"] = heatmapSelected_right
+
+    if verbose:
+        print(
+            Fore.GREEN + f"\nSelected {len(selected)}/{numViews} views for the calibration:"
+            f"\n\timage coverage: {results['coverageSelected'] * 100:.1f}% (all views: {results['coverage'] * 100:.1f}%)"
+            f"\n\tpose bins: {results['poseBinsSelected']} (all views: {results['poseBins']})"
+        )
+
+    if showHeatmaps:
+        heatmaps = [("All views", heatmap), ("Selected views", heatmapSelected)]
+        if imgPoints_right is not None:
+            heatmaps += [("All views (RIGHT)", heatmap_right), ("Selected views (RIGHT)", heatmapSelected_right)]
+
+        fig, axes = plt.subplots(1, len(heatmaps), figsize=(5 * len(heatmaps), 4))
+        for ax, (title, values) in zip(axes, heatmaps):
+            image = ax.imshow(values, cmap="viridis", extent=(0, imageSize[0], imageSize[1], 0))
+            ax.set_title(title)
+            fig.colorbar(image, ax=ax, label="corners")
+
+        plt.tight_layout()
+        plt.show()
+
+    return results
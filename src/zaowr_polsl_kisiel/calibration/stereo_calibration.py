@@ -9,6 +9,9 @@ from colorama import Fore, Style, init as colorama_init #, Back
 from sys import stdout
 from os.path import basename
 
+from .corner_detection import _detect_stereo_corners, _skip_reason
+from .reprojection import _calibrate_stereo_views
+from .select_calibration_views import select_calibration_views
 from ..custom_exceptions.exceptions import CalibrationImagesNotFound, CalibrationParamsPathNotProvided, CalibrationParamsWrongFormat, StereoCalibrationParamsPathNotProvided, CharucoCalibrationError
 
 colorama_init(autoreset=True)
@@ -57,6 +60,15 @@ def stereo_calibration(
     charucoDictName: str = "DICT_6X6_250",
     markerLength: float = 20.0,
     displayIds: bool = False,
+    workers: int = 1,
+    cornerCacheDirPath: str = "",
+    detectionScale: int = 1,
+    minSharpness: float = 0.0,
+    fastCheck: bool = False,
+    selectViews: bool = False,
+    maxViews: int = None,
+    pruneOutliers: bool = False,
+    pruneTimeBudget: float = 30.0,
 ) -> None:
     """
     Perform stereo camera calibration using chessboard or ChArUco images from both left and right cameras.
@@ -75,7 +87,7 @@ def stereo_calibration(
     :param bool saveStereoCalibrationParams: Whether to save the stereo calibration parameters (default is False).
     :param str stereoCalibrationParamsPath: Path to save the stereo calibration parameters (default is empty).
     :param bool displayFoundCorners: Whether to display the found chessboard or ChArUco corners during calibration (default is False).
-    :param bool displayMSE: Whether to display the Mean Squared Error (MSE) during calibration (default is False).
+    :param bool displayMSE: Whether to display the mean squared reprojection error (px^2) of all corners and the RMS reprojection error of every view of both cameras (default is False).
     :param bool improveSubPix: Whether to refine the corner detection to sub-pixel accuracy (default is True).
     :param bool showListOfImagesWithChessboardFound: Whether to display the list of images where the chessboard or ChArUco board was detected (default is False).
     :param tuple[Any, int, float] terminationCriteria: Criteria for corner refinement, in the form of a tuple (type, max_iter, epsilon) (default is set to terminate after 30 iterations or when epsilon is less than 0.001).
@@ -84,6 +96,15 @@ def stereo_calibration(
     :param str charucoDictName: Name of the predefined ArUco dictionary for generating ChArUco boards (default is "DICT_6X6_250").
     :param float markerLength: Length of the markers in ChArUco board in millimeters (default is 20.0).
     :param bool displayIds: If True and `useCharuco` is enabled, displays corner IDs alongside detected corners of the chessboard (ids on markers are always shown) (default is False).
+    :param int workers: Number of processes detecting the corners. With more than 1 worker the left and right images of all pairs are processed in parallel (both images of a pair at the same time), a pair is used only if the board was found in both images and the pairs are collected in order, so the calibration is the same as with 1 worker (default is 1 - serial detection).
+    :param str cornerCacheDirPath: Directory of the corner-detection cache. If provided, the detected corners are saved there (one compressed `.npz` per image, keyed by the image path, modification time and size, the board geometry and the detector parameters) and reused by the following runs, e.g. by `calibrate_camera` with the same images (default is "" - no cache).
+    :param int detectionScale: Coarse-to-fine chessboard detection - the board is searched for in the images reduced `detectionScale` times (1, 2, 4 or 8) and the corners are refined with `cv.cornerSubPix` at the full resolution, see `calibrate_camera` (default is 1 - detection at the full resolution).
+    :param float minSharpness: Prefilter - images with the variance of the Laplacian (computed on a thumbnail) lower than `minSharpness` are rejected as blurred before the detection, see `calibrate_camera` (default is 0.0 - disabled).
+    :param bool fastCheck: Prefilter - images without the chessboard found by `cv.CALIB_CB_FAST_CHECK` on a thumbnail are rejected before the full detection, see `calibrate_camera` (default is False).
+    :param bool selectViews: Calibrate on a subset of the stereo views selected by `select_calibration_views` (greedy max-coverage of both images and of the poses of the board), used by the calibration of both cameras and by `cv.stereoCalibrate`. Not used if the calibration parameters of the cameras are loaded (default is False).
+    :param int maxViews: Maximum number of the views selected if `selectViews` is True (default is None - as many as needed for the full coverage).
+    :param bool pruneOutliers: Iteratively remove the stereo view with the largest reprojection error (the larger of the left and right errors) and recalibrate both cameras, as long as the RMS error drops by at least 1% (default is False).
+    :param float pruneTimeBudget: Time budget of the pruning in seconds, checked before every recalibration (default is 30.0).
 
     :return: None
 
@@ -106,40 +127,39 @@ def stereo_calibration(
     if (not images_right) or (len(images_right) == 0):
         raise CalibrationImagesNotFound
 
+    imgSize = None
+
     if not loadCalibrationParams:
         if useCharuco:
             try:
-                arucoDict = getattr(aruco, charucoDictName)
-                dictionary = aruco.getPredefinedDictionary(arucoDict)
-                board = aruco.CharucoBoard(chessBoardSize, squareRealDimensions, markerLength, dictionary)
-                # board.setLegacyPattern(True)  # comment this line to create the new template
-
-                # Setup the charuco detector
-                charucoParams = aruco.CharucoParameters()
-                detectorParams = aruco.DetectorParameters()
-                refineParams = aruco.RefineParameters()
-
-                if improveSubPix:
-                    charucoParams.tryRefineMarkers = True
-                    charucoParams.minMarkers = 0
-                    detectorParams.adaptiveThreshConstant = 19
-                    detectorParams.cornerRefinementMethod = aruco.CORNER_REFINE_SUBPIX
-                    detectorParams.cornerRefinementMinAccuracy = 0.001
-                    detectorParams.cornerRefinementMaxIterations = 30
-                    detectorParams.cornerRefinementWinSize = 11
-
-                charucoDetector = aruco.CharucoDetector(board, charucoParams, detectorParams, refineParams)
-                charucoDetector.setBoard(board)
-
                 objPoints = []  # 3d point in real world space
                 imgPoints_left = []  # 2d points in image plane.
                 imgPoints_right = []  # 2d points in image plane.
                 imgSize = None
                 chessboardFound = []
                 chessboardSkipped = []
+                chessboardRejected = {}  # images rejected by the prefilter
+
+                detections = _detect_stereo_corners(
+                    images_left,
+                    images_right,
+                    chessBoardSize,
+                    squareRealDimensions,
+                    improveSubPix=improveSubPix,
+                    terminationCriteria=terminationCriteria,
+                    useCharuco=True,
+                    charucoDictName=charucoDictName,
+                    markerLength=markerLength,
+                    workers=workers,
+                    cacheDirPath=cornerCacheDirPath,
+                    detectionScale=detectionScale,
+                    minSharpness=minSharpness,
+                    fastCheck=fastCheck,
+                )
 
-                for i, _ in enumerate(tqdm(
-                        images_left,
+                for i, (detection_left, detection_right) in enumerate(tqdm(
+                        detections,
+                        total=min(len(images_left), len(images_right)),
                         desc=Style.RESET_ALL + "Processing images...",
                         dynamic_ncols=True,
                         bar_format="{l_bar}{bar}{r_bar}",
@@ -147,51 +167,36 @@ def stereo_calibration(
                         file=stdout,
                         position=0
                 )):
-                    baseFileName_left = basename(images_left[i])
-                    img_left = cv.imread(images_left[i])
-                    grayImg_left = cv.cvtColor(img_left, cv.COLOR_BGR2GRAY)
+                    baseFileName_left = basename(detection_left["fileName"])
 
                     if imgSize is None:
-                        imgSize = grayImg_left.shape[::-1]
+                        imgSize = detection_left["imgSize"]
 
                     tqdm.write(Fore.GREEN + f"\nProcessing LEFT image from set no.{i + 1} ({baseFileName_left}).", nolock=True, file=stdout)
 
-                    charucoCorners_left, charucoIds_left, arucoCorners_left, arucoIds_left = charucoDetector.detectBoard(grayImg_left)
-
-                    if (
-                            (charucoCorners_left is None) or (len(charucoCorners_left) <= 0)
-                            or (charucoIds_left is None) or (len(charucoIds_left) <= 0)
-                            or (arucoCorners_left is None) or (len(arucoCorners_left) <= 0)
-                            or (arucoIds_left is None) or (len(arucoIds_left) <= 4)
-                    ):
+                    if not detection_left["found"]:
                         tqdm.write(
                             Fore.RED
-                            + f"Skipped image set no.{i + 1} due to insufficient ChArUco markers in LEFT image ({baseFileName_left}).",
+                            + f"Skipped image set no.{i + 1} {_skip_reason(detection_left, 'due to insufficient ChArUco markers')} in LEFT image ({baseFileName_left}).",
                             nolock=True,
                             file=stdout,
                         )
                         chessboardSkipped.append(baseFileName_left)
+                        if detection_left["rejectedBy"] is not None:
+                            chessboardRejected[baseFileName_left] = f"{detection_left['rejectedBy']} (LEFT)"
                         continue
 
                     tqdm.write(Fore.GREEN + f"Success!", nolock=True, file=stdout)
 
-                    baseFileName_right = basename(images_right[i])
-                    img_right = cv.imread(images_right[i])
-                    grayImg_right = cv.cvtColor(img_right, cv.COLOR_BGR2GRAY)
+                    baseFileName_right = basename(detection_right["fileName"])
 
                     tqdm.write(Fore.GREEN + f"Processing RIGHT image from set no.{i + 1} ({baseFileName_right}).", nolock=True, file=stdout)
 
-                    charucoCorners_right, charucoIds_right, arucoCorners_right, arucoIds_right = charucoDetector.detectBoard(grayImg_right)
-
-                    if (
-                            (charucoCorners_right is None) or (len(charucoCorners_right) <= 0)
-                            or (charucoIds_right is None) or (len(charucoIds_right) <= 0)
-                            or (arucoCorners_right is None) or (len(arucoCorners_right) <= 0)
-                            or (arucoIds_right is None) or (len(arucoIds_right) <= 4)
-                            # found less than 4 markers
-                    ):
-                        tqdm.write(Fore.RED + f"Skipped image set no.{i+1} due to insufficient ChArUco markers in RIGHT image ({baseFileName_left}).", nolock=True, file=stdout)
+                    if not detection_right["found"]:
+                        tqdm.write(Fore.RED + f"Skipped image set no.{i+1} {_skip_reason(detection_right, 'due to insufficient ChArUco markers')} in RIGHT image ({baseFileName_left}).", nolock=True, file=stdout)
                         chessboardSkipped.append(baseFileName_left)
+                        if detection_right["rejectedBy"] is not None:
+                            chessboardRejected[baseFileName_left] = f"{detection_right['rejectedBy']} (RIGHT)"
                         continue
 
                     tqdm.write(Fore.GREEN + f"Success!", nolock=True, file=stdout)
@@ -200,6 +205,13 @@ def stereo_calibration(
                     chessboardFound.append(baseFileName_left)
 
                     if displayFoundCorners:
+                        img_left = cv.imread(detection_left["fileName"])
+                        img_right = cv.imread(detection_right["fileName"])
+                        charucoCorners_left, charucoIds_left = detection_left["charucoCorners"], detection_left["charucoIds"]
+                        arucoCorners_left, arucoIds_left = detection_left["arucoCorners"], detection_left["arucoIds"]
+                        charucoCorners_right, charucoIds_right = detection_right["charucoCorners"], detection_right["charucoIds"]
+                        arucoCorners_right, arucoIds_right = detection_right["arucoCorners"], detection_right["arucoIds"]
+
                         if displayIds:
                             # LEFT
                             imgWithMarkers_left = aruco.drawDetectedMarkers(img_left, arucoCorners_left, arucoIds_left)
@@ -235,16 +247,11 @@ def stereo_calibration(
                     cv.destroyAllWindows()
 
                     # LEFT
-                    objectPoints_left, imagePoints_left = board.matchImagePoints(charucoCorners_left, charucoIds_left)
-
-                    objPoints.append(objectPoints_left)
-                    imgPoints_left.append(imagePoints_left)
+                    objPoints.append(detection_left["objPoints"])
+                    imgPoints_left.append(detection_left["imgPoints"])
 
                     # RIGHT
-                    objectPoints_right, imagePoints_right = board.matchImagePoints(charucoCorners_right, charucoIds_right)
-
-                    # objPoints.append(objectPoints_left)
-                    imgPoints_right.append(imagePoints_right)
+                    imgPoints_right.append(detection_right["imgPoints"])
 
 
 
@@ -262,53 +269,33 @@ def stereo_calibration(
                 ]
                 objPoints, imgPoints_left, imgPoints_right = zip(*valid_data)
 
-                print(Fore.GREEN + "\nCalibrating LEFT camera...")
-                rms_left, cameraMatrix_left, distortionCoefficients_left, rotationVectors_left, translationVectors_left = cv.calibrateCamera(
-                        objPoints,
-                        imgPoints_left,
-                        imgSize,
-                        None,
-                        None
-                    )
-
-                print(Fore.GREEN + "\nCalibrating RIGHT camera...")
-                rms_right, cameraMatrix_right, distortionCoefficients_right, rotationVectors_right, translationVectors_right = cv.calibrateCamera(
-                        objPoints,
-                        imgPoints_right,
-                        imgSize,
-                        None,
-                        None
-                    )
+                if selectViews:
+                    selected = select_calibration_views(objPoints, imgPoints_left, imgSize, imgPoints_right, maxViews=maxViews)["selected"]
+                    objPoints = [objPoints[i] for i in selected]
+                    imgPoints_left = [imgPoints_left[i] for i in selected]
+                    imgPoints_right = [imgPoints_right[i] for i in selected]
 
-                mse_left = 0
-                mse_right = 0
-                for i in range(len(objPoints)):
-                    imgPoints_left_improved, _ = cv.projectPoints(
-                        objPoints[i],
-                        rotationVectors_left[i],
-                        translationVectors_left[i],
-                        cameraMatrix_left,
-                        distortionCoefficients_left,
-                    )
-                    error = cv.norm(imgPoints_left[i], imgPoints_left_improved, cv.NORM_L2) / len(imgPoints_left_improved)
-                    mse_left += error
-
-                    imgPoints_right_improved, _ = cv.projectPoints(
-                        objPoints[i],
-                        rotationVectors_right[i],
-                        translationVectors_right[i],
-                        cameraMatrix_right,
-                        distortionCoefficients_right,
-                    )
-                    error = cv.norm(imgPoints_right[i], imgPoints_right_improved, cv.NORM_L2) / len(imgPoints_right_improved)
-                    mse_right += error
-
-
-                mse_left = mse_left / len(objPoints)
-                mse_right = mse_right / len(objPoints)
+                print(Fore.GREEN + "\nCalibrating LEFT and RIGHT cameras...")
+                views, calibration_left, calibration_right, errors_left, errors_right = _calibrate_stereo_views(
+                    objPoints, imgPoints_left, imgPoints_right, imgSize, pruneOutliers, pruneTimeBudget
+                )
+                rms_left, cameraMatrix_left, distortionCoefficients_left, rotationVectors_left, translationVectors_left = calibration_left
+                rms_right, cameraMatrix_right, distortionCoefficients_right, rotationVectors_right, translationVectors_right = calibration_right
+
+                if len(views) < len(objPoints):
+                    print(Fore.YELLOW + f"\nPruned {len(objPoints) - len(views)} views with the largest reprojection errors (RMS left: {errors_left['rms']:.4f} px, right: {errors_right['rms']:.4f} px)")
+                    objPoints = [objPoints[i] for i in views]
+                    imgPoints_left = [imgPoints_left[i] for i in views]
+                    imgPoints_right = [imgPoints_right[i] for i in views]
+
+                # Mean of the squared reprojection errors of all corners (px^2)
+                mse_left = errors_left["mse"]
+                mse_right = errors_right["mse"]
                 if displayMSE:
-                    print(f"\nMean reprojection error left: {mse_left}")
-                    print(f"\nMean reprojection error right: {mse_left}")
+                    print(f"\nMean squared reprojection error left: {mse_left}")
+                    print(f"Reprojection error of the views left (RMS): {np.round(errors_left['perView'], 4).tolist()}")
+                    print(f"\nMean squared reprojection error right: {mse_right}")
+                    print(f"Reprojection error of the views right (RMS): {np.round(errors_right['perView'], 4).tolist()}")
 
                 if saveCalibrationParams:
                     try:
@@ -372,9 +359,25 @@ def stereo_calibration(
             imgSize = None
             chessboardFound = [] # list of images with chessboard detected properly
             chessboardSkipped = []
+            chessboardRejected = {}  # images rejected by the prefilter
+
+            detections = _detect_stereo_corners(
+                images_left,
+                images_right,
+                chessBoardSize,
+                squareRealDimensions,
+                improveSubPix=improveSubPix,
+                terminationCriteria=terminationCriteria,
+                workers=workers,
+                cacheDirPath=cornerCacheDirPath,
+                detectionScale=detectionScale,
+                minSharpness=minSharpness,
+                fastCheck=fastCheck,
+            )
 
-            for i, _ in enumerate(tqdm(
-                    images_left,
+            for i, (detection_left, detection_right) in enumerate(tqdm(
+                    detections,
+                    total=min(len(images_left), len(images_right)),
                     desc=Style.RESET_ALL + "Processing images...",
                     dynamic_ncols=True,
                     bar_format="{l_bar}{bar}{r_bar}",
@@ -382,42 +385,33 @@ def stereo_calibration(
                     file=stdout,
                     position=0
             )):
-                baseFileName_left = basename(images_left[i])
-                img_left = cv.imread(images_left[i])
-                grayImg_left = cv.cvtColor(img_left, cv.COLOR_BGR2GRAY)
+                baseFileName_left = basename(detection_left["fileName"])
 
                 if imgSize is None:
-                    imgSize = grayImg_left.shape[::-1]
+                    imgSize = detection_left["imgSize"]
 
                 tqdm.write(Fore.GREEN + f"\nProcessing LEFT image from set no.{i + 1} ({baseFileName_left}).", nolock=True, file=stdout)
 
-                # Find the chess board corners
-                ret_left, corners_left = cv.findChessboardCorners(
-                    grayImg_left, (chessBoardSize[0], chessBoardSize[1]), None
-                )
-
-                if not ret_left:
-                    tqdm.write(Fore.RED + f"Skipped image set no.{i + 1} because corners were not found in LEFT image ({baseFileName_left}).",
+                if not detection_left["found"]:
+                    tqdm.write(Fore.RED + f"Skipped image set no.{i + 1} {_skip_reason(detection_left, 'because corners were not found')} in LEFT image ({baseFileName_left}).",
                                nolock=True, file=stdout)
                     chessboardSkipped.append(baseFileName_left)
+                    if detection_left["rejectedBy"] is not None:
+                        chessboardRejected[baseFileName_left] = f"{detection_left['rejectedBy']} (LEFT)"
                     continue
 
                 tqdm.write(Fore.GREEN + f"Success!", nolock=True, file=stdout)
 
-                baseFileName_right = basename(images_right[i])
-                img_right = cv.imread(images_right[i])
-                grayImg_right = cv.cvtColor(img_right, cv.COLOR_BGR2GRAY)
+                baseFileName_right = basename(detection_right["fileName"])
 
                 tqdm.write(Fore.GREEN + f"Processing RIGHT image from set no.{i + 1} ({baseFileName_right}).", nolock=True, file=stdout)
 
-                ret_right, corners_right = cv.findChessboardCorners(
-                    grayImg_right, (chessBoardSize[0], chessBoardSize[1]), None
-                )
-
-                if not ret_right:
-                    tqdm.write(Fore.RED + f"Skipped image set no.{i + 1} because corners were not found in RIGHT image ({baseFileName_left}).",
+                if not detection_right["found"]:
+                    tqdm.write(Fore.RED + f"Skipped image set no.{i + 1} {_skip_reason(detection_right, 'because corners were not found')} in RIGHT image ({baseFileName_left}).",
                                nolock=True, file=stdout)
                     chessboardSkipped.append(baseFileName_left)
+                    if detection_right["rejectedBy"] is not None:
+                        chessboardRejected[baseFileName_left] = f"{detection_right['rejectedBy']} (RIGHT)"
                     continue
 
                 tqdm.write(Fore.GREEN + f"Success!", nolock=True, file=stdout)
@@ -427,16 +421,9 @@ def stereo_calibration(
 
                 objPoints.append(objP)
 
-                if improveSubPix:
-                    # LEFT
-                    corners_left = cv.cornerSubPix(
-                        grayImg_left, corners_left, (11, 11), (-1, -1), terminationCriteria
-                    )
-
-                    # RIGHT
-                    corners_right = cv.cornerSubPix(
-                        grayImg_right, corners_right, (11, 11), (-1, -1), terminationCriteria
-                    )
+                # Refined to sub-pixel precision during the detection (if `improveSubPix` is True)
+                corners_left = detection_left["corners"]
+                corners_right = detection_right["corners"]
 
                 imgPoints_left.append(corners_left)
                 imgPoints_right.append(corners_right)
@@ -444,60 +431,51 @@ def stereo_calibration(
                 if displayFoundCorners:
                     # Draw and display the corners
                     # LEFT
+                    img_left = cv.imread(detection_left["fileName"])
                     cv.drawChessboardCorners(
-                        img_left, (chessBoardSize[0], chessBoardSize[1]), corners_left, ret_left
+                        img_left, (chessBoardSize[0], chessBoardSize[1]), corners_left, True
                     )
                     cv.imshow("Current LEFT Image", img_left)
                     cv.waitKey(500)
 
                     # RIGHT
+                    img_right = cv.imread(detection_right["fileName"])
                     cv.drawChessboardCorners(
-                        img_right, (chessBoardSize[0], chessBoardSize[1]), corners_right, ret_right
+                        img_right, (chessBoardSize[0], chessBoardSize[1]), corners_right, True
                     )
                     cv.imshow("Current RIGHT Image", img_right)
                     cv.waitKey(500)
 
             cv.destroyAllWindows()
 
-            # overall RMS re-projection error, camera matrix, distortion coefficients, rotation vectors, translation vectors
-            print(Fore.GREEN + "\nCalibrating LEFT camera...")
-            rms_left, cameraMatrix_left, distortionCoefficients_left, rotationVectors_left, translationVectors_left = (
-                cv.calibrateCamera(objPoints, imgPoints_left, imgSize, None, None)
-            )
+            if selectViews:
+                selected = select_calibration_views(objPoints, imgPoints_left, imgSize, imgPoints_right, maxViews=maxViews)["selected"]
+                objPoints = [objPoints[i] for i in selected]
+                imgPoints_left = [imgPoints_left[i] for i in selected]
+                imgPoints_right = [imgPoints_right[i] for i in selected]
 
-            print(Fore.GREEN + "\nCalibrating RIGHT camera...")
-            rms_right, cameraMatrix_right, distortionCoefficients_right, rotationVectors_right, translationVectors_right = (
-                cv.calibrateCamera(objPoints, imgPoints_right, imgSize, None, None)
+            # overall RMS re-projection error, camera matrix, distortion coefficients, rotation vectors, translation vectors
+            print(Fore.GREEN + "\nCalibrating LEFT and RIGHT cameras...")
+            views, calibration_left, calibration_right, errors_left, errors_right = _calibrate_stereo_views(
+                objPoints, imgPoints_left, imgPoints_right, imgSize, pruneOutliers, pruneTimeBudget
             )
-
-            mse_left = 0
-            mse_right = 0
-            for i in range(len(objPoints)):
-                imgPoints_left_improved, _ = cv.projectPoints(
-                    objPoints[i],
-                    rotationVectors_left[i],
-                    translationVectors_left[i],
-                    cameraMatrix_left,
-                    distortionCoefficients_left,
-                )
-                error = cv.norm(imgPoints_left[i], imgPoints_left_improved, cv.NORM_L2) / len(imgPoints_left_improved)
-                mse_left += error
-
-                imgPoints_right_improved, _ = cv.projectPoints(
-                    objPoints[i],
-                    rotationVectors_right[i],
-                    translationVectors_right[i],
-                    cameraMatrix_right,
-                    distortionCoefficients_right,
-                )
-                error = cv.norm(imgPoints_right[i], imgPoints_right_improved, cv.NORM_L2) / len(imgPoints_right_improved)
-                mse_right += error
-
-            mse_left = mse_left / len(objPoints)
-            mse_right = mse_right / len(objPoints)
+            rms_left, cameraMatrix_left, distortionCoefficients_left, rotationVectors_left, translationVectors_left = calibration_left
+            rms_right, cameraMatrix_right, distortionCoefficients_right, rotationVectors_right, translationVectors_right = calibration_right
+
+            if len(views) < len(objPoints):
+                print(Fore.YELLOW + f"\nPruned {len(objPoints) - len(views)} views with the largest reprojection errors (RMS left: {errors_left['rms']:.4f} px, right: {errors_right['rms']:.4f} px)")
+                objPoints = [objPoints[i] for i in views]
+                imgPoints_left = [imgPoints_left[i] for i in views]
+                imgPoints_right = [imgPoints_right[i] for i in views]
+
+            # Mean of the squared reprojection errors of all corners (px^2)
+            mse_left = errors_left["mse"]
+            mse_right = errors_right["mse"]
             if displayMSE:
-                print(f"\nMean reprojection error left: {mse_left}")
-                print(f"\nMean reprojection error right: {mse_left}")
+                print(f"\nMean squared reprojection error left: {mse_left}")
+                print(f"Reprojection error of the views left (RMS): {np.round(errors_left['perView'], 4).tolist()}")
+                print(f"\nMean squared reprojection error right: {mse_right}")
+                print(f"Reprojection error of the views right (RMS): {np.round(errors_right['perView'], 4).tolist()}")
 
             if saveCalibrationParams:
                 try:
@@ -546,6 +524,9 @@ def stereo_calibration(
             print(chessboardFound)
             print(Fore.RED + "\nList of images skipped:\n")
             print(chessboardSkipped)
+            if chessboardRejected:
+                print(Fore.YELLOW + "\nList of images rejected by the prefilter:\n")
+                print(chessboardRejected)
 
     else:
         try:
@@ -592,7 +573,10 @@ def stereo_calibration(
     ######################################################################################
     # Stereo calibration
     ######################################################################################
-    image_size = grayImg_left.shape[::-1]  # (width, height)
+    if imgSize is None:
+        imgSize = cv.imread(images_left[0]).shape[1::-1]
+
+    image_size = imgSize  # (width, height)
 
     print(Fore.GREEN + "\nCalibrating STEREO cameras...")
     ret, CM1, dist1, CM2, dist2, R, T, E, F = cv.stereoCalibrate(
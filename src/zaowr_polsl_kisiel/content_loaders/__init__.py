@@ -13,7 +13,11 @@ Functions:
 
 - `load_stereo_calibration`: Loads stereo camera calibration data from a file.
 
-- `load_rectification_maps`: Loads stereo rectification maps from a file.
+- `load_rectification_maps`: Loads stereo rectification maps from the binary map store (memory-mapped) or a JSON file.
+
+- `save_rectification_maps`: Saves stereo rectification maps to the binary map store (`.npy` files keyed by a hash of the stereo calibration).
+
+- `rectification_maps_key`: Computes the key (hash of the stereo calibration) of the rectification maps in the binary map store.
 
 - `save_disparity_map`: Saves a disparity map to a file.
 
@@ -21,14 +25,16 @@ Functions:
 
 - `load_pfm_file`: Loads the ground truth (or any other) `.pfm` file.
 
-- `write_ply_file`: Writes a .ply file.
+- `write_ply_file`: Writes a .ply file (ASCII or binary).
+
+- `load_ply_file`: Loads a .ply file (binary files are memory-mapped).
 
 - `load_dept_map_calibration`: Loads depth map calibration data from a file.
 
 Usage:
     - Use this module to manage calibration and rectification data efficiently and safely.
     - Load the ground truth `.pgm` or `.pfm` file for comparisons and save the calculated disparity map.
-    - Write a .ply file for visualization.
+    - Write a .ply file for visualization and load it back for inspection.
     - Load depth map calibration data.
 """
 
@@ -38,10 +44,13 @@ __all__ = [
     "load_calibration",
     "load_stereo_calibration",
     "load_rectification_maps",
+    "save_rectification_maps",
+    "rectification_maps_key",
     "save_disparity_map",
     "load_pgm_file",
     "load_pfm_file",
     "write_ply_file",
+    "load_ply_file",
     "load_depth_map_calibration",
 ]
 
@@ -50,8 +59,10 @@ from .save_calibration import save_calibration # save calibration parameters (us
 from .load_calibration import load_calibration # load calibration parameters for single camera
 from .load_stereo_calibration import load_stereo_calibration # load stereo calibration
 from .load_rectification_maps import load_rectification_maps # load rectification maps
+from .save_rectification_maps import save_rectification_maps, rectification_maps_key # save rectification maps to the binary map store; compute the key of the maps (hash of the stereo calibration)
 from .save_disparity_map import save_disparity_map # save disparity map
 from .load_pgm_file import load_pgm_file # load the ground truth `.pgm` file
 from .load_pfm_file import load_pfm_file # load the ground truth `.pfm` file
 from .write_ply_file import write_ply_file # write .ply file
+from .load_ply_file import load_ply_file # load .ply file (memory-mapped if binary)
 from .load_depth_map_calibration import load_depth_map_calibration # load depth map calibration
\ No newline at end of file
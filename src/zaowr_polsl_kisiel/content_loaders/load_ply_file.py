@@ -0,0 +1,237 @@
+import os
+from itertools import islice
+
+import numpy as np
+from colorama import Fore, init as colorama_init  # , Back
+
+colorama_init(autoreset=True)
+
+# PLY scalar types mapped to numpy type codes (without the byte order)
+PLY_TYPES = {
+    "char": "i1", "int8": "i1",
+    "uchar": "u1", "uint8": "u1",
+    "short": "i2", "int16": "i2",
+    "ushort": "u2", "uint16": "u2",
+    "int": "i4", "int32": "i4",
+    "uint": "u4", "uint32": "u4",
+    "float": "f4", "float32": "f4",
+    "double": "f8", "float64": "f8",
+}
+
+PLY_BYTE_ORDERS = {
+    "ascii": "<",
+    "binary_little_endian": "<",
+    "binary_big_endian": ">",
+}
+
+
+def _parse_ply_header(f) -> tuple[str, list[dict]]:
+    """
+    Parse the PLY header. The file must be opened in binary mode, after parsing it is positioned at the start of the body.
+
+    :return: Format of the body and a list of elements - dicts with **name**, **count** and **properties**
+        (list of `(name, type)` for scalar properties or `(name, countType, itemType)` for list properties).
+    """
+    if f.readline().strip() != b"ply":
+        raise ValueError(Fore.RED + "\nNot a PLY file.\n")
+
+    plyFormat = None
+    elements = []
+
+    while True:
+        line = f.readline()
+        if not line:
+            raise ValueError(Fore.RED + "\nInvalid PLY file (missing `end_header`).\n")
+
+        tokens = line.decode("ascii").split()
+        if not tokens or tokens[0] in ("comment", "obj_info"):
+            continue
+
+        if tokens[0] == "end_header":
+            break
+
+        if tokens[0] == "format":
+            plyFormat = tokens[1]
+
+        elif tokens[0] == "element":
+            elements.append({"name": tokens[1], "count": int(tokens[2]), "properties": []})
+
+        elif tokens[0] == "property":
+            if not elements:
+                raise ValueError(Fore.RED + "\nInvalid PLY file (property defined before any element).\n")
+
+            if tokens[1] == "list":
+                elements[-1]["properties"].append((tokens[4], PLY_TYPES[tokens[2]], PLY_TYPES[tokens[3]]))
+            else:
+                elements[-1]["properties"].append((tokens[2], PLY_TYPES[tokens[1]]))
+
+    if plyFormat not in PLY_BYTE_ORDERS:
+        raise ValueError(Fore.RED + f"\nUnsupported PLY format: {plyFormat}\n")
+
+    return plyFormat, elements
+
+
+def _element_dtype(
+        properties: list[tuple],
+        byteOrder: str,
+        listLength: int = 0
+) -> np.dtype:
+    """
+    Build the structured dtype of an element. List properties are mapped to a count field (`<name>_count`) and a
+    fixed-size sub-array of `listLength` items.
+    """
+    fields = []
+    for prop in properties:
+        if len(prop) == 2:
+            fields.append((prop[0], byteOrder + prop[1]))
+        else:
+            name, countType, itemType = prop
+            fields.append((f"{name}_count", byteOrder + countType))
+            fields.append((name, byteOrder + itemType, (listLength,)))
+
+    return np.dtype(fields)
+
+
+def _read_binary_element(
+        f,
+        filePath: str,
+        element: dict,
+        byteOrder: str,
+        mmap: bool
+) -> np.ndarray:
+    """
+    Read (or memory-map) a single element of a binary PLY body starting at the current position of `f`.
+    """
+    offset = f.tell()
+    properties = element["properties"]
+    listLength = 0
+
+    listIndex = next((i for i, prop in enumerate(properties) if len(prop) == 3), None)
+    if listIndex is not None and element["count"] > 0:
+        # Lists are only supported if every record has the same length (e.g. triangles), so the record size is fixed.
+        # The length is read from the first record
+        headSize = _element_dtype(properties[:listIndex], byteOrder).itemsize
+        countType = np.dtype(byteOrder + properties[listIndex][1])
+        f.seek(offset + headSize)
+        listLength = int(np.frombuffer(f.read(countType.itemsize), dtype=countType)[0])
+
+    dtype = _element_dtype(properties, byteOrder, listLength)
+
+    if mmap and element["count"] > 0:
+        data = np.memmap(filePath, dtype=dtype, mode="r", offset=offset, shape=(element["count"],))
+    else:
+        f.seek(offset)
+        data = np.fromfile(f, dtype=dtype, count=element["count"])
+
+        if len(data) != element["count"]:
+            raise ValueError(Fore.RED + f"\nInvalid PLY file (element `{element['name']}` is truncated).\n")
+
+    for prop in properties:
+        if len(prop) == 3 and np.any(data[f"{prop[0]}_count"] != listLength):
+            raise ValueError(Fore.RED + f"\nList property `{prop[0]}` must have the same length in every record.\n")
+
+    f.seek(offset + dtype.itemsize * element["count"])
+
+    return data
+
+
+def _read_ascii_element(
+        f,
+        element: dict,
+        chunkSize: int
+) -> np.ndarray:
+    """
+    Read a single element of an ASCII PLY body in chunks of `chunkSize` lines.
+    """
+    properties = element["properties"]
+    count = element["count"]
+    data = None
+    listLength = 0
+
+    read = 0
+    while read < count:
+        lines = [line.decode("ascii") for line in islice(f, min(chunkSize, count - read))]
+        if not lines:
+            raise ValueError(Fore.RED + f"\nInvalid PLY file (element `{element['name']}` is truncated).\n")
+
+        rows = np.loadtxt(lines, dtype=np.float64, ndmin=2)
+
+        if data is None:
+            numLists = sum(len(prop) == 3 for prop in properties)
+            if numLists:
+                # Same restriction as in binary files - all lists must have the same length
+                listLength = (rows.shape[1] - (len(properties) - numLists)) // numLists - 1
+
+            data = np.empty(count, dtype=_element_dtype(properties, "<", listLength))
+
+        chunk = data[read:read + len(rows)]
+        column = 0
+        for prop in properties:
+            if len(prop) == 2:
+                chunk[prop[0]] = rows[:, column]
+                column += 1
+            else:
+                if np.any(rows[:, column] != listLength):
+                    raise ValueError(Fore.RED + f"\nList property `{prop[0]}` must have the same length in every record.\n")
+
+                chunk[f"{prop[0]}_count"] = rows[:, column]
+                chunk[prop[0]] = rows[:, column + 1:column + 1 + listLength]
+                column += 1 + listLength
+
+        read += len(rows)
+
+    if data is None:
+        data = np.empty(0, dtype=_element_dtype(properties, "<"))
+
+    return data
+
+
+def load_ply_file(
+        filePath: str,
+        mmap: bool = True,
+        chunkSize: int = 1_000_000,
+) -> dict[str, np.ndarray]:
+    """
+    Load a PLY file (e.g. saved with `write_ply_file`) and return its elements as structured numpy arrays.
+
+    Binary bodies are **memory-mapped** (`np.memmap`), so loading is near-instant regardless of the file size and the data
+    is only read from disk when accessed. Fields are zero-copy views, e.g. `cloud["vertex"]["x"]` or
+    `cloud["vertex"][["x", "y", "z"]]`. ASCII bodies are parsed in chunks of `chunkSize` lines.
+
+    List properties (e.g. `vertex_indices` of faces) are supported if every record has the same number of items
+    (e.g. a triangle mesh) - the list is stored as a fixed-size sub-array field with an additional `<name>_count` field.
+
+    :param str filePath: Path to the PLY file.
+    :param bool mmap: If True, binary bodies are memory-mapped (read-only), otherwise they are read into memory. Default is True.
+    :param int chunkSize: Number of lines parsed at once for ASCII bodies. Default is 1 000 000.
+
+    :raises ValueError: Raises ValueError if:
+        - **`filePath`** is not provided or is not a string,
+        - **`chunkSize`** is not a positive integer,
+        - **`filePath`** is not a valid PLY file or uses lists of variable length.
+    :raises FileNotFoundError: If the PLY file is not found.
+
+    :return: dict[str, np.ndarray] - Elements of the PLY file (e.g. **"vertex"**, **"face"**) as structured arrays.
+    """
+    if not filePath or not isinstance(filePath, str):
+        raise ValueError(Fore.RED + "\nFile path must be a non-empty string.\n")
+
+    if not os.path.isfile(filePath):
+        raise FileNotFoundError(Fore.RED + f"\nFile '{filePath}' not found!\n")
+
+    if not isinstance(chunkSize, int) or chunkSize <= 0:
+        raise ValueError(Fore.RED + "\n`chunkSize` must be a positive integer!\n")
+
+    elements = {}
+    with open(filePath, "rb") as f:
+        plyFormat, header = _parse_ply_header(f)
+
+        for element in header:
+            if plyFormat == "ascii":
+                elements[element["name"]] = _read_ascii_element(f, element, chunkSize)
+            else:
+                elements[element["name"]] = _read_binary_element(f, filePath, element, PLY_BYTE_ORDERS[plyFormat], mmap)
+
+    print(Fore.GREEN + f"\nPLY file loaded successfully ({', '.join(f'{k}: {len(v)}' for k, v in elements.items())})")
+
+    return elements
@@ -3,10 +3,14 @@ from typing import TYPE_CHECKING, TypedDict, Any
 
 from ..custom_exceptions.exceptions import RectificationMapsPathNotProvided, CalibrationParamsWrongFormat
 
+import os
 from json import load as jload
 from numpy import array as npArray
+from numpy import load as npLoad
 from numpy import ndarray as npNdArray
 
+from .save_rectification_maps import RECTIFICATION_MAP_NAMES
+
 # To avoid creating a class at runtime, for type-hinting alone.
 if TYPE_CHECKING:
     # Map the `dict` fields here
@@ -29,11 +33,52 @@ if TYPE_CHECKING:
         map2_right: npNdArray
 
 
-def load_rectification_maps(rectificationMapsPath: str) -> RectificationMaps:
+def _find_maps_dir(
+    rectificationMapsPath: str,
+    calibrationKey: str | None
+) -> str:
+    """
+    Find the directory with the `.npy` maps in the binary map store.
     """
-    Load rectification maps for stereo camera rectification from a specified JSON file.
+    def has_maps(path: str) -> bool:
+        return all(os.path.isfile(os.path.join(path, f"{name}.npy")) for name in RECTIFICATION_MAP_NAMES)
+
+    if calibrationKey:
+        mapsDirPath = os.path.join(rectificationMapsPath, calibrationKey)
+        if not has_maps(mapsDirPath):
+            raise CalibrationParamsWrongFormat(f"Rectification maps for calibration '{calibrationKey}' not found in '{rectificationMapsPath}'")
+
+        return mapsDirPath
+
+    if has_maps(rectificationMapsPath):
+        return rectificationMapsPath
+
+    # Without a key, the store must contain exactly one set of maps
+    candidates = [
+        os.path.join(rectificationMapsPath, entry) for entry in sorted(os.listdir(rectificationMapsPath))
+        if has_maps(os.path.join(rectificationMapsPath, entry))
+    ]
+    if len(candidates) != 1:
+        raise CalibrationParamsWrongFormat(f"Expected exactly one set of rectification maps in '{rectificationMapsPath}' (found {len(candidates)}), provide `calibrationKey`")
+
+    return candidates[0]
+
 
-    :param str rectificationMapsPath: Path to the JSON file containing rectification maps.
+def load_rectification_maps(
+    rectificationMapsPath: str,
+    calibrationKey: str = None,
+    mmap: bool = True,
+) -> RectificationMaps:
+    """
+    Load rectification maps for stereo camera rectification from the binary map store (directory, see
+    `save_rectification_maps`) or from a specified JSON file (legacy format, saved with `save_calibration`).
+
+    The binary maps are memory-mapped by default, so loading takes milliseconds regardless of the image size - the data is
+    read from the disk only when the maps are used (e.g. by `cv2.remap`).
+
+    :param str rectificationMapsPath: Path to the map store directory or to the JSON file containing rectification maps.
+    :param str calibrationKey: Key of the maps in the map store (see `rectification_maps_key`). If None, the directory itself or its only subdirectory with maps is used. Ignored for JSON files. Default is None.
+    :param bool mmap: Memory-map the binary maps (read-only) instead of reading them into memory. Default is True.
     :return: Returns a dictionary containing the rectification maps:
         - **map1_left** (np.ndarray) - First rectification map for the left camera.
         - **map2_left** (np.ndarray) - Second rectification map for the left camera.
@@ -41,13 +86,21 @@ def load_rectification_maps(rectificationMapsPath: str) -> RectificationMaps:
         - **map2_right** (np.ndarray) - Second rectification map for the right camera.
 
     :raises RectificationMapsPathNotProvided: If the path is missing or not a string.
-    :raises CalibrationParamsWrongFormat: If the file does not contain the correct format or parameters.
+    :raises CalibrationParamsWrongFormat: If the file does not contain the correct format or parameters (or the maps for the key are not in the store).
     """
 
     # Check if the provided path is valid
     if not rectificationMapsPath or not isinstance(rectificationMapsPath, str):
         raise RectificationMapsPathNotProvided("Path must be a non-empty string.")
 
+    if os.path.isdir(rectificationMapsPath):
+        mapsDirPath = _find_maps_dir(rectificationMapsPath, calibrationKey)
+
+        return {
+            name: npLoad(os.path.join(mapsDirPath, f"{name}.npy"), mmap_mode="r" if mmap else None)
+            for name in RECTIFICATION_MAP_NAMES
+        }
+
     with open(rectificationMapsPath, "r") as file:
         jsonDump = jload(file)
 
@@ -0,0 +1,97 @@
+import os
+from hashlib import sha1
+
+import numpy as np
+from colorama import Fore, init as colorama_init
+
+from ..custom_exceptions.exceptions import RectificationMapsPathNotProvided, MissingParameters
+
+colorama_init(autoreset=True)
+
+# Names of the maps (and of the `.npy` files in the binary map store)
+RECTIFICATION_MAP_NAMES = ["map1_left", "map2_left", "map1_right", "map2_right"]
+
+
+def rectification_maps_key(
+    cameraMatrix_left: np.ndarray,
+    distortionCoefficients_left: np.ndarray,
+    cameraMatrix_right: np.ndarray,
+    distortionCoefficients_right: np.ndarray,
+    R: np.ndarray,
+    T: np.ndarray,
+    imageSize: tuple[int, int],
+    cropToValidRoi: bool = False,
+    outputScale: float = 1.0,
+) -> str:
+    """
+    Compute the key of the rectification maps in the binary map store - a hash of the stereo calibration and image size,
+    so the maps of different calibrations (or resolutions) never overwrite each other and stale maps are never loaded.
+
+    :param np.ndarray cameraMatrix_left: Intrinsic matrix of the left camera.
+    :param np.ndarray distortionCoefficients_left: Distortion coefficients of the left camera.
+    :param np.ndarray cameraMatrix_right: Intrinsic matrix of the right camera.
+    :param np.ndarray distortionCoefficients_right: Distortion coefficients of the right camera.
+    :param np.ndarray R: Rotation matrix between the cameras.
+    :param np.ndarray T: Translation vector between the cameras.
+    :param tuple[int, int] imageSize: Size of the images (width, height).
+    :param bool cropToValidRoi: Whether the maps crop the images to the valid ROI (see `stereo_rectify`). Default is False.
+    :param float outputScale: Scale of the output images of the maps (see `stereo_rectify`). Default is 1.0.
+
+    :return: Key of the maps (16 hexadecimal characters).
+    """
+    digest = sha1()
+    for param in (cameraMatrix_left, distortionCoefficients_left, cameraMatrix_right, distortionCoefficients_right, R, T):
+        digest.update(np.ascontiguousarray(param, dtype=np.float64).ravel().tobytes())
+
+    digest.update(f"{int(imageSize[0])}x{int(imageSize[1])}".encode("ascii"))
+
+    # Fused (cropped and/or scaled) maps get their own key, plain maps keep the key of the calibration only
+    if cropToValidRoi or outputScale != 1.0:
+        digest.update(f"crop={bool(cropToValidRoi)};scale={float(outputScale)!r}".encode("ascii"))
+
+    return digest.hexdigest()[:16]
+
+
+def save_rectification_maps(
+    rectificationMaps: dict[str, np.ndarray],
+    rectificationMapsPath: str,
+    calibrationKey: str = None,
+) -> str:
+    """
+    Save the rectification maps to the binary map store - one `.npy` file per map (raw binary data plus a small header
+    with the dtype and shape), so they can be loaded with `load_rectification_maps` in milliseconds (memory-mapped).
+    Unlike the JSON format (`save_calibration`), the files have the size of the maps in memory.
+
+    The maps are saved to `<rectificationMapsPath>/<calibrationKey>/` (or directly to `rectificationMapsPath` if the key
+    is not provided). The key can be computed with `rectification_maps_key`.
+
+    :param dict[str, np.ndarray] rectificationMaps: Dictionary with the maps (**map1_left**, **map2_left**, **map1_right**, **map2_right**).
+    :param str rectificationMapsPath: Directory of the map store (created if it does not exist).
+    :param str calibrationKey: Key of the maps (subdirectory of the map store). Default is None.
+
+    :raises RectificationMapsPathNotProvided: If the path is missing or not a string.
+    :raises MissingParameters: If any of the maps is missing.
+
+    :return: Path of the directory with the saved maps.
+    """
+    if not rectificationMapsPath or not isinstance(rectificationMapsPath, str):
+        raise RectificationMapsPathNotProvided
+
+    if any(rectificationMaps.get(name) is None for name in RECTIFICATION_MAP_NAMES):
+        raise MissingParameters(f"All rectification maps ({', '.join(RECTIFICATION_MAP_NAMES)}) must be provided")
+
+    mapsDirPath = os.path.join(rectificationMapsPath, calibrationKey) if calibrationKey else rectificationMapsPath
+    os.makedirs(mapsDirPath, exist_ok=True)
+
+    for name in RECTIFICATION_MAP_NAMES:
+        # Written to a temporary file and swapped in - the old file may still be memory-mapped (e.g. the maps being
+        # saved were loaded from it), truncating it in place would corrupt both the maps and the store
+        mapPath = os.path.join(mapsDirPath, f"{name}.npy")
+        with open(mapPath + ".tmp", "wb") as file:
+            np.save(file, np.ascontiguousarray(rectificationMaps[name]))
+
+        os.replace(mapPath + ".tmp", mapPath)
+
+    print(Fore.GREEN + f"\nRectification maps saved to '{mapsDirPath}'")
+
+    return mapsDirPath
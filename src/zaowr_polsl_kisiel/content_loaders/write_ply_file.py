@@ -1,61 +1,267 @@
 import os
+import shutil
+import tempfile
+from itertools import chain
+from typing import BinaryIO, Iterable
+
 import numpy as np
 from colorama import Fore, init as colorama_init  # , Back
 
 colorama_init(autoreset=True)
 
-def write_ply_file(
-        fileName: str,
+# Packed layout of a single vertex (15 bytes) - float32 xyz and uint8 rgb, little-endian
+PLY_VERTEX_DTYPE = np.dtype([
+    ("x", "<f4"),
+    ("y", "<f4"),
+    ("z", "<f4"),
+    ("red", "u1"),
+    ("green", "u1"),
+    ("blue", "u1"),
+])
+
+# Packed layout of a single triangle (13 bytes) - `list uchar int vertex_indices`, little-endian
+PLY_FACE_DTYPE = np.dtype([
+    ("count", "u1"),
+    ("vertex_indices", "<i4", (3,)),
+])
+
+PLY_FORMATS = ["ascii", "binary_little_endian"]
+
+# Width reserved for the element count when the number of vertices is not known up front (streaming)
+_PLY_COUNT_WIDTH = 20
+
+
+def _write_ply_header(
+        f: BinaryIO,
+        plyFormat: str,
+        vertNum: int | None,
+        faceNum: int | None = 0,
+        withFaces: bool = False,
+) -> tuple[int | None, int | None]:
+    """
+    Write the PLY header. If `vertNum` (or `faceNum`) is None, a fixed-width placeholder is written instead of the count,
+    so it can be patched once the whole stream has been written. The `face` element is only written if `withFaces` is True.
+
+    :return: Offsets of the vertex and face count placeholders (or None if the count was written directly).
+    """
+    f.write(f"ply\nformat {plyFormat} 1.0\n".encode("ascii"))
+
+    def write_element(name: str, count: int | None) -> int | None:
+        if count is None:
+            f.write(f"element {name} ".encode("ascii"))
+            offset = f.tell()
+            f.write(b" " * _PLY_COUNT_WIDTH + b"\n")
+            return offset
+
+        f.write(f"element {name} {count}\n".encode("ascii"))
+        return None
+
+    vertCountOffset = write_element("vertex", vertNum)
+    f.write(
+        b"property float x\n"
+        b"property float y\n"
+        b"property float z\n"
+        b"property uchar red\n"
+        b"property uchar green\n"
+        b"property uchar blue\n"
+    )
+
+    faceCountOffset = None
+    if withFaces:
+        faceCountOffset = write_element("face", faceNum)
+        f.write(b"property list uchar int vertex_indices\n")
+
+    f.write(b"end_header\n")
+
+    return vertCountOffset, faceCountOffset
+
+
+def _pack_vertices(
         verts: np.ndarray,
         colors: np.ndarray
+) -> np.ndarray:
+    """
+    Pack the vertices and colors into a structured array (`PLY_VERTEX_DTYPE`) without promoting the colors to floats.
+    """
+    verts = verts.reshape(-1, 3)
+    colors = colors.reshape(-1, 3)
+
+    if len(verts) != len(colors):
+        raise ValueError(Fore.RED + f"\nNumber of vertices ({len(verts)}) and colors ({len(colors)}) must be equal!\n")
+
+    packed = np.empty(len(verts), dtype=PLY_VERTEX_DTYPE)
+    packed["x"] = verts[:, 0]
+    packed["y"] = verts[:, 1]
+    packed["z"] = verts[:, 2]
+    packed["red"] = colors[:, 0]
+    packed["green"] = colors[:, 1]
+    packed["blue"] = colors[:, 2]
+
+    return packed
+
+
+def _pack_faces(
+        faces: np.ndarray,
+        vertNum: int
+) -> np.ndarray:
+    """
+    Pack the triangles into a structured array (`PLY_FACE_DTYPE`). The vertex indices must refer to already written
+    vertices (`0 <= index < vertNum`).
+    """
+    if not isinstance(faces, np.ndarray) or not np.issubdtype(faces.dtype, np.integer):
+        raise TypeError(Fore.RED + "\nFaces must be a numpy array of integers!\n")
+
+    faces = faces.reshape(-1, 3)
+
+    if len(faces) and (faces.min() < 0 or faces.max() >= vertNum):
+        raise ValueError(Fore.RED + f"\nFace vertex indices must be in range [0, {vertNum})!\n")
+
+    packed = np.empty(len(faces), dtype=PLY_FACE_DTYPE)
+    packed["count"] = 3
+    packed["vertex_indices"] = faces
+
+    return packed
+
+
+def _write_ply_body(
+        f: BinaryIO,
+        packed: np.ndarray,
+        plyFormat: str
+) -> None:
+    """
+    Write the packed vertices (or faces) to the file in the requested format.
+    """
+    if plyFormat == "binary_little_endian":
+        packed.tofile(f)
+    elif packed.dtype == PLY_FACE_DTYPE:
+        np.savetxt(f, np.column_stack([packed["count"], packed["vertex_indices"]]), fmt="%d %d %d %d")
+    else:
+        np.savetxt(f, packed, fmt="%f %f %f %d %d %d")
+
+
+def write_ply_file(
+        fileName: str,
+        verts: np.ndarray | Iterable[tuple[np.ndarray, ...]],
+        colors: np.ndarray = None,
+        plyFormat: str = "ascii",
+        faces: np.ndarray = None,
 ) -> None:
     """
-    Write a point cloud to a PLY file. The point cloud is represented by a list of vertices and a list of colors. The PLY file is saved in ASCII format. If the directory does not exist, it will be created.
+    Write a point cloud (or a triangle mesh) to a PLY file. The point cloud is represented by a list of vertices and a list of colors. If the directory does not exist, it will be created.
+
+    The file can be saved in **ASCII** (default) or **binary little-endian** format. The binary format writes a packed
+    structured array (float32 `x, y, z` and uint8 `red, green, blue`) with a single `tofile` call, which is
+    orders of magnitude faster and smaller than ASCII for large clouds.
+
+    If `faces` (M, 3) is provided, the triangles are saved as a `face` element (`list uchar int vertex_indices`), so the
+    file can be rendered as a mesh.
+
+    Instead of arrays, `verts` can also be an iterable (e.g. a generator) yielding `(verts, colors)` or
+    `(verts, colors, faces)` chunks - in that case `colors` and `faces` must be None. The chunks are written one by one
+    (only one chunk is kept in memory) and the counts in the header are filled in after the last chunk. Face indices are
+    global (they refer to all vertices yielded so far, including the current chunk). Since PLY stores all vertices before
+    the faces, the faces are spooled to a temporary file and appended at the end.
 
     :param str fileName: Name of the PLY file.
-    :param np.ndarray verts: Vertices of the point cloud.
-    :param np.ndarray colors: Colors of the vertices.
+    :param np.ndarray | Iterable[tuple[np.ndarray, ...]] verts: Vertices of the point cloud or an iterable of `(verts, colors)` / `(verts, colors, faces)` chunks.
+    :param np.ndarray colors: Colors of the vertices (RGB, 0-255). Must be None if `verts` is an iterable of chunks.
+    :param str plyFormat: Format of the PLY file (**"ascii"** or **"binary_little_endian"**). Default is "ascii".
+    :param np.ndarray faces: Triangles (M, 3) as indices of the vertices. Must be None if `verts` is an iterable of chunks. Default is None.
 
     :raises ValueError: Raises ValueError if:
         - **`fileName`** is not a string or is an empty string,
-        - **`verts`** or **`colors`** is not a numpy array
+        - **`verts`** or **`colors`** is not provided,
+        - **`plyFormat`** is not one of the supported formats,
+        - number of vertices and colors differs,
+        - face vertex indices are out of range
     :raises TypeError: Raises TypeError if:
-        - **`fileName`** is not a string or is an empty string,
-        - **`verts`** or **`colors`** is not a numpy array
+        - **`verts`** or **`colors`** is not a numpy array,
+        - **`faces`** is not a numpy array of integers,
+        - **`colors`** or **`faces`** is provided when **`verts`** is an iterable of chunks
 
     :return: None
     """
-    if verts is None or colors is None:
+    if fileName is None or not isinstance(fileName, str) or len(fileName) == 0:
+        raise ValueError(Fore.RED + "\n`fileName` must be an non-empty string!\n")
+
+    if plyFormat not in PLY_FORMATS:
+        raise ValueError(Fore.RED + f"\n`plyFormat` must be one of {PLY_FORMATS}!\n")
+
+    if verts is None:
         raise ValueError(Fore.RED + "\nVertices and colors must be provided!\n")
 
-    if not isinstance(verts, np.ndarray) or not isinstance(colors, np.ndarray):
-        raise TypeError(Fore.RED + "\nVertices and colors must be numpy arrays!\n")
+    streaming = not isinstance(verts, np.ndarray)
 
-    if fileName is None or not isinstance(fileName, str) or len(fileName) == 0:
-        raise ValueError(Fore.RED + "\n`fileName` must be an non-empty string!\n")
+    if streaming:
+        if colors is not None or faces is not None:
+            raise TypeError(Fore.RED + "\n`colors` and `faces` must be None when `verts` is an iterable of chunks!\n")
+
+        # Peek at the first chunk to find out if the stream contains faces
+        chunks = iter(verts)
+        firstChunk = next(chunks, None)
+        withFaces = firstChunk is not None and len(firstChunk) == 3
+        if firstChunk is not None:
+            chunks = chain([firstChunk], chunks)
+
+    else:
+        if colors is None:
+            raise ValueError(Fore.RED + "\nVertices and colors must be provided!\n")
+
+        if not isinstance(colors, np.ndarray):
+            raise TypeError(Fore.RED + "\nVertices and colors must be numpy arrays!\n")
+
+        withFaces = faces is not None
 
     # Ensure the directory exists
     directory = os.path.dirname(fileName)
-    if not os.path.exists(directory):
+    if directory and not os.path.exists(directory):
         os.makedirs(directory)
 
-    ply_header = '''ply
-    format ascii 1.0
-    element vertex %(vert_num)d
-    property float x
-    property float y
-    property float z
-    property uchar red
-    property uchar green
-    property uchar blue
-    end_header
-    '''
-
-    verts = verts.reshape(-1, 3)
-    colors = colors.reshape(-1, 3)
-    verts = np.hstack([verts, colors])
     with open(fileName, 'wb') as f:
-        f.write((ply_header % dict(vert_num=len(verts))).encode('utf-8'))
-        np.savetxt(f, verts, fmt='%f %f %f %d %d %d ')
+        if not streaming:
+            packed = _pack_vertices(verts, colors)
+            packedFaces = _pack_faces(faces, len(packed)) if withFaces else None
+            _write_ply_header(f, plyFormat, len(packed), len(packedFaces) if withFaces else 0, withFaces)
+            _write_ply_body(f, packed, plyFormat)
+            if withFaces:
+                _write_ply_body(f, packedFaces, plyFormat)
+
+        else:
+            vertCountOffset, faceCountOffset = _write_ply_header(f, plyFormat, None, None, withFaces)
+            vertNum = 0
+            faceNum = 0
+
+            with tempfile.TemporaryFile() as facesFile:
+                for chunk in chunks:
+                    if len(chunk) != (3 if withFaces else 2):
+                        raise ValueError(Fore.RED + "\nAll chunks must be either (verts, colors) or (verts, colors, faces) tuples!\n")
+
+                    chunkVerts, chunkColors = chunk[:2]
+                    if not isinstance(chunkVerts, np.ndarray) or not isinstance(chunkColors, np.ndarray):
+                        raise TypeError(Fore.RED + "\nVertices and colors must be numpy arrays!\n")
+
+                    packed = _pack_vertices(chunkVerts, chunkColors)
+                    _write_ply_body(f, packed, plyFormat)
+                    vertNum += len(packed)
+
+                    if withFaces:
+                        packedFaces = _pack_faces(chunk[2], vertNum)
+                        _write_ply_body(facesFile, packedFaces, plyFormat)
+                        faceNum += len(packedFaces)
+
+                if withFaces:
+                    facesFile.seek(0)
+                    shutil.copyfileobj(facesFile, f)
+
+            # Patch the counts in the header
+            f.seek(vertCountOffset)
+            f.write(str(vertNum).ljust(_PLY_COUNT_WIDTH).encode("ascii"))
+
+            if withFaces:
+                f.seek(faceCountOffset)
+                f.write(str(faceNum).ljust(_PLY_COUNT_WIDTH).encode("ascii"))
 
-    print(Fore.GREEN + f"\nPoint cloud saved to {fileName}")
\ No newline at end of file
+    if withFaces:
+        print(Fore.GREEN + f"\nMesh saved to {fileName}")
+    else:
+        print(Fore.GREEN + f"\nPoint cloud saved to {fileName}")
@@ -6,8 +6,16 @@ Functions:
 
 - `remove_distortion`: Removes distortion from a single image using calibration parameters.
 
+- `remove_distortion_batch`: Removes distortion from all images in a directory (cached maps, threaded read/remap/write, file names preserved).
+
 - `stereo_rectify`: Rectifies a stereo image pair after stereo calibration.
 
+- `stereo_rectify_batch`: Rectifies all stereo pairs of a session (maps built once, pairs matched by name, threaded, optional grayscale output).
+
+- `stereo_rectify_stream`: Rectifies a synchronized stereo video stream (two sources or side-by-side, reader threads, frames paired by timestamp) and yields the rectified frame pairs.
+
+- `check_rectification_quality`: Checks the stereo rectification on the detected corners (vertical disparity statistics, no images needed).
+
 - `calculate_disparity_map`: Calculates a disparity map using different algorithms.
 
 - `calculate_color_difference_map`: Calculates a color difference map between two images (calculated disparity map and ground truth disparity map).
@@ -26,20 +34,39 @@ Functions:
 
 - `create_color_point_cloud`: Creates a color point cloud from disparity map, depth map and color image and limit max depth.
 
+- `voxel_downsample`: Downsamples a point cloud using a voxel grid (average position and color per voxel).
+
+- `remove_point_cloud_outliers`: Removes outliers from a point cloud using a grid-accelerated neighbour count (statistical and radius filter).
+
+- `create_depth_mesh`: Creates a colored triangle mesh from a disparity map (streamed in bands, triangles across depth discontinuities are dropped).
+
+- `export_ply_sequence`: Converts a sequence of disparity frames (folder or video) to a sequence of PLY files using background writer threads.
+
+Classes:
+
+- `TSDFVolume`: Fuses successive depth (or disparity) maps and camera poses into a sparse voxel-hashed TSDF and extracts the fused point cloud or mesh.
+
 Usage:
     - Import this module for image distortion correction,
-    - stereo rectification,
+    - stereo rectification (single pair, whole session or video stream) and its quality check,
     - disparity map calculation (you can also save the disparity map and plot the comparison of different disparity maps),
     - disparity map normalization,
     - color difference map calculation,
     - convert a disparity map to a depth map and normalize it to a specified range,
     - convert a depth map to a disparity map,
-    - decode a depth map to a specified range (e.g. 8-bit, 16-bit, 24-bit. ONLY USE THE 24-BIT RANGE).
+    - decode a depth map to a specified range (e.g. 8-bit, 16-bit, 24-bit. ONLY USE THE 24-BIT RANGE),
+    - create a color point cloud, downsample it and remove outliers before saving it,
+    - create a triangle mesh from a disparity map,
+    - fuse a sequence of depth maps into a single point cloud or mesh.
 """
 
 __all__ = [
     "remove_distortion",
+    "remove_distortion_batch",
     "stereo_rectify",
+    "stereo_rectify_batch",
+    "stereo_rectify_stream",
+    "check_rectification_quality",
     "calculate_disparity_map",
     "calculate_color_difference_map",
     "plot_disparity_map_comparison",
@@ -49,10 +76,19 @@ __all__ = [
     "depth_to_disparity_map",
     "decode_depth_map",
     "create_color_point_cloud",
+    "voxel_downsample",
+    "remove_point_cloud_outliers",
+    "create_depth_mesh",
+    "export_ply_sequence",
+    "TSDFVolume",
 ]
 
 from .remove_distortion import remove_distortion # remove distortion from single image
+from .remove_distortion_batch import remove_distortion_batch # remove distortion from all images in a directory (threaded)
 from .stereo_rectify import stereo_rectify # rectify stereo image after stereo calibration
+from .stereo_rectify_batch import stereo_rectify_batch # rectify all stereo pairs of a session (threaded)
+from .stereo_rectify_stream import stereo_rectify_stream # rectify a synchronized stereo video stream (generator)
+from .check_rectification_quality import check_rectification_quality # check the stereo rectification on the detected corners
 from .calculate_disparity_map import calculate_disparity_map, plot_disparity_map_comparison # calculate disparity map using StereoBM, StereoSGBM, and custom block matching; plot disparity map comparison
 from .calculate_color_difference_map import calculate_color_difference_map # calculate color difference map
 from .disparity_to_depth_map import disparity_to_depth_map # convert disparity map to depth map
@@ -60,4 +96,9 @@ from .depth_map_normalize import depth_map_normalize # normalize depth map to a
 from .disparity_map_normalize import disparity_map_normalize # normalize disparity map to a specified range
 from .depth_to_disparity_map import depth_to_disparity_map # convert depth map to disparity map
 from .decode_depth_map import decode_depth_map # decode depth map
-from .create_color_point_cloud import create_color_point_cloud # create color point cloud from disparity map, depth map and color image and limit max depth
\ No newline at end of file
+from .create_color_point_cloud import create_color_point_cloud # create color point cloud from disparity map, depth map and color image and limit max depth
+from .voxel_downsample import voxel_downsample # downsample point cloud using a voxel grid
+from .remove_point_cloud_outliers import remove_point_cloud_outliers # remove outliers from point cloud (grid-accelerated)
+from .create_depth_mesh import create_depth_mesh # create colored triangle mesh from disparity map
+from .export_ply_sequence import export_ply_sequence # convert a sequence of disparity frames to a sequence of PLY files
+from .tsdf_fusion import TSDFVolume # fuse depth maps into a sparse voxel-hashed TSDF
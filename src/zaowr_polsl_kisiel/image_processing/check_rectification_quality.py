@@ -0,0 +1,187 @@
+from typing import Any
+
+import cv2 as cv
+import numpy as np
+from colorama import Fore, init as colorama_init
+
+from ..custom_exceptions.exceptions import MissingParameters, StereoRectificationError
+
+colorama_init(autoreset=True)
+
+
+def _corresponding_points(
+        imgPoints_left: list,
+        imgPoints_right: list,
+        ids_left: list = None,
+        ids_right: list = None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Stack the corresponding corners of all views into two `(N, 1, 2)` arrays. Without ids (chessboard), views with
+    a different number of corners in the left and right image are skipped. With ids (ChArUco), only the corners detected
+    in both images of the view are kept.
+
+    :return: Left points, right points and the index of the view of every point.
+    """
+    points_left, points_right, views = [], [], []
+
+    for view, (left, right) in enumerate(zip(imgPoints_left, imgPoints_right)):
+        left = np.asarray(left, dtype=np.float64).reshape(-1, 2)
+        right = np.asarray(right, dtype=np.float64).reshape(-1, 2)
+
+        if ids_left is not None and ids_right is not None:
+            _, indices_left, indices_right = np.intersect1d(
+                np.asarray(ids_left[view]).ravel(), np.asarray(ids_right[view]).ravel(), return_indices=True
+            )
+            left, right = left[indices_left], right[indices_right]
+
+        elif len(left) != len(right):
+            continue
+
+        points_left.append(left)
+        points_right.append(right)
+        views.append(np.full(len(left), view))
+
+    if len(points_left) == 0:
+        return np.empty((0, 1, 2)), np.empty((0, 1, 2)), np.empty(0, dtype=int)
+
+    return (
+        np.concatenate(points_left).reshape(-1, 1, 2),
+        np.concatenate(points_right).reshape(-1, 1, 2),
+        np.concatenate(views),
+    )
+
+
+def check_rectification_quality(
+    imgPoints_left: list | np.ndarray,
+    imgPoints_right: list | np.ndarray,
+    imageSize: tuple[int, int],
+    cameraMatrix_left: np.ndarray = None,
+    cameraMatrix_right: np.ndarray = None,
+    distortionCoefficients_left: np.ndarray = None,
+    distortionCoefficients_right: np.ndarray = None,
+    R: np.ndarray = None,
+    T: np.ndarray = None,
+    loadStereoCalibrationParams: bool = False,
+    stereoCalibrationParamsPath: str = "",
+    ids_left: list = None,
+    ids_right: list = None,
+    maxVerticalDisparity: float = 1.0,
+    verbose: bool = True,
+) -> dict[str, Any]:
+    """
+    Check the quality of the stereo rectification without rectifying (or drawing) any images - the detected corners
+    (chessboard or ChArUco) of both cameras are rectified with `cv.undistortPoints` (R1/P1 and R2/P2 from
+    `cv.stereoRectify`, the same as the rectification maps of `stereo_rectify`) and the vertical disparity (difference
+    of the `y` coordinates of the corresponding corners) is computed for all views in one vectorized pass.
+
+    After a correct rectification the corresponding points lie on the same row, so the vertical disparity should be
+    close to zero. A large p95 (or a systematic offset - `meanSigned`) means that the rig has drifted and should be
+    recalibrated.
+
+    :param list | np.ndarray imgPoints_left: Corners detected in the left images (one array of shape `(N, 1, 2)` per view, e.g. `imgPoints` from the calibration parameters).
+    :param list | np.ndarray imgPoints_right: Corners detected in the right images (same views as `imgPoints_left`).
+    :param tuple[int, int] imageSize: Size of the images (width, height).
+    :param np.ndarray cameraMatrix_left: Intrinsic matrix of the left camera (3x3). Required if not loading parameters.
+    :param np.ndarray cameraMatrix_right: Intrinsic matrix of the right camera (3x3). Required if not loading parameters.
+    :param np.ndarray distortionCoefficients_left: Distortion coefficients of the left camera.
+    :param np.ndarray distortionCoefficients_right: Distortion coefficients of the right camera.
+    :param np.ndarray R: Rotation matrix (3x3) between the two cameras. Required if not loading parameters.
+    :param np.ndarray T: Translation vector (3x1) between the two cameras. Required if not loading parameters.
+    :param bool loadStereoCalibrationParams: Whether to load stereo calibration parameters from a file.
+    :param str stereoCalibrationParamsPath: Path to the stereo calibration parameters file.
+    :param list ids_left: ChArUco ids of the left corners (one array per view). If provided with `ids_right`, the corners are matched by id. Default is None (corners are matched by order).
+    :param list ids_right: ChArUco ids of the right corners (one array per view). Default is None.
+    :param float maxVerticalDisparity: Maximum accepted p95 of the absolute vertical disparity in pixels. Default is 1.0.
+    :param bool verbose: Print the summary. Default is True.
+
+    :raises MissingParameters: If required camera parameters are missing and not loaded from a file.
+    :raises StereoRectificationError: If there are no corresponding corners or the stereo rectification fails.
+    :raises ValueError: If `imgPoints_left` and `imgPoints_right` have a different number of views.
+
+    :return: Dictionary with the statistics of the absolute vertical disparity in pixels (**count**, **mean**, **median**, **rms**, **p95**, **max**), the mean signed vertical disparity (**meanSigned**), the fraction of points above `maxVerticalDisparity` (**fractionAbove**), the median per view (**perView**, NaN for skipped views) and the result (**valid**).
+    """
+    if len(imgPoints_left) != len(imgPoints_right):
+        raise ValueError(Fore.RED + "\n`imgPoints_left` and `imgPoints_right` must have the same number of views!\n")
+
+    if loadStereoCalibrationParams:
+        from ..content_loaders import load_stereo_calibration
+
+        stereoCalibrationParams = load_stereo_calibration(stereoCalibrationParamsPath)
+
+        cameraMatrix_left = stereoCalibrationParams["cameraMatrix_left"]
+        cameraMatrix_right = stereoCalibrationParams["cameraMatrix_right"]
+        distortionCoefficients_left = stereoCalibrationParams["distortionCoefficients_left"]
+        distortionCoefficients_right = stereoCalibrationParams["distortionCoefficients_right"]
+        R = stereoCalibrationParams["rotationMatrix"]
+        T = stereoCalibrationParams["translationVector"]
+
+    if (
+            cameraMatrix_left is None or
+            cameraMatrix_right is None or
+            distortionCoefficients_left is None or
+            distortionCoefficients_right is None or
+            R is None or
+            T is None
+    ):
+        raise MissingParameters
+
+    cameraMatrix_left, cameraMatrix_right = np.asarray(cameraMatrix_left, dtype=np.float64), np.asarray(cameraMatrix_right, dtype=np.float64)
+    distortionCoefficients_left = np.asarray(distortionCoefficients_left, dtype=np.float64)
+    distortionCoefficients_right = np.asarray(distortionCoefficients_right, dtype=np.float64)
+
+    try:
+        R1, R2, P1, P2, _, _, _ = cv.stereoRectify(
+            cameraMatrix_left, distortionCoefficients_left, cameraMatrix_right, distortionCoefficients_right,
+            tuple(int(size) for size in imageSize), np.asarray(R, dtype=np.float64), np.asarray(T, dtype=np.float64)
+        )
+
+    except cv.error as e:
+        raise StereoRectificationError(f"Error in stereo rectification process: {str(e)}")
+
+    points_left, points_right, views = _corresponding_points(imgPoints_left, imgPoints_right, ids_left, ids_right)
+    if len(views) == 0:
+        raise StereoRectificationError("No corresponding corners found in the left and right images")
+
+    # One call per camera for the corners of all views
+    rectified_left = cv.undistortPoints(points_left, cameraMatrix_left, distortionCoefficients_left, R=R1, P=P1).reshape(-1, 2)
+    rectified_right = cv.undistortPoints(points_right, cameraMatrix_right, distortionCoefficients_right, R=R2, P=P2).reshape(-1, 2)
+
+    verticalDisparity = rectified_right[:, 1] - rectified_left[:, 1]
+    absVerticalDisparity = np.abs(verticalDisparity)
+
+    # Median per view - sort by view, then by value, and take the middle of every group
+    numViews = len(imgPoints_left)
+    counts = np.bincount(views, minlength=numViews)
+    order = np.lexsort((absVerticalDisparity, views))
+    sortedValues = absVerticalDisparity[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    perView = np.full(numViews, np.nan)
+    nonEmpty = counts > 0
+    lower = starts[nonEmpty] + (counts[nonEmpty] - 1) // 2
+    upper = starts[nonEmpty] + counts[nonEmpty] // 2
+    perView[nonEmpty] = 0.5 * (sortedValues[lower] + sortedValues[upper])
+
+    p95 = float(np.percentile(absVerticalDisparity, 95))
+    results = {
+        "count": int(len(absVerticalDisparity)),
+        "mean": float(absVerticalDisparity.mean()),
+        "median": float(np.median(absVerticalDisparity)),
+        "rms": float(np.sqrt(np.mean(verticalDisparity ** 2))),
+        "p95": p95,
+        "max": float(absVerticalDisparity.max()),
+        "meanSigned": float(verticalDisparity.mean()),
+        "fractionAbove": float(np.mean(absVerticalDisparity > maxVerticalDisparity)),
+        "perView": perView.tolist(),
+        "valid": p95 <= maxVerticalDisparity,
+    }
+
+    if verbose:
+        color = Fore.GREEN if results["valid"] else Fore.YELLOW
+        print(
+            color + f"\nVertical disparity of {results['count']} corners ({int(nonEmpty.sum())}/{numViews} views):"
+            f"\n\tmedian: {results['median']:.3f} px\n\tp95: {results['p95']:.3f} px\n\tmax: {results['max']:.3f} px"
+            f"\n\tmean signed: {results['meanSigned']:.3f} px"
+            f"\nRectification is {'valid' if results['valid'] else 'NOT valid (p95 > ' + str(maxVerticalDisparity) + ' px), recalibrate the rig'}"
+        )
+
+    return results
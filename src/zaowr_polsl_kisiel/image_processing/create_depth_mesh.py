@@ -0,0 +1,170 @@
+import os
+from typing import Iterator
+
+import cv2
+import numpy as np
+from colorama import Fore, init as colorama_init
+
+from .reprojection_grid import _reprojection_grid
+
+colorama_init(autoreset=True)
+
+
+def _mesh_bands(
+        points: tuple[np.ndarray, np.ndarray, np.ndarray],
+        colors: np.ndarray,
+        valid: np.ndarray,
+        maxDepthJump: float,
+        bandRows: int,
+) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Yield `(verts, colors, faces)` chunks of the mesh, one band of rows at a time.
+
+    Every band emits the valid vertices of its own rows and the triangles of the quads between its rows and the last
+    row of the previous band, so the faces only refer to vertices that were already yielded (the indices are global).
+    """
+    X, Y, Z = points
+    h, w = valid.shape
+
+    # Global index of the first vertex of every row (vertices are emitted in row-major order)
+    rowStart = np.concatenate([[0], np.cumsum(np.count_nonzero(valid, axis=1))])
+
+    for r0 in range(0, h, bandRows):
+        r1 = min(r0 + bandRows, h)
+        bandValid = valid[r0:r1]
+
+        verts = np.stack([X[r0:r1][bandValid], Y[r0:r1][bandValid], Z[r0:r1][bandValid]], axis=1)
+        bandColors = colors[r0:r1][bandValid]
+
+        # Rows used by the quads of this band (including the last row of the previous band)
+        lo = max(r0 - 1, 0)
+        if r1 - lo < 2 or w < 2:
+            yield verts, bandColors, np.empty((0, 3), dtype=np.int32)
+            continue
+
+        quadValid = valid[lo:r1]
+        index = (rowStart[lo] + np.cumsum(quadValid.ravel()) - 1).reshape(quadValid.shape).astype(np.int32)
+        depth = np.abs(Z[lo:r1])
+
+        # Corners of every quad: top-left, top-right, bottom-left, bottom-right
+        tl, tr = (slice(None, -1), slice(None, -1)), (slice(None, -1), slice(1, None))
+        bl, br = (slice(1, None), slice(None, -1)), (slice(1, None), slice(1, None))
+
+        def edge_ok(a, b):
+            """Both vertices are valid and the depth jump between them is small (relative to the nearer one)."""
+            da, db = depth[a], depth[b]
+            return quadValid[a] & quadValid[b] & (np.abs(da - db) <= maxDepthJump * np.minimum(da, db))
+
+        # Shared diagonal (bottom-left -> top-right) and the outer edges of both triangles
+        diagonal = edge_ok(bl, tr)
+        upper = diagonal & edge_ok(tl, bl) & edge_ok(tl, tr)
+        lower = diagonal & edge_ok(bl, br) & edge_ok(tr, br)
+
+        # Counter-clockwise when seen from the camera (the camera looks along -Z, y-axis up)
+        faces = np.concatenate([
+            np.stack([index[tl][upper], index[bl][upper], index[tr][upper]], axis=1),
+            np.stack([index[tr][lower], index[bl][lower], index[br][lower]], axis=1),
+        ])
+
+        yield verts, bandColors, faces
+
+
+def create_depth_mesh(
+        colorImgPath: str,
+        disparityMapPath: str,
+        depthMapPath: str = None,
+        focalLengthFactor: float = 0.8,
+        maxDepth: float = 50.0,
+        maxDepthJump: float = 0.1,
+        step: int = 1,
+        bandRows: int = 128,
+) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Create a colored triangle mesh from a color image and a disparity map (optionally limited by a depth map). The mesh
+    uses the same reprojection as `create_color_point_cloud` - every valid pixel becomes a vertex and every quad of
+    neighbouring pixels is split into two triangles.
+
+    Triangles spanning a depth discontinuity (e.g. between an object and the background) are dropped - a triangle is kept
+    only if, for each of its edges, the depth difference is at most `maxDepthJump` times the depth of the nearer vertex.
+    The test is vectorized over the whole band of rows.
+
+    The mesh is returned as a generator of `(verts, colors, faces)` chunks (one band of `bandRows` rows at a time, face
+    indices are global), which can be passed directly to `write_ply_file`, so the whole mesh never has to be kept in memory.
+
+    :param str colorImgPath: The path to the color image.
+    :param str disparityMapPath: The path to the disparity map.
+    :param str depthMapPath: The path to the depth map. If None, the reprojected depth is limited instead. Default is None.
+    :param float focalLengthFactor: The focal length factor. Default is 0.8.
+    :param float maxDepth: The maximum depth. Default is 50.0.
+    :param float maxDepthJump: Maximal relative depth difference along a triangle edge. Default is 0.1.
+    :param int step: Use every `step`-th pixel in both directions (coarser mesh). Default is 1.
+    :param int bandRows: Number of pixel rows processed (and yielded) at a time. Default is 128.
+
+    :raises ValueError: Raises ValueError if:
+        - **`colorImgPath`** or **`disparityMapPath`** is None,
+        - **`focalLengthFactor`**, **`maxDepth`** or **`maxDepthJump`** is not positive,
+        - **`step`** or **`bandRows`** is not a positive integer.
+
+    :raises FileNotFoundError: Raises FileNotFoundError if **`colorImgPath`**, **`disparityMapPath`** or **`depthMapPath`** does not exist.
+
+    :raises TypeError: Raises TypeError if:
+        - **`colorImgPath`**, **`disparityMapPath`** or **`depthMapPath`** is not a string,
+        - **`focalLengthFactor`**, **`maxDepth`** or **`maxDepthJump`** is not a float.
+
+    :raises IOError: Raises IOError if the color image, disparity map or depth map could not be loaded.
+
+    :return: Generator of `(verts, colors, faces)` chunks.
+    """
+    if colorImgPath is None or disparityMapPath is None:
+        raise ValueError(Fore.RED + "\nColor image and disparity map paths must be specified!\n")
+
+    paths = [path for path in (colorImgPath, disparityMapPath, depthMapPath) if path is not None]
+
+    if not all(isinstance(path, str) for path in paths):
+        raise TypeError(Fore.RED + "\nColor image, disparity map and depth map paths must be strings!\n")
+
+    if not all(os.path.isfile(path) for path in paths):
+        raise FileNotFoundError(Fore.RED + "\nColor image, disparity map and depth map paths must exist!\n")
+
+    if not isinstance(focalLengthFactor, float) or not isinstance(maxDepth, float) or not isinstance(maxDepthJump, float):
+        raise TypeError(Fore.RED + "\nFocal length factor, max depth and max depth jump must be floats!\n")
+
+    if focalLengthFactor <= 0 or maxDepth <= 0 or maxDepthJump <= 0:
+        raise ValueError(Fore.RED + "\nFocal length factor, max depth and max depth jump must be positive!\n")
+
+    if not isinstance(step, int) or step <= 0 or not isinstance(bandRows, int) or bandRows <= 0:
+        raise ValueError(Fore.RED + "\n`step` and `bandRows` must be positive integers!\n")
+
+    img = cv2.imread(colorImgPath, cv2.IMREAD_COLOR)
+    disparityMap = cv2.imread(disparityMapPath, cv2.IMREAD_GRAYSCALE)
+    depthMap = cv2.imread(depthMapPath, cv2.IMREAD_GRAYSCALE) if depthMapPath is not None else None
+
+    if img is None or disparityMap is None or (depthMapPath is not None and depthMap is None):
+        raise IOError(Fore.RED + "\nColor image, disparity map and depth map could not be loaded!\n")
+
+    h, w = disparityMap.shape[:2]
+    if img.shape[:2] != (h, w):
+        img = cv2.resize(img, (w, h), interpolation=cv2.INTER_AREA)
+
+    uGrid, vGrid, f = _reprojection_grid(h, w, focalLengthFactor)
+
+    grid = (slice(None, None, step), slice(None, None, step))
+    disparity = disparityMap[grid].astype(np.float32)
+    valid = disparity > 0
+
+    # Avoid division by zero (invalid pixels are never emitted)
+    disparity[~valid] = 1.0
+    X = uGrid[grid] / disparity
+    Y = vGrid[grid] / disparity
+    Z = -f / disparity
+
+    if depthMap is not None:
+        if depthMap.shape[:2] != (h, w):
+            depthMap = cv2.resize(depthMap, (w, h), interpolation=cv2.INTER_AREA)
+        valid &= depthMap[grid] < maxDepth
+    else:
+        valid &= np.abs(Z) < maxDepth
+
+    colors = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)[grid]
+
+    return _mesh_bands((X, Y, Z), colors, valid, maxDepthJump, bandRows)
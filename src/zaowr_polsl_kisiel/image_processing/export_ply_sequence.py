@@ -0,0 +1,200 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from sys import stdout
+from threading import BoundedSemaphore
+from typing import Iterator
+
+import cv2 as cv
+import numpy as np
+from colorama import Fore, Style, init as colorama_init
+from tqdm import tqdm  # progress bar
+
+from ..content_loaders import write_ply_file
+from ..optical_flow import read_images_from_folder
+from .reprojection_grid import _reprojection_grid
+
+colorama_init(autoreset=True)
+
+
+def _read_frames(
+        source: str,
+        imreadFlags: int
+) -> Iterator[tuple[str, np.ndarray]]:
+    """
+    Yield `(name, frame)` pairs from a folder with images (sorted alphabetically, name = file name without extension)
+    or from a video file (name = frame number). Only one frame is kept in memory at a time.
+    """
+    if os.path.isdir(source):
+        for imagePath in read_images_from_folder(source):
+            frame = cv.imread(imagePath, imreadFlags)
+            if frame is None:
+                raise IOError(Fore.RED + f"\nUnable to read image: {imagePath}\n")
+
+            yield os.path.splitext(os.path.basename(imagePath))[0], frame
+
+    elif os.path.isfile(source):
+        cap = cv.VideoCapture(source)
+        if not cap.isOpened():
+            raise IOError(Fore.RED + f"\nUnable to read source: {source}\n")
+
+        try:
+            frameNumber = 0
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+
+                if imreadFlags == cv.IMREAD_GRAYSCALE and frame.ndim == 3:
+                    frame = cv.cvtColor(frame, cv.COLOR_BGR2GRAY)
+
+                yield f"{frameNumber:06d}", frame
+                frameNumber += 1
+
+        finally:
+            cap.release()
+
+    else:
+        raise ValueError(Fore.RED + f"\nInvalid source! Provide a video file path or folder with images ('{source}' provided)\n")
+
+
+def export_ply_sequence(
+        disparitySource: str,
+        outputDirPath: str,
+        colorSource: str = None,
+        depthSource: str = None,
+        focalLengthFactor: float = 0.8,
+        maxDepth: float = 50.0,
+        plyFormat: str = "binary_little_endian",
+        workers: int = 2,
+        maxPendingFrames: int = 4,
+) -> list[str]:
+    """
+    Convert a sequence of disparity frames (folder with images or a video file) to a sequence of colored point clouds and
+    save each of them as a PLY file. This is the streaming equivalent of calling `create_color_point_cloud` and
+    `write_ply_file` in a loop:
+
+    - the frames are decoded one by one (folders are sorted alphabetically, video frames are read sequentially),
+    - the reprojection grids are computed once and reused for all frames of the same size,
+    - the PLY files are written (binary by default) by a pool of background writer threads, while the next frames are being converted,
+    - at most `maxPendingFrames` point clouds wait for the writers at a time, so the memory usage stays bounded.
+
+    The points are filtered like in `create_color_point_cloud` - by `depthMap < maxDepth` if `depthSource` is provided,
+    otherwise by the reprojected depth (`|Z| < maxDepth`). Pixels with disparity <= 0 are always discarded. The points are
+    always reprojected from the disparity - depth frames alone are not enough (convert them with
+    `depth_to_disparity_map` first), `depthSource` is only used as a filter.
+
+    :param str disparitySource: Folder with disparity maps or a video file with disparity frames.
+    :param str outputDirPath: Directory where the PLY files will be saved (created if it does not exist). Files are named after the source images (or `<frame number>.ply` for videos).
+    :param str colorSource: Folder or video with the color frames (same order as the disparity frames). If None, the disparity value is used as a gray color. Default is None.
+    :param str depthSource: Folder or video with the depth maps (same order as the disparity frames) used only to limit the depth. Default is None.
+    :param float focalLengthFactor: The focal length factor. Default is 0.8.
+    :param float maxDepth: The maximum depth. Default is 50.0.
+    :param str plyFormat: Format of the PLY files (**"ascii"** or **"binary_little_endian"**). Default is "binary_little_endian".
+    :param int workers: Number of background writer threads. Default is 2.
+    :param int maxPendingFrames: Maximum number of point clouds waiting to be written. Default is 4.
+
+    :raises ValueError: Raises ValueError if:
+        - **`disparitySource`**, **`colorSource`** or **`depthSource`** is not a folder or a video file,
+        - **`outputDirPath`** is not a non-empty string,
+        - **`focalLengthFactor`** or **`maxDepth`** is not positive,
+        - **`workers`** or **`maxPendingFrames`** is not a positive integer,
+        - the color or depth source has fewer frames than the disparity source.
+
+    :raises IOError: Raises IOError if a frame could not be loaded.
+
+    :return: List of paths of the saved PLY files (in the order of the frames).
+    """
+    if outputDirPath is None or not isinstance(outputDirPath, str) or len(outputDirPath) == 0:
+        raise ValueError(Fore.RED + "\n`outputDirPath` must be a non-empty string!\n")
+
+    if focalLengthFactor <= 0 or maxDepth <= 0:
+        raise ValueError(Fore.RED + "\nFocal length factor and max depth must be positive!\n")
+
+    if not isinstance(workers, int) or workers <= 0 or not isinstance(maxPendingFrames, int) or maxPendingFrames <= 0:
+        raise ValueError(Fore.RED + "\n`workers` and `maxPendingFrames` must be positive integers!\n")
+
+    if not os.path.exists(outputDirPath):
+        os.makedirs(outputDirPath)
+
+    disparityFrames = _read_frames(disparitySource, cv.IMREAD_GRAYSCALE)
+    colorFrames = _read_frames(colorSource, cv.IMREAD_COLOR) if colorSource is not None else None
+    depthFrames = _read_frames(depthSource, cv.IMREAD_GRAYSCALE) if depthSource is not None else None
+
+    pending = BoundedSemaphore(maxPendingFrames)
+    futures = []
+    savedPaths = []
+
+    print(Fore.GREEN + f"\nExporting point clouds from '{disparitySource}' to '{outputDirPath}'...")
+
+    with ThreadPoolExecutor(max_workers=workers) as writers:
+        for name, disparityMap in tqdm(
+                disparityFrames,
+                desc=Style.RESET_ALL + "Exporting frames...",
+                dynamic_ncols=True,
+                bar_format="{l_bar}{bar}{r_bar}",
+                colour="green",
+                file=stdout,
+                position=0
+        ):
+            h, w = disparityMap.shape[:2]
+            uGrid, vGrid, f = _reprojection_grid(h, w, float(focalLengthFactor))
+
+            mask = disparityMap > 0
+
+            if depthFrames is not None:
+                depthMap = next(depthFrames, (None, None))[1]
+                if depthMap is None:
+                    raise ValueError(Fore.RED + "\nDepth source has fewer frames than the disparity source!\n")
+
+                if depthMap.shape[:2] != (h, w):
+                    depthMap = cv.resize(depthMap, (w, h), interpolation=cv.INTER_AREA)
+
+                mask &= depthMap < maxDepth
+
+            disparity = disparityMap[mask].astype(np.float32)
+
+            z = -f / disparity
+            if depthFrames is None:
+                keep = np.abs(z) < maxDepth
+                mask[mask] = keep
+                disparity = disparity[keep]
+                z = z[keep]
+
+            points = np.empty((len(disparity), 3), dtype=np.float32)
+            points[:, 0] = uGrid[mask] / disparity
+            points[:, 1] = vGrid[mask] / disparity
+            points[:, 2] = z
+
+            if colorFrames is not None:
+                img = next(colorFrames, (None, None))[1]
+                if img is None:
+                    raise ValueError(Fore.RED + "\nColor source has fewer frames than the disparity source!\n")
+
+                if img.shape[:2] != (h, w):
+                    img = cv.resize(img, (w, h), interpolation=cv.INTER_AREA)
+
+                colors = img[mask][:, ::-1]  # BGR -> RGB
+
+            else:
+                colors = np.repeat(disparityMap[mask][:, None], 3, axis=1)
+
+            plyPath = os.path.join(outputDirPath, f"{name}.ply")
+            savedPaths.append(plyPath)
+
+            # Wait until one of the writers finishes if too many point clouds are waiting
+            pending.acquire()
+            future = writers.submit(write_ply_file, plyPath, points, colors, plyFormat)
+            future.add_done_callback(lambda _: pending.release())
+            futures.append(future)
+
+            # Surface writer errors early (done futures only, does not block)
+            for done in [fut for fut in futures if fut.done()]:
+                done.result()
+                futures.remove(done)
+
+    for future in futures:
+        future.result()
+
+    print(Fore.GREEN + f"\nExported {len(savedPaths)} point clouds to '{outputDirPath}'")
+
+    return savedPaths
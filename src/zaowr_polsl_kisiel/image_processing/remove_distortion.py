@@ -1,11 +1,108 @@
 import os
+from functools import lru_cache
 
 import cv2 as cv
+import numpy as np
 from numpy import ndarray as npNdArray
 
 from ..custom_exceptions.exceptions import ImgToUndistortPathNotProvided, UndistortedImgPathNotProvided
 
 
+@lru_cache(maxsize=8)
+def _cached_new_camera_matrix(
+    cameraMatrixBytes: bytes,
+    distortionCoefficientsBytes: bytes,
+    size: tuple[int, int],
+    alpha: float,
+) -> tuple[npNdArray, tuple[int, int, int, int]]:
+    """
+    Compute (once per key) the optimal new camera matrix and its ROI.
+    """
+    cameraMatrix = np.frombuffer(cameraMatrixBytes, dtype=np.float64).reshape(3, 3)
+    distortionCoefficients = np.frombuffer(distortionCoefficientsBytes, dtype=np.float64)
+
+    newOptimalCameraMatrix, roi = cv.getOptimalNewCameraMatrix(
+        cameraMatrix, distortionCoefficients, size, alpha, size
+    )
+
+    # The cached array is shared between calls
+    newOptimalCameraMatrix.flags.writeable = False
+
+    return newOptimalCameraMatrix, tuple(roi)
+
+
+@lru_cache(maxsize=8)
+def _cached_undistort_maps(
+    cameraMatrixBytes: bytes,
+    distortionCoefficientsBytes: bytes,
+    size: tuple[int, int],
+    alpha: float,
+) -> tuple[npNdArray, tuple[int, int, int, int], npNdArray, npNdArray]:
+    """
+    Compute (once per key) the compact fixed-point remap maps (CV_16SC2 + CV_16UC1 interpolation table - about half
+    the memory of two float32 maps and faster to remap with) for the cached optimal new camera matrix.
+    """
+    cameraMatrix = np.frombuffer(cameraMatrixBytes, dtype=np.float64).reshape(3, 3)
+    distortionCoefficients = np.frombuffer(distortionCoefficientsBytes, dtype=np.float64)
+
+    newOptimalCameraMatrix, roi = _cached_new_camera_matrix(cameraMatrixBytes, distortionCoefficientsBytes, size, alpha)
+
+    map1, map2 = cv.initUndistortRectifyMap(
+        cameraMatrix,
+        distortionCoefficients,
+        None,
+        newOptimalCameraMatrix,
+        size,
+        cv.CV_16SC2,
+    )
+
+    # The cached arrays are shared between calls
+    for array in (map1, map2):
+        array.flags.writeable = False
+
+    return newOptimalCameraMatrix, roi, map1, map2
+
+
+def _undistort_cache_key(
+    cameraMatrix: npNdArray,
+    distortionCoefficients: npNdArray,
+    size: tuple[int, int],
+    alpha: float,
+) -> tuple[bytes, bytes, tuple[int, int], float]:
+    return (
+        np.ascontiguousarray(cameraMatrix, dtype=np.float64).tobytes(),
+        np.ascontiguousarray(distortionCoefficients, dtype=np.float64).ravel().tobytes(),
+        (int(size[0]), int(size[1])),
+        float(alpha),
+    )
+
+
+def _get_new_camera_matrix(
+    cameraMatrix: npNdArray,
+    distortionCoefficients: npNdArray,
+    size: tuple[int, int],
+    alpha: float,
+) -> tuple[npNdArray, tuple[int, int, int, int]]:
+    """
+    Get the new camera matrix and ROI from the cache keyed by (cameraMatrix, distortionCoefficients, size, alpha),
+    without building the remap maps (not needed by `cv.undistort`).
+    """
+    return _cached_new_camera_matrix(*_undistort_cache_key(cameraMatrix, distortionCoefficients, size, alpha))
+
+
+def _get_undistort_maps(
+    cameraMatrix: npNdArray,
+    distortionCoefficients: npNdArray,
+    size: tuple[int, int],
+    alpha: float,
+) -> tuple[npNdArray, tuple[int, int, int, int], npNdArray, npNdArray]:
+    """
+    Get the new camera matrix, ROI and remap maps from the cache keyed by (cameraMatrix, distortionCoefficients, size, alpha).
+    Repeated undistortion of images from the same camera then costs only `cv.remap`.
+    """
+    return _cached_undistort_maps(*_undistort_cache_key(cameraMatrix, distortionCoefficients, size, alpha))
+
+
 def remove_distortion(
     cameraMatrix: npNdArray,
     distortionCoefficients: npNdArray,
@@ -15,10 +112,16 @@ def remove_distortion(
     saveUndistortedImg: bool = False,
     undistortedImgPath: str = "",
     undistortionMethod: str = "undistort",
+    alpha: float = 0.3,
 ) -> None:
     """
     Remove distortion from given image
 
+    The new camera matrix and the remap maps (compact CV_16SC2 fixed-point maps) are cached per
+    (cameraMatrix, distortionCoefficients, image size, alpha), so undistorting many images from the same camera
+    with the `remapping` method only costs a `cv.remap` call per image. The maps are built only for the `remapping`
+    method - the `undistort` method caches only the new camera matrix.
+
     :param npNdArray cameraMatrix: Camera Matrix, the focal length and optical centre matrix as shown in intrinsic parameters.
     :param npNdArray distortionCoefficients: Distortion Coefficients: (`k₁`, `k₂`, `p₁`, `p₂`, `k₃`), which include radial (`kₙ`) and tangential (`pₙ`) distortion values.
     :param str imgToUndistortPath: Path of the image which we want to undistort.
@@ -27,6 +130,7 @@ def remove_distortion(
     :param bool saveUndistortedImg: Decide if you want to save the undistorted image., defaults to False
     :param str undistortedImgPath: Path where we want to save the undistorted image., defaults to ""
     :param str undistortionMethod: Choose the method used for removing distortion (`undistort` or `remapping`)., defaults to "undistort"
+    :param float alpha: Free scaling parameter of `cv.getOptimalNewCameraMatrix` (0 - only valid pixels, 1 - all source pixels are kept)., defaults to 0.3
 
     :return: None
 
@@ -42,6 +146,9 @@ def remove_distortion(
     ):
         raise UndistortedImgPathNotProvided
 
+    if undistortionMethod not in ("undistort", "remapping"):
+        raise ValueError(f"Invalid undistortion method: {undistortionMethod}. Use 'undistort' or 'remapping'.")
+
     # "../../../../ZAOWiR Image set - Calibration/Chessboard/Mono 1/cam4/58.png"
     img = cv.imread(imgToUndistortPath)
     if img is None:
@@ -53,11 +160,10 @@ def remove_distortion(
         cv.waitKey()
 
     h, w = img.shape[:2]
-    newOptimalCameraMatrix, roi = cv.getOptimalNewCameraMatrix(
-        cameraMatrix, distortionCoefficients, (w, h), 0.3, (w, h)
-    )
 
     if undistortionMethod == "undistort":
+        newOptimalCameraMatrix, roi = _get_new_camera_matrix(cameraMatrix, distortionCoefficients, (w, h), alpha)
+
         dst = cv.undistort(
             img, cameraMatrix, distortionCoefficients, None, newOptimalCameraMatrix
         )
@@ -71,16 +177,10 @@ def remove_distortion(
             print("\nPress any key to continue...")
             cv.waitKey()
 
-    elif undistortionMethod == "remapping":
-        mapx, mapy = cv.initUndistortRectifyMap(
-            cameraMatrix,
-            distortionCoefficients,
-            None,
-            newOptimalCameraMatrix,
-            (w, h),
-            5,
-        )
-        dst = cv.remap(img, mapx, mapy, cv.INTER_LINEAR)
+    else:
+        _, roi, map1, map2 = _get_undistort_maps(cameraMatrix, distortionCoefficients, (w, h), alpha)
+
+        dst = cv.remap(img, map1, map2, cv.INTER_LINEAR)
 
         # crop the image
         x, y, w, h = roi
@@ -91,9 +191,6 @@ def remove_distortion(
             print("\nPress any key to continue...")
             cv.waitKey()
 
-    else:
-        raise ValueError(f"Invalid undistortion method: {undistortionMethod}. Use 'undistort' or 'remapping'.")
-
     if saveUndistortedImg:
         if not os.path.exists(undistortedImgPath):
             os.makedirs(undistortedImgPath, exist_ok=True)
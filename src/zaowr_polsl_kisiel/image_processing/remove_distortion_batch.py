@@ -0,0 +1,118 @@
+import glob
+import os
+from concurrent.futures import ThreadPoolExecutor
+from sys import stdout
+
+import cv2 as cv
+from colorama import Fore, Style, init as colorama_init
+from numpy import ndarray as npNdArray
+from tqdm import tqdm  # progress bar
+
+from .remove_distortion import _get_undistort_maps
+from ..custom_exceptions.exceptions import ImgToUndistortPathNotProvided, UndistortedImgPathNotProvided
+
+colorama_init(autoreset=True)
+
+
+def remove_distortion_batch(
+    cameraMatrix: npNdArray,
+    distortionCoefficients: npNdArray,
+    imgToUndistortDirPath: str,
+    undistortedImgPath: str,
+    globImgExtension: str = "png",
+    alpha: float = 0.3,
+    cropToRoi: bool = False,
+    workers: int = 4,
+) -> list[str]:
+    """
+    Remove distortion from all images in a directory (e.g. a whole capture session) and save them to another directory
+    under the same file names.
+
+    The remap maps are computed once (and cached, see `remove_distortion`) and shared by all images. The images are
+    processed by a pool of threads - every thread reads, remaps and writes one image at a time. Decoding, `cv.remap`
+    and encoding release the GIL, so the threads run in parallel. The results are returned in the (alphabetical) order
+    of the input images.
+
+    :param npNdArray cameraMatrix: Camera Matrix, the focal length and optical centre matrix as shown in intrinsic parameters.
+    :param npNdArray distortionCoefficients: Distortion Coefficients: (`k₁`, `k₂`, `p₁`, `p₂`, `k₃`), which include radial (`kₙ`) and tangential (`pₙ`) distortion values.
+    :param str imgToUndistortDirPath: Path of the directory with the images which we want to undistort.
+    :param str undistortedImgPath: Path of the directory where the undistorted images will be saved (created if it does not exist). Must be different from the input directory.
+    :param str globImgExtension: Extension of the images (e.g. "jpg", "png")., defaults to "png"
+    :param float alpha: Free scaling parameter of `cv.getOptimalNewCameraMatrix` (0 - only valid pixels, 1 - all source pixels are kept)., defaults to 0.3
+    :param bool cropToRoi: Save only the valid region (ROI) of the undistorted images., defaults to False
+    :param int workers: Number of threads., defaults to 4
+
+    :return: List of paths of the saved images (in the order of the input images).
+
+    :raises ImgToUndistortPathNotProvided: Raises an error if the input directory was not provided, it isn't an instance of a string or it does not exist.
+    :raises UndistortedImgPathNotProvided: Raises an error if the output directory was not provided or it isn't an instance of a string.
+    :raises ValueError: Raises ValueError if the output directory is the same as the input directory, no images were found or `workers` is not a positive integer.
+    :raises IOError: Raises IOError if an image could not be read or written.
+    """
+    if (not isinstance(imgToUndistortDirPath, str)) or (imgToUndistortDirPath == "") or not os.path.isdir(imgToUndistortDirPath):
+        raise ImgToUndistortPathNotProvided
+
+    if (not isinstance(undistortedImgPath, str)) or (undistortedImgPath == ""):
+        raise UndistortedImgPathNotProvided
+
+    if os.path.abspath(imgToUndistortDirPath) == os.path.abspath(undistortedImgPath):
+        raise ValueError(Fore.RED + "\nOutput directory must be different from the input directory (the file names are preserved)!\n")
+
+    if not isinstance(workers, int) or workers <= 0:
+        raise ValueError(Fore.RED + "\n`workers` must be a positive integer!\n")
+
+    images = sorted(glob.glob(os.path.join(imgToUndistortDirPath, "*." + globImgExtension)), key=os.path.basename)
+    if len(images) == 0:
+        raise ValueError(Fore.RED + f"\nNo '*.{globImgExtension}' images found in '{imgToUndistortDirPath}'!\n")
+
+    os.makedirs(undistortedImgPath, exist_ok=True)
+
+    # The size of the first image determines the maps (all images of a session come from the same camera)
+    firstImg = cv.imread(images[0])
+    if firstImg is None:
+        raise IOError(Fore.RED + f"\nFailed to load image from path: {images[0]}\n")
+
+    h, w = firstImg.shape[:2]
+    _, roi, map1, map2 = _get_undistort_maps(cameraMatrix, distortionCoefficients, (w, h), alpha)
+    x, y, roiW, roiH = roi
+
+    def undistort(imgPath: str) -> str:
+        img = cv.imread(imgPath, cv.IMREAD_UNCHANGED)
+        if img is None:
+            raise IOError(Fore.RED + f"\nFailed to load image from path: {imgPath}\n")
+
+        if img.shape[:2] != (h, w):
+            _, imgRoi, imgMap1, imgMap2 = _get_undistort_maps(cameraMatrix, distortionCoefficients, img.shape[1::-1], alpha)
+        else:
+            imgRoi, imgMap1, imgMap2 = roi, map1, map2
+
+        dst = cv.remap(img, imgMap1, imgMap2, cv.INTER_LINEAR)
+
+        if cropToRoi:
+            rx, ry, rw, rh = imgRoi
+            dst = dst[ry : ry + rh, rx : rx + rw]
+
+        outputPath = os.path.join(undistortedImgPath, os.path.basename(imgPath))
+        if not cv.imwrite(outputPath, dst):
+            raise IOError(Fore.RED + f"\nFailed to save image to path: {outputPath}\n")
+
+        return outputPath
+
+    print(Fore.GREEN + f"\nUndistorting {len(images)} images from '{imgToUndistortDirPath}' (ROI: x={x}, y={y}, w={roiW}, h={roiH})...")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # `map` yields the results in the order of the input images
+        savedPaths = list(tqdm(
+            executor.map(undistort, images),
+            total=len(images),
+            desc=Style.RESET_ALL + "Undistorting images...",
+            dynamic_ncols=True,
+            bar_format="{l_bar}{bar}{r_bar}",
+            colour="green",
+            file=stdout,
+            position=0
+        ))
+
+    print(Fore.GREEN + f"\nUndistorted images saved to '{undistortedImgPath}'")
+
+    return savedPaths
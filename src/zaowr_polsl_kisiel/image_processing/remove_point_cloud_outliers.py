@@ -0,0 +1,100 @@
+import numpy as np
+from colorama import Fore, init as colorama_init
+
+from .voxel_downsample import _voxel_keys
+
+colorama_init(autoreset=True)
+
+
+def remove_point_cloud_outliers(
+        verts: np.ndarray,
+        colors: np.ndarray,
+        cellSize: float,
+        stdRatio: float | None = 2.0,
+        minNeighbors: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Remove outliers (isolated points, noise from disparity errors) from a point cloud using a uniform grid.
+
+    For every point, the number of neighbours is approximated by the number of points in its own grid cell and the 26
+    surrounding cells (cell edge = `cellSize`). The cell occupancy is computed once with `np.unique` and looked up with
+    `np.searchsorted`, so the filter is fully vectorized and runs in O(N log N) - no pairwise distances are computed.
+
+    - **statistical filter** (`stdRatio`) - removes points whose neighbour count is lower than `mean - stdRatio * std` of all neighbour counts,
+    - **radius filter** (`minNeighbors`) - removes points with fewer than `minNeighbors` other points in the neighbourhood.
+
+    Points with non-finite coordinates are always discarded.
+
+    :param np.ndarray verts: Vertices of the point cloud (N, 3).
+    :param np.ndarray colors: Colors of the vertices (N, 3).
+    :param float cellSize: Edge length of a grid cell - the neighbourhood radius (in the same units as the vertices).
+    :param float | None stdRatio: Number of standard deviations below the mean neighbour count at which points are removed. None disables the statistical filter. Default is 2.0.
+    :param int | None minNeighbors: Minimal number of neighbours a point must have to be kept. None disables the radius filter. Default is None.
+
+    :raises TypeError: Raises TypeError if:
+        - **`verts`** or **`colors`** is not a numpy array,
+        - **`cellSize`** is not a float.
+
+    :raises ValueError: Raises ValueError if:
+        - **`cellSize`** is not positive,
+        - **`stdRatio`** is negative or **`minNeighbors`** is not a non-negative integer,
+        - number of vertices and colors differs.
+
+    :raises RuntimeError: Raises RuntimeError if the point cloud does not contain any finite points.
+
+    :return: A tuple containing the filtered vertices and colors.
+    """
+    if not isinstance(verts, np.ndarray) or not isinstance(colors, np.ndarray):
+        raise TypeError(Fore.RED + "\nVertices and colors must be numpy arrays!\n")
+
+    if not isinstance(cellSize, float):
+        raise TypeError(Fore.RED + "\nCell size must be a float!\n")
+
+    if cellSize <= 0:
+        raise ValueError(Fore.RED + "\nCell size must be positive!\n")
+
+    if stdRatio is not None and stdRatio < 0:
+        raise ValueError(Fore.RED + "\n`stdRatio` must be non-negative!\n")
+
+    if minNeighbors is not None and (not isinstance(minNeighbors, int) or minNeighbors < 0):
+        raise ValueError(Fore.RED + "\n`minNeighbors` must be a non-negative integer!\n")
+
+    verts = verts.reshape(-1, 3)
+    colors = colors.reshape(-1, 3)
+
+    if len(verts) != len(colors):
+        raise ValueError(Fore.RED + f"\nNumber of vertices ({len(verts)}) and colors ({len(colors)}) must be equal!\n")
+
+    finite = np.isfinite(verts).all(axis=1)
+    verts = verts[finite]
+    colors = colors[finite]
+
+    if len(verts) == 0:
+        raise RuntimeError(Fore.RED + "\nNo points found!\n")
+
+    # padding=1 so that the neighbouring cells of the boundary cells still have unique keys
+    keys, _, dims = _voxel_keys(verts, cellSize, padding=1)
+    cellKeys, inverse, cellCounts = np.unique(keys, return_inverse=True, return_counts=True)
+
+    # Count the points in the 3x3x3 neighbourhood of every occupied cell (not every point - there are far fewer cells)
+    neighbourCounts = np.zeros(len(cellKeys), dtype=np.int64)
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            for dz in (-1, 0, 1):
+                neighbourKeys = cellKeys + (dx * dims[1] + dy) * dims[2] + dz
+                idx = np.searchsorted(cellKeys, neighbourKeys)
+                idx[idx == len(cellKeys)] = 0
+                found = cellKeys[idx] == neighbourKeys
+                neighbourCounts[found] += cellCounts[idx[found]]
+
+    # Exclude the point itself
+    pointNeighbours = neighbourCounts[inverse] - 1
+
+    keep = np.ones(len(verts), dtype=bool)
+    if stdRatio is not None:
+        keep &= pointNeighbours >= pointNeighbours.mean() - stdRatio * pointNeighbours.std()
+
+    if minNeighbors is not None:
+        keep &= pointNeighbours >= minNeighbors
+
+    return verts[keep], colors[keep]
@@ -0,0 +1,26 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=8)
+def _reprojection_grid(
+        height: int,
+        width: int,
+        focalLengthFactor: float
+) -> tuple[np.ndarray, np.ndarray, float]:
+    """
+    Cached pixel grids used to reproject the disparity map to 3D. With the `Q` matrix used by `create_color_point_cloud`,
+    `cv2.reprojectImageTo3D` reduces to `X = (u - w/2) / d`, `Y = (h/2 - v) / d`, `Z = -f / d`, so the grids only depend
+    on the frame size and are computed once for all frames of the same size (shared by `export_ply_sequence` and
+    `create_depth_mesh`).
+
+    :return: Grid of `u - w/2`, grid of `h/2 - v` (both float32, read-only) and the focal length.
+    """
+    v, u = np.indices((height, width), dtype=np.float32)
+    uGrid = u - np.float32(0.5 * width)
+    vGrid = np.float32(0.5 * height) - v
+    uGrid.flags.writeable = False
+    vGrid.flags.writeable = False
+
+    return uGrid, vGrid, focalLengthFactor * width
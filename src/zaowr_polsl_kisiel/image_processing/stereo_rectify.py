@@ -2,12 +2,14 @@ import glob
 import os
 from sys import stdout
 from time import perf_counter
+from typing import Any
 
 import cv2 as cv
 import numpy as np
 from colorama import Fore, Style, init as colorama_init  # , Back
 from tqdm import tqdm  # progress bar
 
+from ..content_loaders.save_rectification_maps import rectification_maps_key
 from ..custom_exceptions.exceptions import CalibrationImagesNotFound, CalibrationParamsPathNotProvided, RectifiedImgPathNotProvided, \
     StereoCalibrationParamsPathNotProvided, MissingParameters, RectificationMapsPathNotProvided, StereoRectificationError
 
@@ -78,6 +80,217 @@ def draw_epilines_aligned(
     return img_left_with_lines, img_right_with_lines
 
 
+def _benchmark_interpolation(
+        img_left: np.ndarray,
+        img_right: np.ndarray,
+        rectificationMaps: dict[str, np.ndarray],
+        interpolationTypes: dict[str, int],
+        repeats: int = 20,
+        warmup: int = 3,
+        reference: str = "INTER_LANCZOS4",
+) -> dict[str, Any]:
+    """
+    Benchmark `cv.remap` of a stereo pair with different interpolation methods.
+
+    Every method is run `warmup` times (first calls allocate the output and initialise the thread pool) and then timed
+    `repeats` times (one run = left and right image). Only the remaps are timed. The quality is compared with the result
+    of the `reference` method (mean absolute difference and PSNR of both images).
+
+    :return: Dictionary with the benchmark settings and, for every method, the median, p95, mean and min time of a run (ms), throughput (megapixels per second, based on the median) and the difference from the reference.
+    """
+    def remap_pair(interpolationType: int) -> tuple[np.ndarray, np.ndarray]:
+        return (
+            cv.remap(img_left, rectificationMaps["map1_left"], rectificationMaps["map2_left"], interpolationType),
+            cv.remap(img_right, rectificationMaps["map1_right"], rectificationMaps["map2_right"], interpolationType),
+        )
+
+    referencePair = np.hstack(remap_pair(interpolationTypes[reference]))
+    megapixels = 2 * referencePair.shape[0] * (referencePair.shape[1] // 2) / 1e6
+
+    results = {
+        "imageSize": [int(referencePair.shape[1] // 2), int(referencePair.shape[0])],
+        "channels": 1 if referencePair.ndim == 2 else int(referencePair.shape[2]),
+        "repeats": repeats,
+        "warmup": warmup,
+        "threads": cv.getNumThreads(),
+        "opencvVersion": cv.__version__,
+        "reference": reference,
+        "methods": {},
+    }
+
+    for name, interpolationType in interpolationTypes.items():
+        for _ in range(warmup):
+            remap_pair(interpolationType)
+
+        times = np.empty(repeats)
+        for i in range(repeats):
+            tic = perf_counter()
+            rectifiedPair = remap_pair(interpolationType)
+            times[i] = perf_counter() - tic
+
+        rectifiedPair = np.hstack(rectifiedPair)
+        difference = np.abs(rectifiedPair.astype(np.float32) - referencePair.astype(np.float32))
+        medianTime = float(np.median(times))
+
+        results["methods"][name] = {
+            "median_ms": medianTime * 1e3,
+            "p95_ms": float(np.percentile(times, 95)) * 1e3,
+            "mean_ms": float(times.mean()) * 1e3,
+            "min_ms": float(times.min()) * 1e3,
+            "throughput_MPps": megapixels / medianTime if medianTime > 0 else None,
+            "meanAbsDiff": float(difference.mean()),
+            # PSNR of identical images is infinite (not valid in JSON)
+            "psnr_dB": float(cv.PSNR(rectifiedPair, referencePair)) if difference.any() else None,
+        }
+
+    return results
+
+
+def _fuse_crop_and_scale(
+        P1: np.ndarray,
+        P2: np.ndarray,
+        roi1: tuple,
+        roi2: tuple,
+        imageSize: tuple[int, int],
+        cropToValidRoi: bool = False,
+        outputScale: float = 1.0,
+) -> tuple[np.ndarray, np.ndarray, tuple, tuple, tuple[int, int]]:
+    """
+    Fold the crop to the valid ROI and the resize into the projection matrices of the rectified cameras, so that
+    `cv.initUndistortRectifyMap` builds a single map (undistort + rectify + crop + resize) and every frame goes through
+    exactly one `cv.remap`.
+
+    Both images are cropped to the same rectangle (intersection of `roi1` and `roi2`), so the rows stay aligned and the
+    disparities are not shifted (only scaled by `outputScale`). The new matrices are `S @ C @ P`, where `C` moves the
+    origin to the corner of the crop and `S` scales the image.
+
+    :return: New `P1`, `P2`, ROI of the left and right output images and the size of the output images (width, height).
+    """
+    if not isinstance(outputScale, (int, float)) or outputScale <= 0:
+        raise ValueError(Fore.RED + "\n`outputScale` must be a positive number!\n")
+
+    x, y = 0, 0
+    width, height = imageSize
+
+    if cropToValidRoi:
+        x, y = max(roi1[0], roi2[0]), max(roi1[1], roi2[1])
+        width = min(roi1[0] + roi1[2], roi2[0] + roi2[2]) - x
+        height = min(roi1[1] + roi1[3], roi2[1] + roi2[3]) - y
+
+        if width <= 0 or height <= 0:
+            raise StereoRectificationError(f"Valid regions of the rectified images do not overlap (roi1={roi1}, roi2={roi2})")
+
+    # Pixel centres are mapped with the scale, so the sampled points stay in the middle of the output pixels
+    transform = np.array([
+        [outputScale, 0.0, (0.5 - x) * outputScale - 0.5],
+        [0.0, outputScale, (0.5 - y) * outputScale - 0.5],
+        [0.0, 0.0, 1.0],
+    ])
+
+    outputSize = (max(1, int(round(width * outputScale))), max(1, int(round(height * outputScale))))
+
+    def transform_roi(roi: tuple) -> tuple:
+        if cropToValidRoi:
+            return 0, 0, outputSize[0], outputSize[1]
+
+        return tuple(int(round(value * outputScale)) for value in roi)
+
+    return transform @ P1, transform @ P2, transform_roi(roi1), transform_roi(roi2), outputSize
+
+
+def _build_rectification_maps(
+        cameraMatrix_left: np.ndarray,
+        distortionCoefficients_left: np.ndarray,
+        cameraMatrix_right: np.ndarray,
+        distortionCoefficients_right: np.ndarray,
+        R: np.ndarray,
+        T: np.ndarray,
+        imageSize: tuple[int, int],
+        rectificationMapsPath: str = "",
+        cropToValidRoi: bool = False,
+        outputScale: float = 1.0,
+        loadMaps: bool = True,
+        saveMaps: bool = True,
+        verbose: bool = False,
+) -> tuple[dict[str, np.ndarray], tuple, tuple, np.ndarray]:
+    """
+    Compute the stereo rectification and the rectification maps (CV_16SC2) once for a whole session.
+
+    If `rectificationMapsPath` (binary map store directory, or a `.json` file in the legacy format) is provided, the maps
+    for this calibration are loaded from it (`loadMaps`, memory-mapped) or, if they are not there yet, created and saved
+    to it (`saveMaps`). Maps loaded from the store are never saved back over the files they are mapped from. With
+    `cropToValidRoi` and/or `outputScale` the crop and resize are fused into the maps (see `_fuse_crop_and_scale`).
+
+    :return: Dictionary with the maps (**map1_left**, **map2_left**, **map1_right**, **map2_right**), ROI of the left and right rectified images and the `Q` matrix (of the output images).
+    """
+    try:
+        R1, R2, P1, P2, Q, roi1, roi2 = cv.stereoRectify(
+            cameraMatrix_left, distortionCoefficients_left, cameraMatrix_right, distortionCoefficients_right,
+            imageSize, R, T
+        )
+
+    except cv.error as e:
+        raise StereoRectificationError(f"Error in stereo rectification process: {str(e)}")
+
+    # Crop to the valid ROI and resize are folded into the projection matrices - one remap per image
+    P1, P2, roi1, roi2, outputSize = _fuse_crop_and_scale(P1, P2, roi1, roi2, imageSize, cropToValidRoi, outputScale)
+
+    if cropToValidRoi or outputScale != 1.0:
+        # Reprojection matrix of the output images (principal points, focal length and baseline in output pixels)
+        Tx = P2[0, 3] / P2[0, 0]
+        Q = np.array([
+            [1.0, 0.0, 0.0, -P1[0, 2]],
+            [0.0, 1.0, 0.0, -P1[1, 2]],
+            [0.0, 0.0, 0.0, P1[0, 0]],
+            [0.0, 0.0, -1.0 / Tx, (P1[0, 2] - P2[0, 2]) / Tx],
+        ])
+
+    # Maps in the binary store are keyed by the stereo calibration, so stale maps are never loaded
+    calibrationKey = rectification_maps_key(
+        cameraMatrix_left, distortionCoefficients_left, cameraMatrix_right, distortionCoefficients_right, R, T, imageSize,
+        cropToValidRoi, outputScale
+    )
+    legacyMapsFormat = rectificationMapsPath.lower().endswith(".json")
+
+    if loadMaps and rectificationMapsPath:
+        from ..content_loaders import load_rectification_maps
+
+        if verbose:
+            print(Fore.GREEN + "\nLoading the rectification maps...")
+
+        if legacyMapsFormat or os.path.isdir(os.path.join(rectificationMapsPath, calibrationKey)):
+            return load_rectification_maps(rectificationMapsPath, None if legacyMapsFormat else calibrationKey), roi1, roi2, Q
+
+        if verbose:
+            # Cache miss - the maps are created below (and saved if `saveMaps` is True)
+            print(Fore.YELLOW + f"\nRectification maps for this calibration ({calibrationKey}) not found in '{rectificationMapsPath}', creating new maps...")
+
+    map1_left, map2_left = cv.initUndistortRectifyMap(cameraMatrix_left, distortionCoefficients_left, R1, P1, outputSize, cv.CV_16SC2)
+    map1_right, map2_right = cv.initUndistortRectifyMap(cameraMatrix_right, distortionCoefficients_right, R2, P2, outputSize, cv.CV_16SC2)
+
+    rectificationMaps = {
+        "map1_left": map1_left,
+        "map2_left": map2_left,
+        "map1_right": map1_right,
+        "map2_right": map2_right,
+    }
+
+    if saveMaps and rectificationMapsPath:
+        from ..content_loaders import save_calibration, save_rectification_maps
+
+        if verbose:
+            print(Fore.GREEN + "\nSaving the rectification maps...")
+
+        if legacyMapsFormat:
+            # Legacy JSON format (large and slow to load, kept for compatibility)
+            save_calibration({name: rectificationMap.tolist() for name, rectificationMap in rectificationMaps.items()}, rectificationMapsPath)
+
+        else:
+            save_rectification_maps(rectificationMaps, rectificationMapsPath, calibrationKey)
+
+    return rectificationMaps, roi1, roi2, Q
+
+
 def stereo_rectify(
     calibImgDirPath_left: str,
     calibImgDirPath_right: str,
@@ -102,6 +315,11 @@ def stereo_rectify(
     rectificationMapsPath: str = "",
     testInterpolationMethods: bool = False,
     drawEpipolarLinesParams: tuple[int, int, int] = (15, 2, 2),
+    cropToValidRoi: bool = False,
+    outputScale: float = 1.0,
+    benchmarkRepeats: int = 20,
+    benchmarkWarmup: int = 3,
+    benchmarkResultsPath: str = "",
 ) -> None:
     """
         Perform stereo rectification on a pair of stereo images and visualize epipolar lines.
@@ -125,18 +343,25 @@ def stereo_rectify(
         :param bool loadStereoCalibrationParams: Whether to load stereo calibration parameters from a file.
         :param str stereoCalibrationParamsPath: Path to the stereo calibration parameters file.
         :param bool saveRectificationMaps: Whether to save rectification maps to a file (default is False).
-        :param bool loadRectificationMaps: Whether to load rectification maps from a file (default is False).
-        :param str rectificationMapsPath: Path to save or load rectification maps.
-        :param bool testInterpolationMethods: Whether to test different interpolation methods for rectification.
+        :param bool loadRectificationMaps: Whether to load rectification maps from a file (default is False). If the binary map store does not contain maps for the current calibration, new maps are created.
+        :param str rectificationMapsPath: Path to save or load rectification maps - a directory of the binary map store (maps are saved as `.npy` files in a subdirectory named after the hash of the stereo calibration, see `save_rectification_maps`) or a `.json` file (legacy format, large and slow to load).
+        :param bool testInterpolationMethods: Whether to benchmark different interpolation methods for rectification (warmup, repeated timed runs, median and p95 time, throughput and quality compared with INTER_LANCZOS4). The rectified pairs of every method are shown/saved like a single rectified pair.
         :param tuple[int, int, int] drawEpipolarLinesParams: Parameters for drawing epipolar lines (default is (15, 2, 2)).:
             - **number of lines** - Number of lines to draw (default is 15).
             - **line thickness** - Thickness of the lines (default is 2).
             - **roi rect thickness** - Thickness of the region of interest rectangle around the lines (default is 2).
+        :param bool cropToValidRoi: Crop the rectified images to the valid region (intersection of `roi1` and `roi2` from `cv.stereoRectify`, the same for both images). The crop is fused into the rectification maps (default is False).
+        :param float outputScale: Scale of the rectified images (e.g. 0.5 for half resolution before matching). The resize is fused into the rectification maps, so every image goes through a single `cv.remap` (default is 1.0).
+        :param int benchmarkRepeats: Number of timed runs of every interpolation method (`testInterpolationMethods`, default is 20).
+        :param int benchmarkWarmup: Number of untimed runs of every interpolation method before the timed runs (`testInterpolationMethods`, default is 3).
+        :param str benchmarkResultsPath: Path to the JSON file to save the benchmark results to (`testInterpolationMethods`, default is "" - results are only printed).
 
         :raises CalibrationImagesNotFound: If no calibration images are found in the specified directories.
         :raises MissingParameters: If required camera parameters are missing and not loaded from a file.
         :raises RectificationMapsPathNotProvided: If the path for saving/loading rectification maps is not provided.
         :raises StereoCalibrationParamsPathNotProvided: If the path for stereo calibration parameters is not provided.
+        :raises StereoRectificationError: If the valid regions of the rectified images do not overlap (`cropToValidRoi`).
+        :raises ValueError: If `outputScale` is not a positive number.
 
         :return: None
     """
@@ -151,37 +376,8 @@ def stereo_rectify(
 
     grayImg_left = cv.cvtColor(cv.imread(images_left[0]), cv.COLOR_BGR2GRAY)
 
-    # User provided required params and doesn't want to load from file - calculate new rectification maps
-    if not loadStereoCalibrationParams:
-
-        if (
-                cameraMatrix_left is None or
-                cameraMatrix_right is None or
-                distortionCoefficients_left is None or
-                distortionCoefficients_right is None or
-                R is None or
-                T is None
-        ):
-            raise MissingParameters
-
-        try:
-            # Stereo Rectification
-            R1, R2, P1, P2, Q, roi1, roi2 = cv.stereoRectify(
-                cameraMatrix_left, distortionCoefficients_left, cameraMatrix_right, distortionCoefficients_right,
-                grayImg_left.shape[::-1], R, T
-            )
-
-        except cv.error as e:
-            raise StereoRectificationError(f"Error in stereo rectification process: {str(e)}")
-
-        if not loadRectificationMaps:
-            # Create rectification maps
-            map1_left, map2_left = cv.initUndistortRectifyMap(cameraMatrix_left, distortionCoefficients_left, R1, P1, grayImg_left.shape[::-1], cv.CV_16SC2)
-
-            map1_right, map2_right = cv.initUndistortRectifyMap(cameraMatrix_right, distortionCoefficients_right, R2, P2, grayImg_left.shape[::-1], cv.CV_16SC2)
-
     # User provided required calibration params and wants to load them from file to calculate rectification maps
-    else:
+    if loadStereoCalibrationParams:
         try:
             from ..content_loaders import load_stereo_calibration
 
@@ -197,18 +393,6 @@ def stereo_rectify(
             T = stereoCalibrationParams["translationVector"]
             F = stereoCalibrationParams["fundamentalMatrix"]
 
-            # Stereo Rectification
-            R1, R2, P1, P2, Q, roi1, roi2 = cv.stereoRectify(
-                cameraMatrix_left, distortionCoefficients_left, cameraMatrix_right, distortionCoefficients_right,
-                grayImg_left.shape[::-1], R, T
-            )
-
-            if not loadRectificationMaps:
-                # Create rectification maps
-                map1_left, map2_left = cv.initUndistortRectifyMap(cameraMatrix_left, distortionCoefficients_left, R1, P1, grayImg_left.shape[::-1], cv.CV_16SC2)
-
-                map1_right, map2_right = cv.initUndistortRectifyMap(cameraMatrix_right, distortionCoefficients_right, R2, P2, grayImg_left.shape[::-1], cv.CV_16SC2)
-
         except StereoCalibrationParamsPathNotProvided:
             print(Fore.RED + "Error loading stereo calibration parameters!")
             raise
@@ -220,62 +404,52 @@ def stereo_rectify(
         except Exception as e:
             print(Fore.RED + f"Unknown error occurred\nError: {e}\n")
 
-    # User provided required maps and wants to load them from file
-    if loadRectificationMaps:
-        try:
-            from ..content_loaders import load_rectification_maps
-
-            print(Fore.GREEN + "\nLoading the rectification maps...")
-
-            rectificationMaps = load_rectification_maps(rectificationMapsPath)
-
-            map1_left = rectificationMaps["map1_left"]
-            map2_left = rectificationMaps["map2_left"]
-            map1_right = rectificationMaps["map1_right"]
-            map2_right = rectificationMaps["map2_right"]
-
-        except RectificationMapsPathNotProvided:
+    if (
+            cameraMatrix_left is None or
+            cameraMatrix_right is None or
+            distortionCoefficients_left is None or
+            distortionCoefficients_right is None or
+            R is None or
+            T is None
+    ):
+        raise MissingParameters
+
+    # User wants to load and/or save rectification maps
+    if (loadRectificationMaps or saveRectificationMaps) and ((not rectificationMapsPath) or (len(rectificationMapsPath) == 0)):
+        if loadRectificationMaps:
             print(Fore.RED + "\nError loading rectification maps!\n")
-            raise
-
-    # User wants to save rectification maps
-    if saveRectificationMaps:
-        if (not rectificationMapsPath) or (len(rectificationMapsPath) == 0):
-            raise RectificationMapsPathNotProvided
-
-        try:
-            from ..content_loaders import save_calibration
-
-            if (not map1_left) or (not map2_left) or (not map1_right) or (not map2_right):
-                raise MissingParameters
-
-            print(Fore.GREEN + "\nSaving the rectification maps...")
 
-            rectificationParams = {
-                "map1_left": map1_left,
-                "map2_left": map2_left,
-                "map1_right": map1_right,
-                "map2_right": map2_right,
-            }
+        raise RectificationMapsPathNotProvided
 
-            save_calibration(rectificationParams, rectificationMapsPath)
+    # Stereo rectification and the maps (loaded from / saved to the map store or the legacy JSON file)
+    rectificationMaps, roi1, roi2, _ = _build_rectification_maps(
+        cameraMatrix_left, distortionCoefficients_left, cameraMatrix_right, distortionCoefficients_right,
+        R, T, grayImg_left.shape[::-1], rectificationMapsPath, cropToValidRoi, outputScale,
+        loadMaps=loadRectificationMaps, saveMaps=saveRectificationMaps, verbose=True
+    )
 
-        except CalibrationParamsPathNotProvided:
-            print(Fore.RED + "\nError occurred while saving the calibration parameters!\n")
-            raise
-
-        except Exception as e:
-            print(Fore.RED + "\nUnknown error occurred\n")
-            raise
+    map1_left = rectificationMaps["map1_left"]
+    map2_left = rectificationMaps["map2_left"]
+    map1_right = rectificationMaps["map1_right"]
+    map2_right = rectificationMaps["map2_right"]
 
     if F is None or imgPoints_left is None or imgPoints_right is None:
         raise MissingParameters("F, imgPoints_left, and imgPoints_right must not be None")
 
     if testInterpolationMethods:
-        interpolationTypes = [cv.INTER_NEAREST, cv.INTER_LINEAR, cv.INTER_CUBIC, cv.INTER_AREA, cv.INTER_LANCZOS4]
-        interpolationTypesNames = ["INTER_NEAREST", "INTER_LINEAR", "INTER_CUBIC", "INTER_AREA", "INTER_LANCZOS4"]
+        # INTER_AREA is not supported by `cv.remap` (it falls back to INTER_LINEAR), so it is not benchmarked
+        interpolationTypes = {
+            "INTER_NEAREST": cv.INTER_NEAREST,
+            "INTER_LINEAR": cv.INTER_LINEAR,
+            "INTER_CUBIC": cv.INTER_CUBIC,
+            "INTER_LANCZOS4": cv.INTER_LANCZOS4,
+        }
+        interpolationTypesNames = list(interpolationTypes)
         rectifiedImagesDifferentInterpolations = []
 
+        if not isinstance(benchmarkRepeats, int) or benchmarkRepeats <= 0 or not isinstance(benchmarkWarmup, int) or benchmarkWarmup < 0:
+            raise ValueError(Fore.RED + "\n`benchmarkRepeats` must be a positive integer and `benchmarkWarmup` a non-negative integer!\n")
+
         # Load an example pair of images for rectification
         img_left = cv.imread(images_left[whichImage])
         img_right = cv.imread(images_right[whichImage])
@@ -283,22 +457,53 @@ def stereo_rectify(
         if img_left.shape != img_right.shape:
             raise StereoRectificationError("Images must have the same dimensions")
 
+        print(Fore.GREEN + f"\nBenchmarking interpolation methods ({benchmarkWarmup} warmup + {benchmarkRepeats} timed runs each)...")
+
+        benchmarkResults = _benchmark_interpolation(
+            img_left,
+            img_right,
+            {"map1_left": map1_left, "map2_left": map2_left, "map1_right": map1_right, "map2_right": map2_right},
+            interpolationTypes,
+            repeats=benchmarkRepeats,
+            warmup=benchmarkWarmup,
+        )
+
+        for name, methodResults in benchmarkResults["methods"].items():
+            if name == benchmarkResults["reference"]:
+                psnr = "reference"
+
+            else:
+                # No PSNR - the output is byte-identical to the reference
+                psnr = f"{methodResults['psnr_dB']:.2f} dB" if methodResults["psnr_dB"] is not None else "identical"
+
+            # No throughput - the median time is below the resolution of the timer
+            throughput = f"{methodResults['throughput_MPps']:.1f} MP/s" if methodResults["throughput_MPps"] is not None else "n/a"
+
+            print(
+                Fore.MAGENTA + f"\nInterpolation type {name}:"
+                f"\n\tmedian: {methodResults['median_ms']:.3f} ms\n\tp95: {methodResults['p95_ms']:.3f} ms"
+                f"\n\tthroughput: {throughput}"
+                f"\n\tmean abs diff vs {benchmarkResults['reference']}: {methodResults['meanAbsDiff']:.3f}\n\tPSNR: {psnr}"
+            )
+
+        if benchmarkResultsPath:
+            from ..content_loaders import save_calibration
+
+            save_calibration(benchmarkResults, benchmarkResultsPath)
+            print(Fore.GREEN + f"\nBenchmark results saved to '{benchmarkResultsPath}'")
+
+        # Visualization (not timed)
         for i, interpolationType in enumerate(tqdm(
-                    interpolationTypes,
-                    desc=Style.RESET_ALL + "Testing interpolation methods...",
+                    interpolationTypes.values(),
+                    desc=Style.RESET_ALL + "Drawing rectified pairs...",
                     dynamic_ncols=True,
                     bar_format="{l_bar}{bar}{r_bar}",
                     colour="green",
                     file=stdout,
                     position=0
         )):
-            tic_1 = perf_counter()
             rectified_left = cv.remap(img_left, map1_left, map2_left, interpolationType)
-            tic_2 = perf_counter()
             rectified_right = cv.remap(img_right, map1_right, map2_right, interpolationType)
-            toc = perf_counter()
-
-            tqdm.write(Fore.MAGENTA + f"\nInterpolation type {interpolationTypesNames[i]}:\n\tleft_image: {tic_2 - tic_1}\n\tright_image: {toc - tic_2}\n\ttotal: {toc - tic_1}", nolock=True, file=stdout)
 
             # Draw epilines using the fundamental matrix F
             rectified_left_with_lines, rectified_right_with_lines = draw_epilines_aligned(
@@ -313,7 +518,6 @@ def stereo_rectify(
 
             # Combine the images side-by-side for visualization
             rectified_pair = np.hstack((rectified_left_with_lines, rectified_right_with_lines))
-            # rectified_pair = np.hstack((rectified_left, rectified_right))
 
             rectifiedImagesDifferentInterpolations.append(rectified_pair)
 
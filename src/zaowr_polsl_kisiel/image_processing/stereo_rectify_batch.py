@@ -0,0 +1,210 @@
+import glob
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from sys import stdout
+
+import cv2 as cv
+import numpy as np
+from colorama import Fore, Style, init as colorama_init
+from tqdm import tqdm  # progress bar
+
+from .stereo_rectify import _build_rectification_maps
+from ..custom_exceptions.exceptions import CalibrationImagesNotFound, MissingParameters, RectifiedImgPathNotProvided, \
+    StereoRectificationError
+
+colorama_init(autoreset=True)
+
+# Tokens marking the side of the image in the file name (e.g. "left_001.png", "img_R_001.png")
+_SIDE_TOKENS = re.compile(r"(?:^|(?<=[_\-. ]))(?:left|right|l|r)(?=$|[_\-. ])", re.IGNORECASE)
+
+
+def _pair_key(imagePath: str) -> str:
+    """
+    Name used to match the left and right images - the file name without the extension and the left/right tokens.
+    """
+    stem = os.path.splitext(os.path.basename(imagePath))[0]
+    key = _SIDE_TOKENS.sub("", stem)
+    key = re.sub(r"[_\-. ]+", "_", key).strip("_").lower()
+
+    return key if key else stem.lower()
+
+
+def _match_pairs(
+        images_left: list[str],
+        images_right: list[str]
+) -> list[tuple[str, str]]:
+    """
+    Match the left and right images by name (not by the order returned by `glob`). Images without a counterpart are skipped.
+    """
+    def index(images: list[str]) -> dict[str, str]:
+        byKey = {}
+        for imagePath in images:
+            key = _pair_key(imagePath)
+            if key in byKey:
+                raise StereoRectificationError(f"Ambiguous image names: '{byKey[key]}' and '{imagePath}' match the same pair")
+            byKey[key] = imagePath
+
+        return byKey
+
+    left, right = index(images_left), index(images_right)
+    unmatched = left.keys() ^ right.keys()
+    if unmatched:
+        print(Fore.YELLOW + f"\nSkipping {len(unmatched)} images without a counterpart: {sorted(unmatched)}")
+
+    return [(left[key], right[key]) for key in sorted(left.keys() & right.keys())]
+
+
+def stereo_rectify_batch(
+    calibImgDirPath_left: str,
+    calibImgDirPath_right: str,
+    rectifiedImagesDirPath: str,
+    cameraMatrix_left: np.ndarray = None,
+    cameraMatrix_right: np.ndarray = None,
+    distortionCoefficients_left: np.ndarray = None,
+    distortionCoefficients_right: np.ndarray = None,
+    R: np.ndarray = None,
+    T: np.ndarray = None,
+    loadStereoCalibrationParams: bool = False,
+    stereoCalibrationParamsPath: str = "",
+    rectificationMapsPath: str = "",
+    globImgExtension: str = "png",
+    grayscale: bool = False,
+    workers: int = 4,
+    cropToValidRoi: bool = False,
+    outputScale: float = 1.0,
+) -> list[tuple[str, str]]:
+    """
+    Rectify all stereo pairs of a session (instead of a single pair like `stereo_rectify`).
+
+    The left and right images are matched by name - the file name without the extension and the left/right tokens
+    (e.g. `cam1/28.png` + `cam4/28.png` or `left_001.png` + `right_001.png`), not by the `glob` order. The rectification
+    maps are built once (or loaded from the binary map store, see `rectificationMapsPath`) and shared by all pairs.
+    The pairs are processed by a pool of threads (reading, `cv.remap` and writing release the GIL) and the results are
+    returned in the order of the pair names.
+
+    The rectified images are saved to `<rectifiedImagesDirPath>/left/` and `<rectifiedImagesDirPath>/right/` under their
+    original file names.
+
+    :param str calibImgDirPath_left: Path to the directory containing left camera images.
+    :param str calibImgDirPath_right: Path to the directory containing right camera images.
+    :param str rectifiedImagesDirPath: Directory to save the rectified images (created if it does not exist).
+    :param np.ndarray cameraMatrix_left: Intrinsic matrix of the left camera (3x3). Required if not loading parameters.
+    :param np.ndarray cameraMatrix_right: Intrinsic matrix of the right camera (3x3). Required if not loading parameters.
+    :param np.ndarray distortionCoefficients_left: Distortion coefficients of the left camera.
+    :param np.ndarray distortionCoefficients_right: Distortion coefficients of the right camera.
+    :param np.ndarray R: Rotation matrix (3x3) between the two cameras. Required if not loading parameters.
+    :param np.ndarray T: Translation vector (3x1) between the two cameras. Required if not loading parameters.
+    :param bool loadStereoCalibrationParams: Whether to load stereo calibration parameters from a file.
+    :param str stereoCalibrationParamsPath: Path to the stereo calibration parameters file.
+    :param str rectificationMapsPath: Directory of the binary map store. If provided, the maps are loaded from it (or created and saved to it). Default is "" (maps are always created).
+    :param str globImgExtension: File extension of input images (default is "png").
+    :param bool grayscale: Read and save the images in grayscale only (enough for the disparity calculation, faster). Default is False.
+    :param int workers: Number of threads. Default is 4.
+    :param bool cropToValidRoi: Crop the rectified images to the valid region of both cameras (fused into the maps, see `stereo_rectify`). Default is False.
+    :param float outputScale: Scale of the rectified images (fused into the maps, see `stereo_rectify`). Default is 1.0.
+
+    :raises CalibrationImagesNotFound: If no images (or no matching pairs) are found in the specified directories.
+    :raises MissingParameters: If required camera parameters are missing and not loaded from a file.
+    :raises RectifiedImgPathNotProvided: If the directory for the rectified images is not provided.
+    :raises StereoRectificationError: If the images have different sizes or the names of the images are ambiguous.
+
+    :return: List of `(left, right)` paths of the saved rectified images.
+    """
+    if (not rectifiedImagesDirPath) or (not isinstance(rectifiedImagesDirPath, str)):
+        raise RectifiedImgPathNotProvided
+
+    if not isinstance(workers, int) or workers <= 0:
+        raise ValueError(Fore.RED + "\n`workers` must be a positive integer!\n")
+
+    images_left = glob.glob(calibImgDirPath_left + "/*." + globImgExtension)
+    images_right = glob.glob(calibImgDirPath_right + "/*." + globImgExtension)
+
+    if len(images_left) == 0 or len(images_right) == 0:
+        raise CalibrationImagesNotFound
+
+    pairs = _match_pairs(images_left, images_right)
+    if len(pairs) == 0:
+        raise CalibrationImagesNotFound("No matching left/right image pairs found!")
+
+    if loadStereoCalibrationParams:
+        from ..content_loaders import load_stereo_calibration
+
+        print(Fore.GREEN + "\nLoading the STEREO calibration parameters...")
+
+        stereoCalibrationParams = load_stereo_calibration(stereoCalibrationParamsPath)
+
+        cameraMatrix_left = stereoCalibrationParams["cameraMatrix_left"]
+        cameraMatrix_right = stereoCalibrationParams["cameraMatrix_right"]
+        distortionCoefficients_left = stereoCalibrationParams["distortionCoefficients_left"]
+        distortionCoefficients_right = stereoCalibrationParams["distortionCoefficients_right"]
+        R = stereoCalibrationParams["rotationMatrix"]
+        T = stereoCalibrationParams["translationVector"]
+
+    if (
+            cameraMatrix_left is None or
+            cameraMatrix_right is None or
+            distortionCoefficients_left is None or
+            distortionCoefficients_right is None or
+            R is None or
+            T is None
+    ):
+        raise MissingParameters
+
+    imreadFlags = cv.IMREAD_GRAYSCALE if grayscale else cv.IMREAD_COLOR
+
+    firstImg = cv.imread(pairs[0][0], imreadFlags)
+    if firstImg is None:
+        raise IOError(Fore.RED + f"\nFailed to load image from path: {pairs[0][0]}\n")
+
+    imageSize = firstImg.shape[1::-1]
+
+    # The maps are built (or loaded) once for the whole session
+    rectificationMaps, _, _, _ = _build_rectification_maps(
+        cameraMatrix_left, distortionCoefficients_left, cameraMatrix_right, distortionCoefficients_right,
+        R, T, imageSize, rectificationMapsPath, cropToValidRoi, outputScale
+    )
+
+    outputDir_left = os.path.join(rectifiedImagesDirPath, "left")
+    outputDir_right = os.path.join(rectifiedImagesDirPath, "right")
+    os.makedirs(outputDir_left, exist_ok=True)
+    os.makedirs(outputDir_right, exist_ok=True)
+
+    def rectify(pair: tuple[str, str]) -> tuple[str, str]:
+        savedPaths = []
+        for imagePath, side, outputDir in ((pair[0], "left", outputDir_left), (pair[1], "right", outputDir_right)):
+            img = cv.imread(imagePath, imreadFlags)
+            if img is None:
+                raise IOError(Fore.RED + f"\nFailed to load image from path: {imagePath}\n")
+
+            if img.shape[1::-1] != imageSize:
+                raise StereoRectificationError(f"Images must have the same dimensions ('{imagePath}')")
+
+            rectified = cv.remap(img, rectificationMaps[f"map1_{side}"], rectificationMaps[f"map2_{side}"], cv.INTER_LINEAR)
+
+            outputPath = os.path.join(outputDir, os.path.basename(imagePath))
+            if not cv.imwrite(outputPath, rectified):
+                raise IOError(Fore.RED + f"\nFailed to save image to path: {outputPath}\n")
+
+            savedPaths.append(outputPath)
+
+        return savedPaths[0], savedPaths[1]
+
+    print(Fore.GREEN + f"\nRectifying {len(pairs)} stereo pairs...")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # `map` yields the results in the order of the pairs
+        savedPairs = list(tqdm(
+            executor.map(rectify, pairs),
+            total=len(pairs),
+            desc=Style.RESET_ALL + "Rectifying stereo pairs...",
+            dynamic_ncols=True,
+            bar_format="{l_bar}{bar}{r_bar}",
+            colour="green",
+            file=stdout,
+            position=0
+        ))
+
+    print(Fore.GREEN + f"\nRectified images saved to '{rectifiedImagesDirPath}'")
+
+    return savedPairs
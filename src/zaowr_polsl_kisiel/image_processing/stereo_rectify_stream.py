@@ -0,0 +1,317 @@
+import os
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from time import perf_counter
+from typing import Iterator
+
+import cv2 as cv
+import numpy as np
+from colorama import Fore, init as colorama_init
+
+from .stereo_rectify import _build_rectification_maps
+from ..custom_exceptions.exceptions import MissingParameters, StereoRectificationError
+
+colorama_init(autoreset=True)
+
+# Marks the end of a stream in the frame queues
+_END_OF_STREAM = None
+
+
+def _open_capture(
+        source: str | int | cv.VideoCapture
+) -> tuple[cv.VideoCapture, bool, bool]:
+    """
+    Open the source (camera number, video file or an already opened `cv.VideoCapture`).
+
+    :return: Capture, whether it was opened here (and should be released here) and whether it is a live camera.
+    """
+    if isinstance(source, cv.VideoCapture):
+        if not source.isOpened():
+            raise IOError(Fore.RED + "\nProvided VideoCapture is not opened!\n")
+
+        return source, False, False
+
+    if isinstance(source, int) or (isinstance(source, str) and source.isdigit()):
+        cap = cv.VideoCapture(int(source))
+        live = True
+
+    elif isinstance(source, str) and os.path.isfile(source):
+        cap = cv.VideoCapture(source)
+        live = False
+
+    else:
+        raise ValueError(Fore.RED + f"\nInvalid source! Provide a camera number, video file path or VideoCapture ('{source}' provided)\n")
+
+    if not cap.isOpened():
+        raise IOError(Fore.RED + f"\nUnable to read source: {source}\n")
+
+    return cap, True, live
+
+
+def _read_capture(
+        cap: cv.VideoCapture,
+        frames: Queue,
+        stop: Event,
+        errors: list,
+        useCaptureTimestamps: bool,
+        grayscale: bool,
+        clockStart: float
+) -> None:
+    """
+    Reader thread - puts `(timestamp [ms], frame)` tuples to the bounded queue (blocks while it is full) and
+    `_END_OF_STREAM` at the end of the stream, on error or when `stop` is set.
+    """
+    try:
+        while not stop.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            # Live cameras (and captures without timestamps) use the common clock of both readers
+            timestamp = cap.get(cv.CAP_PROP_POS_MSEC) if useCaptureTimestamps else (perf_counter() - clockStart) * 1000.0
+
+            if grayscale and frame.ndim == 3:
+                frame = cv.cvtColor(frame, cv.COLOR_BGR2GRAY)
+
+            while not stop.is_set():
+                try:
+                    frames.put((timestamp, frame), timeout=0.1)
+                    break
+                except Full:
+                    continue
+
+    except Exception as e:
+        errors.append(e)
+
+    finally:
+        while True:
+            try:
+                frames.put(_END_OF_STREAM, timeout=0.1)
+                break
+            except Full:
+                if stop.is_set():
+                    break
+
+
+def _iterate_queue(
+        frames: Queue,
+        errors: list
+) -> Iterator[tuple[float, np.ndarray]]:
+    """
+    Yield the frames from the queue until the end of the stream (re-raises the error of the reader thread).
+    """
+    while True:
+        item = frames.get()
+        if item is _END_OF_STREAM:
+            if errors:
+                raise errors[0]
+
+            return
+
+        yield item
+
+
+def _pair_frames(
+        frames_left: Iterator[tuple[float, np.ndarray]],
+        frames_right: Iterator[tuple[float, np.ndarray]],
+        maxTimeDifference: float
+) -> Iterator[tuple[float, np.ndarray, np.ndarray]]:
+    """
+    Pair the frames of two streams by timestamp. The older frame is dropped until the timestamps of both heads differ
+    by at most `maxTimeDifference` (ms), so a frame dropped by one of the cameras does not shift all following pairs.
+
+    :return: Iterator of `(timestamp, frame_left, frame_right)`, the timestamp is the mean of both timestamps.
+    """
+    left = next(frames_left, None)
+    right = next(frames_right, None)
+
+    while left is not None and right is not None:
+        difference = left[0] - right[0]
+
+        if abs(difference) <= maxTimeDifference:
+            yield 0.5 * (left[0] + right[0]), left[1], right[1]
+            left = next(frames_left, None)
+            right = next(frames_right, None)
+
+        elif difference < 0:
+            left = next(frames_left, None)
+
+        else:
+            right = next(frames_right, None)
+
+
+def stereo_rectify_stream(
+    source_left: str | int | cv.VideoCapture,
+    source_right: str | int | cv.VideoCapture = None,
+    cameraMatrix_left: np.ndarray = None,
+    cameraMatrix_right: np.ndarray = None,
+    distortionCoefficients_left: np.ndarray = None,
+    distortionCoefficients_right: np.ndarray = None,
+    R: np.ndarray = None,
+    T: np.ndarray = None,
+    loadStereoCalibrationParams: bool = False,
+    stereoCalibrationParamsPath: str = "",
+    rectificationMapsPath: str = "",
+    cropToValidRoi: bool = False,
+    outputScale: float = 1.0,
+    grayscale: bool = False,
+    maxTimeDifference: float = None,
+    queueSize: int = 4,
+    interpolation: int = cv.INTER_LINEAR,
+) -> Iterator[tuple[np.ndarray, np.ndarray, float]]:
+    """
+    Rectify a synchronized stereo video stream - two sources (cameras, video files or opened `cv.VideoCapture` objects)
+    or a single side-by-side stream (`source_right=None`, left half - left camera) - and yield the rectified frame pairs.
+
+    - every source is read by its own thread into a bounded queue (at most `queueSize` frames per source are kept in memory),
+    - the frames of two sources are paired by timestamp (`cv.CAP_PROP_POS_MSEC` for video files, the time of reading for cameras), frames without a counterpart are dropped,
+    - the rectification maps are built once from the calibration (same inputs as `stereo_rectify`), loaded from / saved to the binary map store if `rectificationMapsPath` is provided, and every frame goes through a single `cv.remap` (crop and resize can be fused into the maps with `cropToValidRoi` and `outputScale`).
+
+    The reader threads are stopped and the captures opened by the function are released when the generator is closed
+    (e.g. `break` in a `for` loop).
+
+    :param str | int | cv.VideoCapture source_left: Left camera number, video file path or VideoCapture (or the side-by-side stream if `source_right` is None).
+    :param str | int | cv.VideoCapture source_right: Right camera number, video file path or VideoCapture. Default is None (side-by-side stream).
+    :param np.ndarray cameraMatrix_left: Intrinsic matrix of the left camera (3x3). Required if not loading parameters.
+    :param np.ndarray cameraMatrix_right: Intrinsic matrix of the right camera (3x3). Required if not loading parameters.
+    :param np.ndarray distortionCoefficients_left: Distortion coefficients of the left camera.
+    :param np.ndarray distortionCoefficients_right: Distortion coefficients of the right camera.
+    :param np.ndarray R: Rotation matrix (3x3) between the two cameras. Required if not loading parameters.
+    :param np.ndarray T: Translation vector (3x1) between the two cameras. Required if not loading parameters.
+    :param bool loadStereoCalibrationParams: Whether to load stereo calibration parameters from a file.
+    :param str stereoCalibrationParamsPath: Path to the stereo calibration parameters file.
+    :param str rectificationMapsPath: Directory of the binary map store. Default is "" (maps are created in memory).
+    :param bool cropToValidRoi: Crop the rectified frames to the valid region of both cameras (fused into the maps). Default is False.
+    :param float outputScale: Scale of the rectified frames (fused into the maps). Default is 1.0.
+    :param bool grayscale: Convert the frames to grayscale (in the reader threads) before rectification. Default is False.
+    :param float maxTimeDifference: Maximum difference of the timestamps of paired frames in milliseconds. Default is None (half of the frame interval, 20 ms if the FPS is unknown).
+    :param int queueSize: Maximum number of frames waiting in the queue of each source. Default is 4.
+    :param int interpolation: Interpolation method of `cv.remap`. Default is `cv.INTER_LINEAR`.
+
+    :raises MissingParameters: If required camera parameters are missing and not loaded from a file.
+    :raises ValueError: Raises ValueError if:
+        - a source is not a camera number, video file or VideoCapture,
+        - **`queueSize`** is not a positive integer,
+        - **`maxTimeDifference`** is negative.
+
+    :raises IOError: Raises IOError if a source could not be opened.
+    :raises StereoRectificationError: If the left and right frames have different sizes.
+
+    :return: Iterator of `(rectified_left, rectified_right, timestamp)`, timestamp in milliseconds.
+    """
+    if not isinstance(queueSize, int) or queueSize <= 0:
+        raise ValueError(Fore.RED + "\n`queueSize` must be a positive integer!\n")
+
+    if maxTimeDifference is not None and maxTimeDifference < 0:
+        raise ValueError(Fore.RED + "\n`maxTimeDifference` must not be negative!\n")
+
+    if loadStereoCalibrationParams:
+        from ..content_loaders import load_stereo_calibration
+
+        print(Fore.GREEN + "\nLoading the STEREO calibration parameters...")
+
+        stereoCalibrationParams = load_stereo_calibration(stereoCalibrationParamsPath)
+
+        cameraMatrix_left = stereoCalibrationParams["cameraMatrix_left"]
+        cameraMatrix_right = stereoCalibrationParams["cameraMatrix_right"]
+        distortionCoefficients_left = stereoCalibrationParams["distortionCoefficients_left"]
+        distortionCoefficients_right = stereoCalibrationParams["distortionCoefficients_right"]
+        R = stereoCalibrationParams["rotationMatrix"]
+        T = stereoCalibrationParams["translationVector"]
+
+    if (
+            cameraMatrix_left is None or
+            cameraMatrix_right is None or
+            distortionCoefficients_left is None or
+            distortionCoefficients_right is None or
+            R is None or
+            T is None
+    ):
+        raise MissingParameters
+
+    sideBySide = source_right is None
+    sources = [source_left] if sideBySide else [source_left, source_right]
+
+    # Generator body - the parameters above are validated when the function is called, not on the first `next()`
+    def stream() -> Iterator[tuple[np.ndarray, np.ndarray, float]]:
+        captures = []
+        stop = Event()
+        errors = []
+        threads = []
+        queues = []
+
+        try:
+            for source in sources:
+                captures.append(_open_capture(source))
+
+            # Camera timestamps are unreliable - live cameras use the common clock of the reader threads
+            useCaptureTimestamps = not any(live for _, _, live in captures)
+            clockStart = perf_counter()
+
+            timeDifference = maxTimeDifference
+            if timeDifference is None:
+                fps = max(cap.get(cv.CAP_PROP_FPS) for cap, _, _ in captures)
+                timeDifference = 500.0 / fps if fps > 0 else 20.0
+
+            for cap, _, _ in captures:
+                frames = Queue(maxsize=queueSize)
+                thread = Thread(
+                    target=_read_capture,
+                    args=(cap, frames, stop, errors, useCaptureTimestamps, grayscale, clockStart),
+                    daemon=True
+                )
+                thread.start()
+                queues.append(frames)
+                threads.append(thread)
+
+            if sideBySide:
+                pairs = (
+                    (timestamp, frame[:, : frame.shape[1] // 2], frame[:, frame.shape[1] // 2 : 2 * (frame.shape[1] // 2)])
+                    for timestamp, frame in _iterate_queue(queues[0], errors)
+                )
+
+            else:
+                pairs = _pair_frames(_iterate_queue(queues[0], errors), _iterate_queue(queues[1], errors), timeDifference)
+
+            rectificationMaps = None
+            imageSize = None
+
+            for timestamp, frame_left, frame_right in pairs:
+                if frame_left.shape != frame_right.shape:
+                    raise StereoRectificationError("Images must have the same dimensions")
+
+                if rectificationMaps is None:
+                    # The maps are built (or loaded) once, from the size of the first frame
+                    imageSize = frame_left.shape[1::-1]
+                    rectificationMaps, _, _, _ = _build_rectification_maps(
+                        cameraMatrix_left, distortionCoefficients_left, cameraMatrix_right, distortionCoefficients_right,
+                        R, T, imageSize, rectificationMapsPath, cropToValidRoi, outputScale
+                    )
+
+                elif frame_left.shape[1::-1] != imageSize:
+                    raise StereoRectificationError(f"Frame size changed during the stream ({imageSize} -> {frame_left.shape[1::-1]})")
+
+                rectified_left = cv.remap(frame_left, rectificationMaps["map1_left"], rectificationMaps["map2_left"], interpolation)
+                rectified_right = cv.remap(frame_right, rectificationMaps["map1_right"], rectificationMaps["map2_right"], interpolation)
+
+                yield rectified_left, rectified_right, timestamp
+
+        finally:
+            stop.set()
+
+            # Unblock the readers waiting for a free place in the queue
+            for frames in queues:
+                while True:
+                    try:
+                        frames.get_nowait()
+                    except Empty:
+                        break
+
+            for thread in threads:
+                thread.join()
+
+            for cap, openedHere, _ in captures:
+                if openedHere:
+                    cap.release()
+
+    return stream()
@@ -0,0 +1,450 @@
+import numpy as np
+from colorama import Fore, init as colorama_init
+from skimage.measure import marching_cubes
+
+from .disparity_to_depth_map import disparity_to_depth_map
+
+colorama_init(autoreset=True)
+
+# Block coordinates are packed into a single int64 key (21 bits per axis, biased to be non-negative)
+_KEY_BITS = 21
+_KEY_BIAS = 1 << (_KEY_BITS - 1)
+
+
+def _pack_keys(blockCoords: np.ndarray) -> np.ndarray:
+    """
+    Pack integer block coordinates (N, 3) into int64 keys.
+    """
+    biased = blockCoords.astype(np.int64) + _KEY_BIAS
+    return (biased[:, 0] << (2 * _KEY_BITS)) | (biased[:, 1] << _KEY_BITS) | biased[:, 2]
+
+
+def _unpack_keys(keys: np.ndarray) -> np.ndarray:
+    """
+    Unpack int64 keys into integer block coordinates (N, 3).
+    """
+    mask = (1 << _KEY_BITS) - 1
+    return np.stack([keys >> (2 * _KEY_BITS), (keys >> _KEY_BITS) & mask, keys & mask], axis=1) - _KEY_BIAS
+
+
+class TSDFVolume:
+    """
+    Incremental depth fusion into a sparse, voxel-hashed truncated signed distance field (TSDF).
+
+    The space is divided into blocks of `blockSize`^3 voxels, which are allocated only where a depth map observed a
+    surface. The blocks are stored in preallocated pools (the TSDF, weights and colors of every block are contiguous
+    slices) and looked up by their packed int64 key with `np.searchsorted`. Each call to `integrate` allocates the blocks
+    near the observed surface and updates only the voxels of these blocks (vectorized, in batches of blocks), so the cost
+    of a frame does not depend on the size of the scene fused so far.
+
+    The memory grows with the observed surface area, not with the number of frames - unlike concatenating the point
+    clouds of all frames, repeated observations of the same surface are averaged into the same voxels.
+
+    - `integrate` - fuse a depth map (and optionally a color image) seen from a camera pose,
+    - `integrate_disparity` - convert a disparity map with `disparity_to_depth_map` and fuse it,
+    - `extract_point_cloud` - surface points (zero crossings of the TSDF) with colors,
+    - `extract_mesh` - triangle mesh (marching cubes) with colors.
+
+    The camera coordinate system follows OpenCV (x right, y down, z forward). The extracted points are in world
+    coordinates (`cameraPose` maps camera to world coordinates) and can be saved with `write_ply_file`.
+    """
+
+    def __init__(
+            self,
+            voxelSize: float,
+            truncation: float = None,
+            blockSize: int = 8,
+            maxWeight: float = 64.0,
+            batchBlocks: int = 512,
+    ) -> None:
+        """
+        Create an empty volume.
+
+        :param float voxelSize: Edge length of a voxel (in the units of the depth maps, e.g. meters).
+        :param float truncation: Truncation distance of the signed distance. If None, 4 * `voxelSize` is used. Default is None.
+        :param int blockSize: Number of voxels along the edge of a block. Default is 8.
+        :param float maxWeight: Maximal weight of a voxel (limits how slowly the volume adapts to changes). Default is 64.0.
+        :param int batchBlocks: Number of blocks processed at once (limits the memory used during integration and extraction). Default is 512.
+
+        :raises TypeError: Raises TypeError if **`voxelSize`** is not a float.
+        :raises ValueError: Raises ValueError if:
+            - **`voxelSize`**, **`truncation`** or **`maxWeight`** is not positive,
+            - **`blockSize`** or **`batchBlocks`** is not a positive integer.
+        """
+        if not isinstance(voxelSize, float):
+            raise TypeError(Fore.RED + "\nVoxel size must be a float!\n")
+
+        if truncation is None:
+            truncation = 4 * voxelSize
+
+        if voxelSize <= 0 or truncation <= 0 or maxWeight <= 0:
+            raise ValueError(Fore.RED + "\nVoxel size, truncation and max weight must be positive!\n")
+
+        if not isinstance(blockSize, int) or blockSize <= 0 or not isinstance(batchBlocks, int) or batchBlocks <= 0:
+            raise ValueError(Fore.RED + "\n`blockSize` and `batchBlocks` must be positive integers!\n")
+
+        self.voxelSize = voxelSize
+        self.truncation = float(truncation)
+        self.blockSize = blockSize
+        self.maxWeight = float(maxWeight)
+        self.batchBlocks = batchBlocks
+
+        # Local voxel coordinates inside a block, flat index = (x * B + y) * B + z
+        self._local = np.indices((blockSize,) * 3).reshape(3, -1).T
+
+        # Sorted keys of the allocated blocks and their slots in the pools
+        self._keys = np.empty(0, dtype=np.int64)
+        self._slots = np.empty(0, dtype=np.int64)
+        self._count = 0
+
+        self._tsdf = np.ones((0, blockSize ** 3), dtype=np.float32)
+        self._weight = np.zeros((0, blockSize ** 3), dtype=np.float32)
+        self._color = np.zeros((0, blockSize ** 3, 3), dtype=np.float32)
+
+    def __len__(self) -> int:
+        """
+        Number of allocated blocks.
+        """
+        return self._count
+
+    def _find(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Slots of the blocks with the given keys (-1 if the block is not allocated).
+        """
+        if len(self._keys) == 0:
+            return np.full(len(keys), -1, dtype=np.int64)
+
+        idx = np.searchsorted(self._keys, keys)
+        idx[idx == len(self._keys)] = 0
+        found = self._keys[idx] == keys
+
+        return np.where(found, self._slots[idx], -1)
+
+    def _allocate(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Allocate the blocks with the given (unique) keys if needed and return their slots.
+        """
+        slots = self._find(keys)
+        new = slots < 0
+        numNew = int(np.count_nonzero(new))
+
+        if numNew:
+            # Grow the pools geometrically, so the reallocation cost is amortized over many frames
+            if self._count + numNew > len(self._tsdf):
+                capacity = max(2 * len(self._tsdf), self._count + numNew, 64)
+                grow = capacity - len(self._tsdf)
+                self._tsdf = np.concatenate([self._tsdf, np.ones((grow, self.blockSize ** 3), dtype=np.float32)])
+                self._weight = np.concatenate([self._weight, np.zeros((grow, self.blockSize ** 3), dtype=np.float32)])
+                self._color = np.concatenate([self._color, np.zeros((grow, self.blockSize ** 3, 3), dtype=np.float32)])
+
+            slots[new] = np.arange(self._count, self._count + numNew)
+            self._count += numNew
+
+            allKeys = np.concatenate([self._keys, keys[new]])
+            allSlots = np.concatenate([self._slots, slots[new]])
+            order = np.argsort(allKeys)
+            self._keys = allKeys[order]
+            self._slots = allSlots[order]
+
+        return slots
+
+    def integrate(
+            self,
+            depthMap: np.ndarray,
+            cameraMatrix: np.ndarray,
+            cameraPose: np.ndarray = None,
+            colorImg: np.ndarray = None,
+            maxDepth: float = None,
+    ) -> int:
+        """
+        Fuse a depth map into the volume. Only the blocks within the truncation distance of the observed surface are
+        allocated and updated.
+
+        :param np.ndarray depthMap: Depth map (H, W) in the same units as `voxelSize`. Pixels with depth <= 0 are ignored.
+        :param np.ndarray cameraMatrix: Intrinsic camera matrix (3, 3), e.g. `cameraMatrix` from `load_calibration`.
+        :param np.ndarray cameraPose: Camera to world transformation (4, 4). If None, the identity is used. Default is None.
+        :param np.ndarray colorImg: Color image (H, W, 3) in BGR (as loaded by OpenCV). If None, the colors are not updated. Default is None.
+        :param float maxDepth: Pixels with a larger depth are ignored. If None, all depths are used. Default is None.
+
+        :raises ValueError: Raises ValueError if:
+            - **`depthMap`** is not a 2D numpy array,
+            - **`cameraMatrix`** is not a 3x3 matrix or **`cameraPose`** is not a 4x4 matrix,
+            - **`colorImg`** does not match the size of the depth map.
+
+        :return: Number of blocks updated by this frame.
+        """
+        if not isinstance(depthMap, np.ndarray) or depthMap.ndim != 2:
+            raise ValueError(Fore.RED + "\nDepth map must be a 2D numpy array!\n")
+
+        cameraMatrix = np.asarray(cameraMatrix, dtype=np.float64)
+        cameraPose = np.eye(4) if cameraPose is None else np.asarray(cameraPose, dtype=np.float64)
+
+        if cameraMatrix.shape != (3, 3) or cameraPose.shape != (4, 4):
+            raise ValueError(Fore.RED + "\nCamera matrix must be a 3x3 matrix and camera pose a 4x4 matrix!\n")
+
+        h, w = depthMap.shape
+        if colorImg is not None and colorImg.shape[:2] != (h, w):
+            raise ValueError(Fore.RED + "\nColor image must have the same size as the depth map!\n")
+
+        depthMap = depthMap.astype(np.float32)
+        valid = np.isfinite(depthMap) & (depthMap > 0)
+        if maxDepth is not None:
+            valid &= depthMap <= maxDepth
+
+        if not np.any(valid):
+            return 0
+
+        fx, fy, cx, cy = cameraMatrix[0, 0], cameraMatrix[1, 1], cameraMatrix[0, 2], cameraMatrix[1, 2]
+        rotation, translation = cameraPose[:3, :3], cameraPose[:3, 3]
+
+        # Find the touched blocks - sample the rays of the valid pixels within the truncation band
+        v, u = np.nonzero(valid)
+        z = depthMap[v, u].astype(np.float64)
+        rays = np.stack([(u - cx) / fx, (v - cy) / fy, np.ones_like(z)], axis=1)
+
+        blockLength = self.blockSize * self.voxelSize
+        numSteps = int(np.ceil(4 * self.truncation / blockLength)) + 1
+        keys = []
+        for offset in np.linspace(-self.truncation, self.truncation, numSteps):
+            pointsWorld = (rays * (z + offset)[:, None]) @ rotation.T + translation
+            keys.append(np.unique(_pack_keys(np.floor(pointsWorld / blockLength))))
+
+        blockKeys = np.unique(np.concatenate(keys))
+        slots = self._allocate(blockKeys)
+        blockCoords = _unpack_keys(blockKeys)
+
+        colorImg = colorImg[..., ::-1].astype(np.float32) if colorImg is not None else None  # BGR -> RGB
+
+        for start in range(0, len(slots), self.batchBlocks):
+            batchSlots = slots[start:start + self.batchBlocks]
+            batchCoords = blockCoords[start:start + self.batchBlocks]
+
+            # World coordinates of all voxels of the batch (N * B^3, 3)
+            voxels = (batchCoords[:, None, :] * self.blockSize + self._local[None, :, :]).reshape(-1, 3)
+            pointsCamera = (voxels * self.voxelSize - translation) @ rotation
+
+            zc = pointsCamera[:, 2]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ui = np.round(pointsCamera[:, 0] / zc * fx + cx)
+                vi = np.round(pointsCamera[:, 1] / zc * fy + cy)
+
+            inside = (zc > 0) & (ui >= 0) & (ui < w) & (vi >= 0) & (vi < h)
+            idx = np.flatnonzero(inside)
+            ui = ui[idx].astype(np.intp)
+            vi = vi[idx].astype(np.intp)
+
+            observed = valid[vi, ui]
+            sdf = depthMap[vi, ui] - zc[idx]
+
+            # Update the voxels in front of the surface and up to the truncation distance behind it
+            update = observed & (sdf >= -self.truncation)
+            idx, ui, vi, sdf = idx[update], ui[update], vi[update], sdf[update]
+
+            flatSlots = batchSlots[idx // self.blockSize ** 3]
+            flatLocal = idx % self.blockSize ** 3
+
+            tsdf = np.minimum(1.0, sdf / self.truncation)
+            weight = self._weight[flatSlots, flatLocal]
+            newWeight = weight + 1
+
+            self._tsdf[flatSlots, flatLocal] = (self._tsdf[flatSlots, flatLocal] * weight + tsdf) / newWeight
+            if colorImg is not None:
+                self._color[flatSlots, flatLocal] = (self._color[flatSlots, flatLocal] * weight[:, None] + colorImg[vi, ui]) / newWeight[:, None]
+
+            self._weight[flatSlots, flatLocal] = np.minimum(newWeight, self.maxWeight)
+
+        return len(slots)
+
+    def integrate_disparity(
+            self,
+            disparityMap: np.ndarray,
+            baseline: float,
+            focalLength: float,
+            cameraMatrix: np.ndarray,
+            cameraPose: np.ndarray = None,
+            colorImg: np.ndarray = None,
+            doffs: float = 0.0,
+            aspect: float = 1000.0,
+            maxDepth: float = None,
+    ) -> int:
+        """
+        Convert a disparity map to a depth map with `disparity_to_depth_map` and fuse it into the volume (see `integrate`).
+
+        :param np.ndarray disparityMap: Disparity map.
+        :param float baseline: Baseline.
+        :param float focalLength: Focal length.
+        :param np.ndarray cameraMatrix: Intrinsic camera matrix (3, 3) of the (rectified) reference camera.
+        :param np.ndarray cameraPose: Camera to world transformation (4, 4). If None, the identity is used. Default is None.
+        :param np.ndarray colorImg: Color image (H, W, 3) in BGR. Default is None.
+        :param float doffs: Disparity offset. Default is 0.0.
+        :param float aspect: Aspect ratio. Default value is 1000 which returns the depth in meters.
+        :param float maxDepth: Pixels with a larger depth are ignored. Default is None.
+
+        :return: Number of blocks updated by this frame.
+        """
+        depthMap = disparity_to_depth_map(disparityMap, baseline, focalLength, doffs, aspect)
+
+        return self.integrate(depthMap, cameraMatrix, cameraPose, colorImg, maxDepth)
+
+    def _padded_blocks(
+            self,
+            slots: np.ndarray,
+            blockCoords: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        TSDF, weights and colors of the given blocks with one extra voxel layer taken from the +x, +y, +z neighbours,
+        shape (N, B + 1, B + 1, B + 1), so the cells between neighbouring blocks are covered exactly once.
+        """
+        B = self.blockSize
+        n = len(slots)
+
+        tsdf = np.ones((n, B + 1, B + 1, B + 1), dtype=np.float32)
+        weight = np.zeros((n, B + 1, B + 1, B + 1), dtype=np.float32)
+        color = np.zeros((n, B + 1, B + 1, B + 1, 3), dtype=np.float32)
+
+        for dx in (0, 1):
+            for dy in (0, 1):
+                for dz in (0, 1):
+                    if dx or dy or dz:
+                        neighbours = self._find(_pack_keys(blockCoords + (dx, dy, dz)))
+                        has = neighbours >= 0
+                        rows, src = np.flatnonzero(has), neighbours[has]
+                    else:
+                        rows, src = np.arange(n), slots
+
+                    # Own block fills [:B], the neighbour contributes its first layer along the shifted axes
+                    dst = tuple(B if d else slice(0, B) for d in (dx, dy, dz))
+                    sel = tuple(0 if d else slice(None) for d in (dx, dy, dz))
+
+                    tsdf[(rows,) + dst] = self._tsdf[src].reshape(-1, B, B, B)[(slice(None),) + sel]
+                    weight[(rows,) + dst] = self._weight[src].reshape(-1, B, B, B)[(slice(None),) + sel]
+                    color[(rows,) + dst] = self._color[src].reshape(-1, B, B, B, 3)[(slice(None),) + sel]
+
+        return tsdf, weight, color
+
+    def _batches(self):
+        """
+        Yield `(blockCoords, tsdf, weight, color)` of the allocated blocks in batches (padded, see `_padded_blocks`).
+        """
+        blockCoords = _unpack_keys(self._keys)
+
+        for start in range(0, len(self._keys), self.batchBlocks):
+            coords = blockCoords[start:start + self.batchBlocks]
+            yield (coords,) + self._padded_blocks(self._slots[start:start + self.batchBlocks], coords)
+
+    def extract_point_cloud(
+            self,
+            minWeight: float = 1.0
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Extract the fused surface as a point cloud - one point per zero crossing of the TSDF along the x, y and z voxel
+        edges (linearly interpolated). Crossings between the truncated values (a jump of more than half of the
+        truncation band between neighbouring voxels, e.g. at object silhouettes) are skipped.
+
+        :param float minWeight: Minimal weight of both voxels of an edge. Default is 1.0.
+
+        :raises RuntimeError: Raises RuntimeError if the volume does not contain any surface.
+
+        :return: A tuple containing the vertices (float32) and colors (uint8, RGB) - the same format as `create_color_point_cloud`.
+        """
+        B = self.blockSize
+        outPoints, outColors = [], []
+
+        for coords, tsdf, weight, color in self._batches():
+            for axis in range(3):
+                # Voxel and its +1 neighbour along the axis (only the voxels owned by the block as the first endpoint)
+                first = (slice(None), slice(0, B), slice(0, B), slice(0, B))
+                second = tuple(slice(1, B + 1) if i == axis + 1 else s for i, s in enumerate(first))
+
+                t0, t1 = tsdf[first], tsdf[second]
+                crossing = (
+                        (weight[first] >= minWeight) & (weight[second] >= minWeight)
+                        & ((t0 >= 0) != (t1 >= 0)) & (np.abs(t0 - t1) <= 1.0)
+                )
+
+                blockIdx, x, y, z = np.nonzero(crossing)
+                t0, t1 = t0[crossing], t1[crossing]
+                alpha = t0 / (t0 - t1)
+
+                voxel = (coords[blockIdx] * B + np.stack([x, y, z], axis=1)).astype(np.float64)
+                voxel[:, axis] += alpha
+                outPoints.append((voxel * self.voxelSize).astype(np.float32))
+
+                c0 = color[first][crossing]
+                c1 = color[second][crossing]
+                outColors.append(np.clip(c0 + (c1 - c0) * alpha[:, None], 0, 255).astype(np.uint8))
+
+        verts = np.concatenate(outPoints) if outPoints else np.empty((0, 3), dtype=np.float32)
+        colors = np.concatenate(outColors) if outColors else np.empty((0, 3), dtype=np.uint8)
+
+        if len(verts) == 0:
+            raise RuntimeError(Fore.RED + "\nNo surface found in the volume!\n")
+
+        return verts, colors
+
+    def extract_mesh(
+            self,
+            minWeight: float = 1.0
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Extract the fused surface as a triangle mesh with marching cubes (`skimage.measure.marching_cubes`), run block by
+        block on the padded blocks, so the mesh is continuous across the block boundaries. The vertices shared by
+        neighbouring blocks are merged.
+
+        :param float minWeight: Minimal weight of the voxels used by marching cubes. Default is 1.0.
+
+        :raises RuntimeError: Raises RuntimeError if the volume does not contain any surface.
+
+        :return: A tuple containing the vertices (float32), colors (uint8, RGB) and faces (int32, M x 3) - can be saved with `write_ply_file`.
+        """
+        outPoints, outColors, outFaces = [], [], []
+        numVerts = 0
+
+        B = self.blockSize
+
+        for coords, tsdf, weight, color in self._batches():
+            # A cube (anchored at its lowest corner) is used only if all 8 corners are observed and it does not span
+            # a jump between the truncated values (same rule as in `extract_point_cloud`)
+            corners = [
+                (slice(None), slice(dx, dx + B), slice(dy, dy + B), slice(dz, dz + B))
+                for dx in (0, 1) for dy in (0, 1) for dz in (0, 1)
+            ]
+            cubeObserved = np.all([weight[c] >= minWeight for c in corners], axis=0)
+            cubeMin = np.min([tsdf[c] for c in corners], axis=0)
+            cubeMax = np.max([tsdf[c] for c in corners], axis=0)
+            cubeValid = cubeObserved & (cubeMin < 0) & (cubeMax >= 0) & (cubeMax - cubeMin <= 1.0)
+
+            mask = np.zeros(tsdf.shape, dtype=bool)
+            mask[:, :B, :B, :B] = cubeValid
+
+            for i in np.flatnonzero(np.any(cubeValid, axis=(1, 2, 3))):
+                try:
+                    verts, faces, _, _ = marching_cubes(tsdf[i], level=0.0, mask=mask[i], gradient_direction="ascent")
+                except (ValueError, RuntimeError):
+                    continue
+
+                if len(faces) == 0:
+                    continue
+
+                nearest = np.clip(np.round(verts).astype(np.intp), 0, B)
+                outColors.append(np.clip(color[i][nearest[:, 0], nearest[:, 1], nearest[:, 2]], 0, 255).astype(np.uint8))
+                outPoints.append((coords[i] * B + verts) * self.voxelSize)
+                outFaces.append(faces + numVerts)
+                numVerts += len(verts)
+
+        if numVerts == 0:
+            raise RuntimeError(Fore.RED + "\nNo surface found in the volume!\n")
+
+        verts = np.concatenate(outPoints)
+        colors = np.concatenate(outColors)
+        faces = np.concatenate(outFaces)
+
+        # Merge the duplicated vertices on the block boundaries
+        quantized = np.round(verts / (self.voxelSize * 1e-3)).astype(np.int64)
+        _, first, inverse = np.unique(quantized, axis=0, return_index=True, return_inverse=True)
+        faces = inverse.reshape(-1)[faces]
+
+        # Drop the triangles that collapsed after merging
+        keep = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 0] != faces[:, 2])
+
+        return verts[first].astype(np.float32), colors[first], faces[keep].astype(np.int32)
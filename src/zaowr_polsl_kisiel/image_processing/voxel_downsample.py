@@ -0,0 +1,94 @@
+import numpy as np
+from colorama import Fore, init as colorama_init
+
+colorama_init(autoreset=True)
+
+
+def _voxel_keys(
+        verts: np.ndarray,
+        voxelSize: float,
+        padding: int = 0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Quantize the vertices to a voxel grid and hash the integer voxel coordinates into a single int64 key
+    (`(ix * ny + iy) * nz + iz`), so the voxels can be grouped with a 1D `np.unique` instead of a much slower `axis=0` one.
+
+    :param np.ndarray verts: Vertices (N, 3), must be finite.
+    :param float voxelSize: Edge length of a voxel.
+    :param int padding: Number of extra voxels reserved on each side of the grid (so that neighbouring voxels of the
+        boundary voxels also have valid keys).
+
+    :return: Keys of the vertices (N,), integer voxel coordinates of the vertices (N, 3) and the grid dimensions (3,).
+    """
+    voxelCoords = np.floor(verts / voxelSize).astype(np.int64)
+    voxelCoords -= voxelCoords.min(axis=0) - padding
+    dims = voxelCoords.max(axis=0) + 1 + padding
+
+    if np.prod(dims.astype(np.float64)) >= np.iinfo(np.int64).max:
+        raise ValueError(Fore.RED + "\n`voxelSize` is too small for the extent of the point cloud!\n")
+
+    keys = (voxelCoords[:, 0] * dims[1] + voxelCoords[:, 1]) * dims[2] + voxelCoords[:, 2]
+
+    return keys, voxelCoords, dims
+
+
+def voxel_downsample(
+        verts: np.ndarray,
+        colors: np.ndarray,
+        voxelSize: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample a point cloud (e.g. created with `create_color_point_cloud`) using a voxel grid. All points falling into the
+    same voxel are replaced by a single point with their average position and average color.
+
+    The function is fully vectorized - voxel coordinates are hashed into a single integer key, grouped with `np.unique`
+    and averaged with `np.bincount`. Points with non-finite coordinates are discarded.
+
+    :param np.ndarray verts: Vertices of the point cloud (N, 3).
+    :param np.ndarray colors: Colors of the vertices (N, 3).
+    :param float voxelSize: Edge length of a voxel (in the same units as the vertices).
+
+    :raises TypeError: Raises TypeError if:
+        - **`verts`** or **`colors`** is not a numpy array,
+        - **`voxelSize`** is not a float.
+
+    :raises ValueError: Raises ValueError if:
+        - **`voxelSize`** is not positive or is too small for the extent of the point cloud,
+        - number of vertices and colors differs.
+
+    :raises RuntimeError: Raises RuntimeError if the point cloud does not contain any finite points.
+
+    :return: A tuple containing the downsampled vertices (float32) and colors (uint8).
+    """
+    if not isinstance(verts, np.ndarray) or not isinstance(colors, np.ndarray):
+        raise TypeError(Fore.RED + "\nVertices and colors must be numpy arrays!\n")
+
+    if not isinstance(voxelSize, float):
+        raise TypeError(Fore.RED + "\nVoxel size must be a float!\n")
+
+    if voxelSize <= 0:
+        raise ValueError(Fore.RED + "\nVoxel size must be positive!\n")
+
+    verts = verts.reshape(-1, 3)
+    colors = colors.reshape(-1, 3)
+
+    if len(verts) != len(colors):
+        raise ValueError(Fore.RED + f"\nNumber of vertices ({len(verts)}) and colors ({len(colors)}) must be equal!\n")
+
+    finite = np.isfinite(verts).all(axis=1)
+    verts = verts[finite]
+    colors = colors[finite]
+
+    if len(verts) == 0:
+        raise RuntimeError(Fore.RED + "\nNo points found!\n")
+
+    keys, _, _ = _voxel_keys(verts, voxelSize)
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+
+    outVerts = np.empty((len(counts), 3), dtype=np.float32)
+    outColors = np.empty((len(counts), 3), dtype=np.uint8)
+    for axis in range(3):
+        outVerts[:, axis] = np.bincount(inverse, weights=verts[:, axis], minlength=len(counts)) / counts
+        outColors[:, axis] = np.rint(np.bincount(inverse, weights=colors[:, axis], minlength=len(counts)) / counts)
+
+    return outVerts, outColors
@@ -23,6 +23,12 @@ Functions:
 
 - `configure_qt_platform`: Configures the `QT_QPA_PLATFORM` environment variable to 'xcb' on Linux (suppress warnings about Wayland plugins).
 
+Classes:
+
+- `RegionDepthStatistics`: Mean, standard deviation and approximate median of a depth (or disparity) map over thousands of rectangles in O(1) each (summed-area tables).
+
+- `PointCloudIndex`: Spatial index (uniform grid) over a point cloud with vectorized radius, k-nearest and box queries.
+
 Usage:
     - Use this module for miscellaneous tools that enhance functionality.
 """
@@ -38,6 +44,8 @@ __all__ = [
     "get_image_points",
     "get_map_value_for_points",
     "configure_qt_platform",
+    "RegionDepthStatistics",
+    "PointCloudIndex",
 ]
 
 from .find_aruco_dict import find_aruco_dict # find aruco dictionary if we don't know it
@@ -49,4 +57,6 @@ from .display_img_plt import display_img_plt # display the image using matplotli
 from .compare_images import compare_images # compare multiple images
 from .get_image_points import get_image_points # get points form photo using mouse click (pixel coordinates)
 from .get_map_value_for_points import get_map_value_for_points # get map value for points (e.g. disparity, depth)
-from .configure_qt_platform import configure_qt_platform # configure the `QT_QPA_PLATFORM` environment variable to 'xcb' on Linux (suppress warnings about Wayland plugins)
\ No newline at end of file
+from .configure_qt_platform import configure_qt_platform # configure the `QT_QPA_PLATFORM` environment variable to 'xcb' on Linux (suppress warnings about Wayland plugins)
+from .region_depth_statistics import RegionDepthStatistics # region statistics (mean, std, median) of a depth map using summed-area tables
+from .point_cloud_index import PointCloudIndex # spatial index over a point cloud (radius, k-nearest and box queries)
\ No newline at end of file
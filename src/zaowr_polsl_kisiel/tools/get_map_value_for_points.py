@@ -3,26 +3,106 @@ from colorama import Fore, init as colorama_init
 
 colorama_init(autoreset=True)
 
+def _sample_map(
+        mapPoints: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+        interpolation: str
+) -> np.ndarray:
+    """
+    Sample the map at the (subpixel) coordinates with a single fancy-index per neighbour. Points outside the map get NaN.
+    """
+    h, w = mapPoints.shape[:2]
+    values = np.full((len(x),) + mapPoints.shape[2:], np.nan, dtype=np.float64)
+
+    if interpolation == "nearest":
+        xi = np.round(x)
+        yi = np.round(y)
+        inside = (xi >= 0) & (xi < w) & (yi >= 0) & (yi < h)
+        values[inside] = mapPoints[yi[inside].astype(np.intp), xi[inside].astype(np.intp)]
+        return values
+
+    inside = (x >= 0) & (x <= w - 1) & (y >= 0) & (y <= h - 1)
+    x, y = x[inside], y[inside]
+
+    # Top-left neighbour (clamped, so points on the last row / column still have 4 neighbours)
+    x0 = np.minimum(np.floor(x), max(w - 2, 0)).astype(np.intp)
+    y0 = np.minimum(np.floor(y), max(h - 2, 0)).astype(np.intp)
+    x1 = np.minimum(x0 + 1, w - 1)
+    y1 = np.minimum(y0 + 1, h - 1)
+
+    fx = (x - x0).reshape((-1,) + (1,) * (mapPoints.ndim - 2))
+    fy = (y - y0).reshape((-1,) + (1,) * (mapPoints.ndim - 2))
+
+    top = mapPoints[y0, x0] * (1 - fx) + mapPoints[y0, x1] * fx
+    bottom = mapPoints[y1, x0] * (1 - fx) + mapPoints[y1, x1] * fx
+    values[inside] = top * (1 - fy) + bottom * fy
+
+    return values
+
+
 def get_map_value_for_points(
         imgPoints: np.ndarray,
         mapPoints: np.ndarray,
-        mapType: str = "disparity"
-) -> list[tuple[str, int, int, np.ndarray]]:
+        mapType: str = "disparity",
+        batch: bool = False,
+        interpolation: str = "nearest",
+) -> list[tuple[str, int, int, np.ndarray]] | np.ndarray:
     """
     Get the value of the map at the specified image points.
 
+    By default, the points are processed one by one - each value is printed and the coordinates are rounded to the
+    nearest pixel (points outside the map are skipped).
+
+    In the batch mode (`batch=True`) all values are gathered at once with vectorized indexing and nothing is printed,
+    so even 100k (e.g. tracked) points per frame are a single vector operation. The points can be sampled at the nearest
+    pixel or with bilinear (subpixel) interpolation, points outside the map get NaN and a structured array with the
+    fields **index** (1-based, like `P1`, `P2`, ...), **x**, **y** and **value** is returned instead of a list of tuples.
+
     :param np.ndarray imgPoints: The image points.
     :param np.ndarray mapPoints: The map points.
     :param str mapType: The type of map. Can be "disparity" or "depth". Default is "disparity".
+    :param bool batch: Use the vectorized batch mode (returns a structured array). Default is False.
+    :param str interpolation: Sampling in the batch mode - **"nearest"** or **"bilinear"** (subpixel). Default is "nearest".
 
     :raises TypeError: Raises TypeError if `imgPoints` or `mapPoints` is not a numpy array.
 
-    :raises ValueError: Raises ValueError if `mapType` is not "disparity" or "depth".
+    :raises ValueError: Raises ValueError if:
+        - `mapType` is not "disparity" or "depth",
+        - `interpolation` is not "nearest" or "bilinear",
+        - `imgPoints` is not an (N, 2) array in the batch mode.
 
     :raises RuntimeError: Raises RuntimeError if no points are found or `results` is None after the loop.
 
-    :return: A list of tuples containing the point index, X and Y coordinates, and the map value.
+    :return: A list of tuples containing the point index, X and Y coordinates, and the map value (or a structured array with the fields `index`, `x`, `y` and `value` in the batch mode).
     """
+    if batch:
+        if not isinstance(mapPoints, np.ndarray):
+            raise TypeError(Fore.RED + "\nMap points must be a numpy array!\n")
+
+        if mapType not in ("disparity", "depth"):
+            raise ValueError(Fore.RED + f"\nInvalid map type: {mapType}\n")
+
+        if interpolation not in ("nearest", "bilinear"):
+            raise ValueError(Fore.RED + f"\nInvalid interpolation: {interpolation}\n")
+
+        imgPoints = np.asarray(imgPoints, dtype=np.float64)
+        if imgPoints.ndim != 2 or imgPoints.shape[1] != 2:
+            raise ValueError(Fore.RED + "\nImage points must be an (N, 2) array of (x, y) coordinates!\n")
+
+        results = np.empty(len(imgPoints), dtype=[
+            ("index", np.int64),
+            ("x", np.float64),
+            ("y", np.float64),
+            ("value", np.float64, mapPoints.shape[2:]),
+        ])
+        results["index"] = np.arange(1, len(imgPoints) + 1)
+        results["x"] = imgPoints[:, 0]
+        results["y"] = imgPoints[:, 1]
+        results["value"] = _sample_map(mapPoints, imgPoints[:, 0], imgPoints[:, 1], interpolation)
+
+        return results
+
     results = []
 
     if not isinstance(imgPoints, np.ndarray):
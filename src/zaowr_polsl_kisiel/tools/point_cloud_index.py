@@ -0,0 +1,318 @@
+import numpy as np
+from colorama import Fore, init as colorama_init
+
+colorama_init(autoreset=True)
+
+
+class PointCloudIndex:
+    """
+    Spatial index (uniform grid) over a point cloud, e.g. the vertices returned by `create_color_point_cloud`.
+
+    The points are bucketed into cubic cells of edge `cellSize` and sorted by cell, so every occupied cell is a contiguous
+    slice of the sorted points. Only the occupied cells are stored (a sorted array of int64 cell keys with their start and
+    count), which keeps the index compact - the sorted points plus a few integers per occupied cell.
+
+    All queries are vectorized over batches of query points - candidate cells are looked up with `np.searchsorted`,
+    candidate points are expanded with `np.repeat` and the distances are computed for the whole batch at once.
+
+    - `query_radius` - indices of all points within a radius of each query point,
+    - `query_knn` - distances and indices of the k nearest points of each query point,
+    - `query_box` - indices of all points inside axis-aligned boxes.
+
+    Returned indices refer to the rows of the `verts` array passed to the constructor (points with non-finite
+    coordinates are not indexed).
+    """
+
+    def __init__(
+            self,
+            verts: np.ndarray,
+            cellSize: float = None,
+            batchSize: int = 4096,
+    ) -> None:
+        """
+        Build the index.
+
+        :param np.ndarray verts: Vertices of the point cloud (N, 3).
+        :param float cellSize: Edge length of a grid cell. Ideally close to the typical query radius. If None, it is chosen so that an occupied cell contains ~8 points on average. Default is None.
+        :param int batchSize: Number of query points processed at once (limits the memory used by the queries). Default is 4096.
+
+        :raises TypeError: Raises TypeError if **`verts`** is not a numpy array.
+        :raises ValueError: Raises ValueError if:
+            - **`verts`** does not contain any finite points,
+            - **`cellSize`** is not positive,
+            - **`batchSize`** is not a positive integer.
+        """
+        if not isinstance(verts, np.ndarray):
+            raise TypeError(Fore.RED + "\nVertices must be a numpy array!\n")
+
+        if not isinstance(batchSize, int) or batchSize <= 0:
+            raise ValueError(Fore.RED + "\n`batchSize` must be a positive integer!\n")
+
+        verts = verts.reshape(-1, 3)
+        ids = np.flatnonzero(np.isfinite(verts).all(axis=1))
+        points = verts[ids].astype(np.float64)
+
+        if len(points) == 0:
+            raise ValueError(Fore.RED + "\nPoint cloud does not contain any finite points!\n")
+
+        self.origin = points.min(axis=0)
+        extent = points.max(axis=0) - self.origin
+
+        if cellSize is None:
+            # Start with ~8 points per cell for points filling the bounding box and refine the estimate with the actual
+            # occupancy (point clouds from depth maps lie on surfaces, so most of the box is empty)
+            volume = max(np.prod(np.maximum(extent, np.finfo(np.float32).eps)), np.finfo(np.float64).tiny)
+            cellSize = float(np.cbrt(8.0 * volume / len(points)))
+            for _ in range(3):
+                coords = np.floor((points - self.origin) / cellSize).astype(np.int64)
+                dims = coords.max(axis=0) + 1
+                occupied = len(np.unique((coords[:, 0] * dims[1] + coords[:, 1]) * dims[2] + coords[:, 2]))
+                cellSize *= np.sqrt(8.0 / (len(points) / occupied))
+
+        if cellSize <= 0:
+            raise ValueError(Fore.RED + "\n`cellSize` must be positive!\n")
+
+        self.cellSize = float(cellSize)
+        self.batchSize = batchSize
+        self.dims = (np.floor(extent / self.cellSize).astype(np.int64) + 1)
+
+        if np.prod(self.dims.astype(np.float64)) >= np.iinfo(np.int64).max:
+            raise ValueError(Fore.RED + "\n`cellSize` is too small for the extent of the point cloud!\n")
+
+        keys = self._keys(self._cell_coords(points))
+        order = np.argsort(keys, kind="stable")
+
+        self._points = points[order]
+        self._ids = ids[order]
+        self._cellKeys, self._cellStart, self._cellCount = np.unique(keys[order], return_index=True, return_counts=True)
+
+        # Integer coordinates of the occupied cells (decoded from the keys)
+        self._cellCoords = np.stack([
+            self._cellKeys // (self.dims[1] * self.dims[2]),
+            (self._cellKeys // self.dims[2]) % self.dims[1],
+            self._cellKeys % self.dims[2],
+        ], axis=1)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell_coords(self, points: np.ndarray) -> np.ndarray:
+        return np.floor((points - self.origin) / self.cellSize).astype(np.int64)
+
+    def _keys(self, cellCoords: np.ndarray) -> np.ndarray:
+        return (cellCoords[..., 0] * self.dims[1] + cellCoords[..., 1]) * self.dims[2] + cellCoords[..., 2]
+
+    def _gather(
+            self,
+            cellCoords: np.ndarray,
+            ring: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Collect all indexed points from the cells within `ring` cells (Chebyshev distance) of every query cell.
+
+        :return: Query index and sorted point index of every (query, candidate point) pair, grouped by query.
+        """
+        if (2 * ring + 1) ** 3 <= len(self._cellKeys):
+            # Look up every neighbouring cell of every query cell
+            r = np.arange(-ring, ring + 1)
+            offsets = np.stack(np.meshgrid(r, r, r, indexing="ij"), axis=-1).reshape(-1, 3)
+
+            neighbourCoords = cellCoords[:, None, :] + offsets[None, :, :]
+            inside = np.all((neighbourCoords >= 0) & (neighbourCoords < self.dims), axis=-1)
+            neighbourKeys = self._keys(neighbourCoords)
+
+            idx = np.searchsorted(self._cellKeys, neighbourKeys)
+            idx[idx == len(self._cellKeys)] = 0
+            found = inside & (self._cellKeys[idx] == neighbourKeys)
+
+            queryIdx = np.nonzero(found)[0]
+            cells = idx[found]
+
+        else:
+            # The ring contains more cells than there are occupied cells - test the occupied cells directly
+            # (in chunks, so that the (queries x cells) mask stays small)
+            chunk = max(1, 4_000_000 // len(self._cellKeys))
+            queryIdx, cells = [], []
+            for start in range(0, len(cellCoords), chunk):
+                near = np.all(np.abs(self._cellCoords[None, :, :] - cellCoords[start:start + chunk, None, :]) <= ring, axis=-1)
+                q, c = np.nonzero(near)
+                queryIdx.append(q + start)
+                cells.append(c)
+
+            queryIdx = np.concatenate(queryIdx)
+            cells = np.concatenate(cells)
+
+        starts = self._cellStart[cells]
+        counts = self._cellCount[cells]
+
+        # Expand every (query, cell) pair to (query, point) pairs
+        total = counts.sum()
+        pairQuery = np.repeat(queryIdx, counts)
+        pairPoint = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+
+        return pairQuery, pairPoint
+
+    def _validate_query(self, points: np.ndarray) -> np.ndarray:
+        if not isinstance(points, np.ndarray):
+            raise TypeError(Fore.RED + "\nQuery points must be a numpy array!\n")
+
+        points = points.reshape(-1, 3).astype(np.float64)
+
+        if not np.isfinite(points).all():
+            raise ValueError(Fore.RED + "\nQuery points must be finite!\n")
+
+        return points
+
+    def query_radius(
+            self,
+            points: np.ndarray,
+            radius: float,
+            sortResults: bool = False,
+    ) -> list[np.ndarray]:
+        """
+        Find all points within `radius` of each query point.
+
+        :param np.ndarray points: Query points (M, 3) or a single point (3,).
+        :param float radius: Search radius.
+        :param bool sortResults: If True, the indices of each query are sorted by distance. Default is False.
+
+        :raises TypeError: Raises TypeError if **`points`** is not a numpy array.
+        :raises ValueError: Raises ValueError if **`radius`** is not positive or **`points`** are not finite.
+
+        :return: List (one entry per query point) of arrays with the indices of the points within the radius.
+        """
+        points = self._validate_query(points)
+
+        if radius <= 0:
+            raise ValueError(Fore.RED + "\n`radius` must be positive!\n")
+
+        ring = int(np.ceil(radius / self.cellSize))
+        results = []
+
+        for batchStart in range(0, len(points), self.batchSize):
+            batch = points[batchStart:batchStart + self.batchSize]
+            pairQuery, pairPoint = self._gather(self._cell_coords(batch), ring)
+
+            dist = np.linalg.norm(self._points[pairPoint] - batch[pairQuery], axis=1)
+            within = dist <= radius
+            pairQuery, pairPoint, dist = pairQuery[within], pairPoint[within], dist[within]
+
+            if sortResults:
+                order = np.lexsort((dist, pairQuery))
+                pairQuery, pairPoint = pairQuery[order], pairPoint[order]
+
+            splits = np.cumsum(np.bincount(pairQuery, minlength=len(batch)))[:-1]
+            results.extend(np.split(self._ids[pairPoint], splits))
+
+        return results
+
+    def query_knn(
+            self,
+            points: np.ndarray,
+            k: int = 1,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the `k` nearest points of each query point.
+
+        The search starts in the neighbouring cells and the search ring is doubled only for the query points which do not
+        have `k` points within the guaranteed radius yet, so the result is exact.
+
+        :param np.ndarray points: Query points (M, 3) or a single point (3,).
+        :param int k: Number of nearest neighbours. Default is 1.
+
+        :raises TypeError: Raises TypeError if **`points`** is not a numpy array.
+        :raises ValueError: Raises ValueError if **`k`** is not a positive integer or **`points`** are not finite.
+
+        :return: Distances (M, k) and indices (M, k) of the nearest points sorted by distance. If the cloud has fewer than `k` points, the missing entries are `inf` and `-1`.
+        """
+        points = self._validate_query(points)
+
+        if not isinstance(k, int) or k <= 0:
+            raise ValueError(Fore.RED + "\n`k` must be a positive integer!\n")
+
+        distances = np.full((len(points), k), np.inf)
+        indices = np.full((len(points), k), -1, dtype=np.int64)
+
+        # Ring which covers the whole grid from the cell of each query point
+        queryCells = self._cell_coords(points)
+        maxRing = np.maximum(np.abs(queryCells), np.abs(self.dims - 1 - queryCells)).max(axis=1)
+
+        for batchStart in range(0, len(points), self.batchSize):
+            remaining = np.arange(batchStart, min(batchStart + self.batchSize, len(points)))
+            ring = 1
+
+            while len(remaining):
+                batch = points[remaining]
+                pairQuery, pairPoint = self._gather(self._cell_coords(batch), ring)
+                dist = np.linalg.norm(self._points[pairPoint] - batch[pairQuery], axis=1)
+
+                # Sort the candidates of every query by distance and keep the first k
+                order = np.lexsort((dist, pairQuery))
+                pairQuery, pairPoint, dist = pairQuery[order], pairPoint[order], dist[order]
+                firstOfQuery = np.searchsorted(pairQuery, np.arange(len(batch)))
+                rank = np.arange(len(pairQuery)) - firstOfQuery[pairQuery]
+
+                # Points within `ring` cells are guaranteed to contain every point closer than ring * cellSize
+                guaranteed = np.bincount(pairQuery[dist <= ring * self.cellSize], minlength=len(batch))
+                done = (guaranteed >= k) | (ring >= maxRing[remaining])
+
+                take = (rank < k) & done[pairQuery]
+                rows = remaining[pairQuery[take]]
+                distances[rows, rank[take]] = dist[take]
+                indices[rows, rank[take]] = self._ids[pairPoint[take]]
+
+                remaining = remaining[~done]
+                ring *= 2
+
+        return distances, indices
+
+    def query_box(
+            self,
+            minCorners: np.ndarray,
+            maxCorners: np.ndarray,
+    ) -> list[np.ndarray]:
+        """
+        Find all points inside axis-aligned boxes (`minCorner <= point <= maxCorner`).
+
+        :param np.ndarray minCorners: Minimal corners of the boxes (M, 3) or of a single box (3,).
+        :param np.ndarray maxCorners: Maximal corners of the boxes (M, 3) or of a single box (3,).
+
+        :raises TypeError: Raises TypeError if **`minCorners`** or **`maxCorners`** is not a numpy array.
+        :raises ValueError: Raises ValueError if the number of min and max corners differs or the corners are not finite.
+
+        :return: List (one entry per box) of arrays with the indices of the points inside the box.
+        """
+        minCorners = self._validate_query(minCorners)
+        maxCorners = self._validate_query(maxCorners)
+
+        if len(minCorners) != len(maxCorners):
+            raise ValueError(Fore.RED + "\nNumber of min and max corners must be equal!\n")
+
+        lo = self._cell_coords(minCorners)
+        hi = self._cell_coords(maxCorners)
+
+        # The cell ranges of all boxes are tested against the occupied cells at once
+        # (in chunks, so that the (boxes x cells) mask stays small)
+        chunk = max(1, min(self.batchSize, 4_000_000 // len(self._cellKeys)))
+        results = []
+
+        for start in range(0, len(minCorners), chunk):
+            boxLo, boxHi = lo[start:start + chunk, None, :], hi[start:start + chunk, None, :]
+            overlap = np.all((self._cellCoords[None, :, :] >= boxLo) & (self._cellCoords[None, :, :] <= boxHi), axis=-1)
+            boxIdx, cells = np.nonzero(overlap)
+
+            # Expand every (box, cell) pair to (box, point) pairs
+            counts = self._cellCount[cells]
+            pairBox = np.repeat(boxIdx, counts)
+            pairPoint = np.repeat(self._cellStart[cells] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+            candidatePoints = self._points[pairPoint]
+            inside = np.all(
+                (candidatePoints >= minCorners[start + pairBox]) & (candidatePoints <= maxCorners[start + pairBox]), axis=1
+            )
+            pairBox, pairPoint = pairBox[inside], pairPoint[inside]
+
+            splits = np.cumsum(np.bincount(pairBox, minlength=len(overlap)))[:-1]
+            results.extend(np.split(self._ids[pairPoint], splits))
+
+        return results
@@ -0,0 +1,254 @@
+import cv2 as cv
+import numpy as np
+from colorama import Fore, init as colorama_init
+
+colorama_init(autoreset=True)
+
+
+class RegionDepthStatistics:
+    """
+    Statistics of a depth (or disparity) map over rectangular regions, computed from summed-area tables (integral images).
+
+    Reading a single pixel of a depth map (like `get_map_value_for_points`) is noisy - a small window around the point
+    is a much more robust measurement. The tables of the depth, squared depth and valid pixel count are built once per
+    map (`cv2.integral2`, `cv2.integral`), after which the sum over any rectangle needs only 4 lookups, so every query
+    is O(1) regardless of the rectangle size. All queries are vectorized over arrays of rectangles.
+
+    - `count`, `mean`, `std` - exact statistics of the valid pixels in each rectangle,
+    - `median` - approximate median from an integral histogram (only if `histogramBins` > 0),
+    - `query` - all of the above at once,
+    - `query_points` - the same for square windows centered at points (e.g. from `get_image_points`).
+
+    Rectangles are given as `(x, y, width, height)` rows (OpenCV convention) and are clipped to the map. Rectangles
+    without valid pixels get NaN.
+    """
+
+    def __init__(
+            self,
+            depthMap: np.ndarray,
+            validMask: np.ndarray = None,
+            histogramBins: int = 0,
+            depthRange: tuple[float, float] = None,
+    ) -> None:
+        """
+        Build the summed-area tables.
+
+        :param np.ndarray depthMap: Depth (or disparity) map (H, W).
+        :param np.ndarray validMask: Mask of the valid pixels (H, W). If None, finite pixels with value > 0 are valid. Default is None.
+        :param int histogramBins: Number of bins of the integral histogram used by `median`. 0 disables the median. The histogram takes (H + 1) * (W + 1) * bins * 4 bytes, building it needs about twice as much. Default is 0.
+        :param tuple[float, float] depthRange: Range of the histogram bins. If None, the range of the valid values is used. Default is None.
+
+        :raises TypeError: Raises TypeError if **`depthMap`** or **`validMask`** is not a numpy array.
+        :raises ValueError: Raises ValueError if:
+            - **`depthMap`** is not a 2D array or **`validMask`** has a different shape,
+            - **`histogramBins`** is not a non-negative integer,
+            - **`depthRange`** is empty.
+        """
+        if not isinstance(depthMap, np.ndarray) or (validMask is not None and not isinstance(validMask, np.ndarray)):
+            raise TypeError(Fore.RED + "\nDepth map and valid mask must be numpy arrays!\n")
+
+        if depthMap.ndim != 2 or (validMask is not None and validMask.shape != depthMap.shape):
+            raise ValueError(Fore.RED + "\nDepth map must be a 2D array and the valid mask must have the same shape!\n")
+
+        if not isinstance(histogramBins, int) or histogramBins < 0:
+            raise ValueError(Fore.RED + "\n`histogramBins` must be a non-negative integer!\n")
+
+        depth = depthMap.astype(np.float64)
+        valid = np.isfinite(depth) & (depth > 0) if validMask is None else validMask.astype(bool) & np.isfinite(depth)
+        depth[~valid] = 0.0
+
+        self.shape = depth.shape
+        self._sum, self._sqSum = cv.integral2(depth, sdepth=cv.CV_64F, sqdepth=cv.CV_64F)
+        self._count = cv.integral(valid.astype(np.uint8), sdepth=cv.CV_32S)
+
+        self._histogram = None
+        if histogramBins > 0:
+            if depthRange is None:
+                depthRange = (depth[valid].min(), depth[valid].max()) if np.any(valid) else (0.0, 1.0)
+
+            low, high = float(depthRange[0]), float(depthRange[1])
+            if high < low:
+                raise ValueError(Fore.RED + "\n`depthRange` must be a (min, max) tuple!\n")
+
+            if high == low:
+                high = low + 1.0
+
+            self._binEdges = np.linspace(low, high, histogramBins + 1)
+
+            # Integral histogram (H + 1, W + 1, bins) - one summed-area table of the pixel count per bin
+            bins = np.clip(((depth - low) / (high - low) * histogramBins).astype(np.intp), 0, histogramBins - 1)
+            oneHot = np.zeros(self.shape + (histogramBins,), dtype=np.int32)
+            rows, cols = np.nonzero(valid)
+            oneHot[rows, cols, bins[rows, cols]] = 1
+
+            self._histogram = np.zeros((self.shape[0] + 1, self.shape[1] + 1, histogramBins), dtype=np.int32)
+            # In place and in int32 (`np.cumsum` promotes to int64 by default) - at most two int32 volumes at a time
+            np.cumsum(oneHot, axis=0, out=oneHot)
+            np.cumsum(oneHot, axis=1, out=self._histogram[1:, 1:])
+
+    def _corners(
+            self,
+            rects: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Clip the rectangles to the map and return their corners `(x1, y1, x2, y2)` as indices into the tables.
+        """
+        rects = np.asarray(rects)
+        if rects.ndim == 1:
+            rects = rects[None]
+
+        if rects.ndim != 2 or rects.shape[1] != 4:
+            raise ValueError(Fore.RED + "\nRectangles must be an (N, 4) array of (x, y, width, height)!\n")
+
+        rects = np.round(rects).astype(np.intp)
+        h, w = self.shape
+
+        x1 = np.clip(rects[:, 0], 0, w)
+        y1 = np.clip(rects[:, 1], 0, h)
+        x2 = np.clip(rects[:, 0] + np.maximum(rects[:, 2], 0), 0, w)
+        y2 = np.clip(rects[:, 1] + np.maximum(rects[:, 3], 0), 0, h)
+
+        return x1, y1, x2, y2
+
+    @staticmethod
+    def _rect_sum(
+            table: np.ndarray,
+            corners: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+    ) -> np.ndarray:
+        """
+        Sum over the rectangles from a summed-area table (4 lookups per rectangle).
+        """
+        x1, y1, x2, y2 = corners
+        return table[y2, x2] - table[y1, x2] - table[y2, x1] + table[y1, x1]
+
+    def count(
+            self,
+            rects: np.ndarray
+    ) -> np.ndarray:
+        """
+        Number of valid pixels in each rectangle.
+
+        :param np.ndarray rects: Rectangles (N, 4) as `(x, y, width, height)`.
+
+        :return: Array of counts (N,).
+        """
+        return self._rect_sum(self._count, self._corners(rects))
+
+    def mean(
+            self,
+            rects: np.ndarray
+    ) -> np.ndarray:
+        """
+        Mean of the valid pixels in each rectangle.
+
+        :param np.ndarray rects: Rectangles (N, 4) as `(x, y, width, height)`.
+
+        :return: Array of means (N,), NaN for rectangles without valid pixels.
+        """
+        return self.query(rects)["mean"]
+
+    def std(
+            self,
+            rects: np.ndarray
+    ) -> np.ndarray:
+        """
+        Standard deviation of the valid pixels in each rectangle.
+
+        :param np.ndarray rects: Rectangles (N, 4) as `(x, y, width, height)`.
+
+        :return: Array of standard deviations (N,), NaN for rectangles without valid pixels.
+        """
+        return self.query(rects)["std"]
+
+    def median(
+            self,
+            rects: np.ndarray
+    ) -> np.ndarray:
+        """
+        Approximate median of the valid pixels in each rectangle - the median is located in the integral histogram and
+        linearly interpolated inside its bin (the error is at most one bin width).
+
+        :param np.ndarray rects: Rectangles (N, 4) as `(x, y, width, height)`.
+
+        :raises RuntimeError: Raises RuntimeError if the histogram was not built (`histogramBins` = 0).
+
+        :return: Array of medians (N,), NaN for rectangles without valid pixels.
+        """
+        if self._histogram is None:
+            raise RuntimeError(Fore.RED + "\nMedian requires the integral histogram (set `histogramBins` > 0)!\n")
+
+        corners = self._corners(rects)
+        histogram = self._rect_sum(self._histogram, corners)
+
+        cumulative = np.cumsum(histogram, axis=1)
+        total = cumulative[:, -1]
+        half = total / 2.0
+
+        binIdx = np.argmax(cumulative >= half[:, None], axis=1)
+        rows = np.arange(len(binIdx))
+        before = np.where(binIdx > 0, cumulative[rows, np.maximum(binIdx - 1, 0)], 0)
+        inBin = histogram[rows, binIdx]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fraction = np.where(inBin > 0, (half - before) / inBin, 0.5)
+            binWidth = self._binEdges[1] - self._binEdges[0]
+            medians = self._binEdges[binIdx] + fraction * binWidth
+
+        return np.where(total > 0, medians, np.nan)
+
+    def query(
+            self,
+            rects: np.ndarray
+    ) -> dict[str, np.ndarray]:
+        """
+        All statistics of the valid pixels in each rectangle.
+
+        :param np.ndarray rects: Rectangles (N, 4) as `(x, y, width, height)`.
+
+        :return: Dictionary with arrays (N,) - **count**, **mean**, **std** and **median** (only if the histogram was built).
+        """
+        corners = self._corners(rects)
+        count = self._rect_sum(self._count, corners)
+        total = self._rect_sum(self._sum, corners)
+        sqTotal = self._rect_sum(self._sqSum, corners)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(count > 0, total / count, np.nan)
+            variance = np.where(count > 0, sqTotal / count - mean ** 2, np.nan)
+
+        results = {
+            "count": count,
+            "mean": mean,
+            "std": np.sqrt(np.maximum(variance, 0.0)),
+        }
+
+        if self._histogram is not None:
+            results["median"] = self.median(rects)
+
+        return results
+
+    def query_points(
+            self,
+            points: np.ndarray,
+            windowSize: int = 5
+    ) -> dict[str, np.ndarray]:
+        """
+        Statistics of square windows centered at the points - a robust replacement for reading single pixels.
+
+        :param np.ndarray points: Points (N, 2) as `(x, y)` pixel coordinates.
+        :param int windowSize: Edge of the window in pixels (odd values keep the window centered). Default is 5.
+
+        :raises ValueError: Raises ValueError if **`windowSize`** is not a positive integer.
+
+        :return: Dictionary with arrays (N,) - see `query`.
+        """
+        if not isinstance(windowSize, int) or windowSize <= 0:
+            raise ValueError(Fore.RED + "\n`windowSize` must be a positive integer!\n")
+
+        points = np.round(np.asarray(points, dtype=np.float64).reshape(-1, 2)).astype(np.intp)
+        rects = np.column_stack([
+            points - windowSize // 2,
+            np.full((len(points), 2), windowSize),
+        ])
+
+        return self.query(rects)
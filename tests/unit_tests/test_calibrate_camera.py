@@ -96,3 +96,366 @@ def test_calibrate_camera_results(mock_calibrate):
     assert rms == 0.5
     assert cameraMatrix.shape == (3, 3)
     assert len(distortionCoefficients) == 5
+
+
+def render_board_views(boardImg, outputDir, numViews=6):
+    import cv2
+
+    outputDir.mkdir()
+    h, w = boardImg.shape[:2]
+    src = np.float32([[0, 0], [w, 0], [w, h], [0, h]])
+    for i in range(numViews):
+        dx, dy = 25 * (i % 3), 20 * (i % 2)
+        dst = np.float32([[60 + dx, 40 + dy], [560 - 2 * dx, 60 + dy], [540 - dx, 420 - dy], [80 + 2 * dx, 440 - dy]])
+        img = cv2.warpPerspective(boardImg, cv2.getPerspectiveTransform(src, dst), (640, 480), borderValue=255)
+        cv2.imwrite(str(outputDir / f"{i:02d}.png"), cv2.cvtColor(img, cv2.COLOR_GRAY2BGR))
+    return str(outputDir)
+
+
+@pytest.fixture
+def chessboard_images(tmp_path):
+    squares = 40
+    board = (np.indices((8, 11)).sum(axis=0) % 2 * 255).astype(np.uint8)
+    boardImg = np.pad(np.kron(board, np.ones((squares, squares), dtype=np.uint8)), squares, constant_values=255)
+    return render_board_views(boardImg, tmp_path / "chessboard")
+
+
+@pytest.fixture
+def charuco_images(tmp_path):
+    from cv2 import aruco
+
+    dictionary = aruco.getPredefinedDictionary(aruco.DICT_6X6_250)
+    board = aruco.CharucoBoard((7, 5), 40.0, 30.0, dictionary)
+    return render_board_views(board.generateImage((700, 500), marginSize=20), tmp_path / "charuco")
+
+
+@pytest.mark.parametrize("useCharuco", [False, True])
+def test_calibrate_camera_workers_same_result(tmp_path, chessboard_images, charuco_images, useCharuco):
+    import json
+
+    results = []
+    for workers in (1, 2):
+        paramsPath = str(tmp_path / f"params_{useCharuco}_{workers}.json")
+        calibrate_camera(
+            chessBoardSize=(7, 5) if useCharuco else (10, 7),
+            squareRealDimensions=40.0,
+            calibImgDirPath=charuco_images if useCharuco else chessboard_images,
+            saveCalibrationParams=True,
+            calibrationParamsPath=paramsPath,
+            useCharuco=useCharuco,
+            markerLength=30.0,
+            workers=workers,
+        )
+        with open(paramsPath) as file:
+            results.append(json.load(file))
+
+    assert results[0] == results[1]
+
+
+def test_calibrate_camera_invalid_workers(chessboard_images):
+    with pytest.raises(ValueError, match="workers"):
+        calibrate_camera(chessBoardSize=(10, 7), squareRealDimensions=40.0, calibImgDirPath=chessboard_images, workers=0)
+
+
+@pytest.mark.parametrize("useCharuco", [False, True])
+def test_calibrate_camera_corner_cache(tmp_path, mocker, chessboard_images, charuco_images, useCharuco):
+    import json
+    import os
+    import zipfile
+
+    cacheDir = tmp_path / "cache"
+    results = []
+    for run in range(2):
+        if run == 1:
+            findCorners = mocker.patch("cv2.findChessboardCorners", side_effect=AssertionError("corners not cached"))
+
+        paramsPath = str(tmp_path / f"params_{useCharuco}_{run}.json")
+        calibrate_camera(
+            chessBoardSize=(7, 5) if useCharuco else (10, 7),
+            squareRealDimensions=40.0,
+            calibImgDirPath=charuco_images if useCharuco else chessboard_images,
+            saveCalibrationParams=True,
+            calibrationParamsPath=paramsPath,
+            useCharuco=useCharuco,
+            markerLength=30.0,
+            cornerCacheDirPath=str(cacheDir),
+        )
+        with open(paramsPath) as file:
+            results.append(json.load(file))
+
+    findCorners.assert_not_called()
+    assert results[0] == results[1]
+    assert len(os.listdir(cacheDir)) == 6
+
+    # The entries are compressed
+    for entry in os.listdir(cacheDir):
+        with zipfile.ZipFile(cacheDir / entry) as archive:
+            assert all(member.compress_type == zipfile.ZIP_DEFLATED for member in archive.infolist())
+
+
+def test_calibrate_camera_corner_cache_invalidated(tmp_path, chessboard_images):
+    import os
+
+    import cv2
+
+    cacheDir = tmp_path / "cache"
+    for terminationCriteria in [(cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001), (cv2.TERM_CRITERIA_MAX_ITER, 10, 0.0)]:
+        calibrate_camera(
+            chessBoardSize=(10, 7),
+            squareRealDimensions=40.0,
+            calibImgDirPath=chessboard_images,
+            terminationCriteria=terminationCriteria,
+            cornerCacheDirPath=str(cacheDir),
+        )
+
+    # Different detector parameters must not reuse the cached corners
+    assert len(os.listdir(cacheDir)) == 12
+
+    # A modified image gets a new entry
+    imagePath = os.path.join(chessboard_images, "00.png")
+    cv2.imwrite(imagePath, cv2.flip(cv2.imread(imagePath), 1))
+    os.utime(imagePath, ns=(os.stat(imagePath).st_atime_ns, os.stat(imagePath).st_mtime_ns + 10 ** 9))
+    calibrate_camera(chessBoardSize=(10, 7), squareRealDimensions=40.0, calibImgDirPath=chessboard_images, cornerCacheDirPath=str(cacheDir))
+
+    assert len(os.listdir(cacheDir)) == 13
+
+
+def test_calibrate_camera_coarse_to_fine(tmp_path, chessboard_images):
+    import json
+
+    results = []
+    for detectionScale in (1, 2):
+        paramsPath = str(tmp_path / f"params_{detectionScale}.json")
+        calibrate_camera(
+            chessBoardSize=(10, 7),
+            squareRealDimensions=40.0,
+            calibImgDirPath=chessboard_images,
+            saveCalibrationParams=True,
+            calibrationParamsPath=paramsPath,
+            detectionScale=detectionScale,
+        )
+        with open(paramsPath) as file:
+            results.append(json.load(file))
+
+    # The corners are refined at the full resolution, so the result does not depend on the scale
+    np.testing.assert_allclose(results[1]["cameraMatrix"], results[0]["cameraMatrix"], rtol=1e-3, atol=0.1)
+    assert results[1]["mse"] == pytest.approx(results[0]["mse"], abs=0.01)
+
+
+@pytest.mark.parametrize("detectionScale, useCharuco", [(3, False), (0, False), (2, True)])
+def test_calibrate_camera_invalid_detection_scale(chessboard_images, detectionScale, useCharuco):
+    with pytest.raises(ValueError, match="detectionScale"):
+        calibrate_camera(
+            chessBoardSize=(10, 7), squareRealDimensions=40.0, calibImgDirPath=chessboard_images,
+            useCharuco=useCharuco, detectionScale=detectionScale
+        )
+
+
+def test_calibrate_camera_prefilter(tmp_path, chessboard_images, capsys):
+    import json
+    import shutil
+
+    import cv2
+
+    paramsPath = str(tmp_path / "params.json")
+    calibrate_camera(
+        chessBoardSize=(10, 7), squareRealDimensions=40.0, calibImgDirPath=chessboard_images,
+        saveCalibrationParams=True, calibrationParamsPath=paramsPath,
+    )
+    with open(paramsPath) as file:
+        expected = json.load(file)
+
+    # Video-like frames - a blurred view (still detected without the prefilter) and a frame without the board
+    imagesDir = tmp_path / "frames"
+    shutil.copytree(chessboard_images, imagesDir)
+    cv2.imwrite(str(imagesDir / "blurred.png"), cv2.GaussianBlur(cv2.imread(str(imagesDir / "00.png")), (0, 0), 6))
+    cv2.imwrite(str(imagesDir / "noise.png"), np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8))
+    capsys.readouterr()
+
+    calibrate_camera(
+        chessBoardSize=(10, 7), squareRealDimensions=40.0, calibImgDirPath=str(imagesDir),
+        saveCalibrationParams=True, calibrationParamsPath=paramsPath, showListOfImagesWithChessboardFound=True,
+        minSharpness=50.0, fastCheck=True,
+    )
+    with open(paramsPath) as file:
+        result = json.load(file)
+
+    # The filter that dropped each frame is reported
+    output = capsys.readouterr().out
+    assert "'blurred.png': 'blur'" in output
+    assert "'noise.png': 'fastCheck'" in output
+    np.testing.assert_allclose(result["cameraMatrix"], expected["cameraMatrix"])
+
+
+def test_prefilter_sharpness_does_not_depend_on_detection_scale():
+    import cv2
+    from zaowr_polsl_kisiel.calibration.corner_detection import _REDUCED_GRAYSCALE, _prefilter
+
+    board = (np.indices((12, 16)).sum(axis=0) % 2 * 255).astype(np.uint8)
+    grayImg = cv2.GaussianBlur(np.kron(board, np.ones((40, 40), dtype=np.uint8)), (0, 0), 2)
+
+    state = {"minSharpness": 1.0, "fastCheck": False}
+    full, reduced = {}, {}
+    _prefilter(grayImg, state, full)
+
+    # The image decoded at half the resolution (`detectionScale=2`) is smaller than the thumbnail and is scaled up
+    _, encoded = cv2.imencode(".png", grayImg)
+    _prefilter(cv2.imdecode(encoded, _REDUCED_GRAYSCALE[2]), state, reduced)
+
+    assert reduced["sharpness"] == pytest.approx(full["sharpness"], rel=0.5)
+
+
+def test_calibrate_camera_invalid_prefilter(chessboard_images):
+    with pytest.raises(ValueError, match="minSharpness"):
+        calibrate_camera(chessBoardSize=(10, 7), squareRealDimensions=40.0, calibImgDirPath=chessboard_images, minSharpness=-1.0)
+
+    with pytest.raises(ValueError, match="fastCheck"):
+        calibrate_camera(chessBoardSize=(7, 5), squareRealDimensions=40.0, calibImgDirPath=chessboard_images, useCharuco=True, fastCheck=True)
+
+
+def test_calibrate_camera_select_views(tmp_path, chessboard_images):
+    import json
+
+    paramsPath = str(tmp_path / "params.json")
+    calibrate_camera(
+        chessBoardSize=(10, 7), squareRealDimensions=40.0, calibImgDirPath=chessboard_images,
+        saveCalibrationParams=True, calibrationParamsPath=paramsPath, selectViews=True, maxViews=4,
+    )
+    with open(paramsPath) as file:
+        params = json.load(file)
+
+    # The near-duplicate synthetic views are covered by fewer views than the limit
+    assert 2 <= len(params["rotationVectors"]) <= 4
+    assert len(params["imgPoints"]) == len(params["rotationVectors"])
+
+
+@pytest.fixture
+def projected_views():
+    import cv2
+
+    rng = np.random.default_rng(0)
+    cameraMatrix = np.array([[700.0, 0, 320], [0, 700.0, 240], [0, 0, 1]])
+    distortionCoefficients = np.array([0.05, -0.02, 0.0, 0.0, 0.0])
+    objP = np.zeros((9 * 6, 1, 3), np.float32)
+    objP[:, 0, :2] = np.mgrid[0:9, 0:6].T.reshape(-1, 2) * 20.0
+
+    objPoints, imgPoints, rotationVectors, translationVectors = [], [], [], []
+    for _ in range(8):
+        rvec = rng.normal(0.0, 0.3, 3)
+        tvec = np.array([-80.0, -50.0, 500.0]) + rng.normal(0.0, 20.0, 3)
+        points, _ = cv2.projectPoints(objP, rvec, tvec, cameraMatrix, distortionCoefficients)
+        objPoints.append(objP)
+        imgPoints.append((points + rng.normal(0.0, 0.1, points.shape)).astype(np.float32))
+        rotationVectors.append(rvec.reshape(3, 1))
+        translationVectors.append(tvec.reshape(3, 1))
+
+    return objPoints, imgPoints, rotationVectors, translationVectors, cameraMatrix, distortionCoefficients
+
+
+def test_reprojection_errors_vectorized(projected_views):
+    import cv2
+    from zaowr_polsl_kisiel.calibration.reprojection import _reprojection_errors
+
+    objPoints, imgPoints, rotationVectors, translationVectors, cameraMatrix, distortionCoefficients = projected_views
+
+    errors = _reprojection_errors(objPoints, imgPoints, rotationVectors, translationVectors, cameraMatrix, distortionCoefficients)
+
+    expected = []
+    for obj, img, rvec, tvec in zip(objPoints, imgPoints, rotationVectors, translationVectors):
+        projected, _ = cv2.projectPoints(obj, rvec, tvec, cameraMatrix, distortionCoefficients)
+        expected.append(np.linalg.norm(projected.reshape(-1, 2) - img.reshape(-1, 2), axis=1))
+
+    np.testing.assert_allclose(errors["perCorner"], np.concatenate(expected), atol=1e-4)
+    np.testing.assert_allclose(errors["perView"], [np.sqrt(np.mean(view ** 2)) for view in expected], atol=1e-4)
+    assert errors["mse"] == pytest.approx(np.mean(np.concatenate(expected) ** 2), rel=1e-4)
+    assert errors["rms"] == pytest.approx(np.sqrt(errors["mse"]))
+
+
+def test_calibrate_views_prunes_outlier(projected_views):
+    from zaowr_polsl_kisiel.calibration.reprojection import _calibrate_views
+
+    objPoints, imgPoints, *_ = projected_views
+    imgPoints = list(imgPoints)
+    imgPoints[3] = (imgPoints[3] + np.random.default_rng(1).normal(0.0, 3.0, imgPoints[3].shape)).astype(np.float32)
+
+    views, calibration, errors = _calibrate_views(objPoints, imgPoints, (640, 480), pruneOutliers=True)
+    _, _, errorsAll = _calibrate_views(objPoints, imgPoints, (640, 480))
+
+    assert 3 not in views
+    assert errors["rms"] < errorsAll["rms"]
+    assert calibration[0] == pytest.approx(errors["rms"], rel=1e-3)
+
+    # No time for the pruning - all the views are kept
+    views, _, _ = _calibrate_views(objPoints, imgPoints, (640, 480), pruneOutliers=True, pruneTimeBudget=0.0)
+    assert views == list(range(len(objPoints)))
+
+
+def test_calibrate_camera_incremental(tmp_path, mocker, chessboard_images):
+    import json
+    import os
+    import shutil
+
+    import cv2
+
+    # Previous session with 4 views, 2 views added in the field
+    sessionDir, newDir = tmp_path / "session", tmp_path / "new"
+    sessionDir.mkdir()
+    newDir.mkdir()
+    for i, name in enumerate(sorted(os.listdir(chessboard_images))):
+        shutil.copy(os.path.join(chessboard_images, name), sessionDir if i < 4 else newDir)
+
+    paths = {name: str(tmp_path / f"{name}.json") for name in ("full", "previous", "incremental")}
+    for name, imagesDir in (("full", chessboard_images), ("previous", sessionDir)):
+        calibrate_camera(
+            chessBoardSize=(10, 7), squareRealDimensions=40.0, calibImgDirPath=str(imagesDir),
+            saveCalibrationParams=True, calibrationParamsPath=paths[name],
+        )
+
+    # The initial guess is modified in place by OpenCV - a copy is recorded before the solve
+    initialGuesses = []
+    calibrateCameraOriginal = cv2.calibrateCamera
+
+    def calibrateCamera(objPoints, imgPoints, imageSize, cameraMatrix, distCoeffs, **kwargs):
+        initialGuesses.append((None if cameraMatrix is None else cameraMatrix.copy(), kwargs.get("flags", 0)))
+        return calibrateCameraOriginal(objPoints, imgPoints, imageSize, cameraMatrix, distCoeffs, **kwargs)
+
+    findCorners = mocker.spy(cv2, "findChessboardCorners")
+    mocker.patch("cv2.calibrateCamera", side_effect=calibrateCamera)
+    calibrate_camera(
+        chessBoardSize=(10, 7), squareRealDimensions=40.0, calibImgDirPath=str(newDir),
+        saveCalibrationParams=True, calibrationParamsPath=paths["incremental"], previousCalibrationParamsPath=paths["previous"],
+    )
+
+    results = {}
+    for name, path in paths.items():
+        with open(path) as file:
+            results[name] = json.load(file)
+
+    # Only the new images are processed
+    assert findCorners.call_count == 2
+
+    # The solve is warm-started from the previous intrinsics
+    initialCameraMatrix, flags = initialGuesses[-1]
+    assert flags & cv2.CALIB_USE_INTRINSIC_GUESS
+    np.testing.assert_allclose(initialCameraMatrix, results["previous"]["cameraMatrix"])
+
+    # The same views as the full calibration (in a different order - previous views first)
+    assert len(results["incremental"]["imgPoints"]) == 6
+    np.testing.assert_allclose(
+        sorted(np.asarray(results["incremental"]["imgPoints"]).reshape(6, -1).tolist()),
+        sorted(np.asarray(results["full"]["imgPoints"]).reshape(6, -1).tolist()),
+    )
+
+
+def test_calibrate_camera_incremental_different_board(tmp_path, chessboard_images):
+    paramsPath = str(tmp_path / "previous.json")
+    calibrate_camera(
+        chessBoardSize=(10, 7), squareRealDimensions=40.0, calibImgDirPath=chessboard_images,
+        saveCalibrationParams=True, calibrationParamsPath=paramsPath,
+    )
+
+    with pytest.raises(ValueError, match="different chessboard"):
+        calibrate_camera(
+            chessBoardSize=(10, 7), squareRealDimensions=25.0, calibImgDirPath=chessboard_images,
+            previousCalibrationParamsPath=paramsPath,
+        )
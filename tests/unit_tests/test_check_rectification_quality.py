@@ -0,0 +1,79 @@
+import cv2
+import numpy as np
+import pytest
+from zaowr_polsl_kisiel.custom_exceptions.exceptions import MissingParameters
+from zaowr_polsl_kisiel.image_processing import check_rectification_quality
+
+
+@pytest.fixture
+def stereo_rig():
+    cameraMatrix = np.array([[600.0, 0.0, 320.0], [0.0, 600.0, 240.0], [0.0, 0.0, 1.0]])
+    distortionCoefficients = np.array([-0.1, 0.02, 0.0, 0.0, 0.0])
+    R = cv2.Rodrigues(np.array([0.01, 0.03, 0.005]))[0]
+    T = np.array([[-0.12], [0.002], [0.001]])
+
+    board = np.array([[x * 0.03, y * 0.03, 0.0] for y in range(6) for x in range(9)])
+    imgPoints_left, imgPoints_right = [], []
+    for i in range(5):
+        rvec = np.array([0.1 * i - 0.2, 0.05 * i, 0.0])
+        tvec = np.array([-0.12 + 0.01 * i, -0.08, 1.0 + 0.1 * i])
+        left, _ = cv2.projectPoints(board, rvec, tvec, cameraMatrix, distortionCoefficients)
+        # Pose of the board in the right camera: R * X_left + T
+        rvec_right, tvec_right = cv2.composeRT(rvec, tvec, cv2.Rodrigues(R)[0], T)[:2]
+        right, _ = cv2.projectPoints(board, rvec_right, tvec_right, cameraMatrix, distortionCoefficients)
+        imgPoints_left.append(left.astype(np.float32))
+        imgPoints_right.append(right.astype(np.float32))
+
+    calibration = {
+        "cameraMatrix_left": cameraMatrix,
+        "cameraMatrix_right": cameraMatrix,
+        "distortionCoefficients_left": distortionCoefficients,
+        "distortionCoefficients_right": distortionCoefficients,
+        "R": R,
+        "T": T,
+    }
+    return imgPoints_left, imgPoints_right, calibration
+
+
+def test_check_rectification_quality_valid(stereo_rig):
+    imgPoints_left, imgPoints_right, calibration = stereo_rig
+
+    results = check_rectification_quality(imgPoints_left, imgPoints_right, (640, 480), **calibration)
+
+    assert results["valid"]
+    assert results["count"] == 5 * 54
+    assert results["p95"] < 0.01
+    assert len(results["perView"]) == 5
+
+
+def test_check_rectification_quality_detects_drift(stereo_rig):
+    imgPoints_left, imgPoints_right, calibration = stereo_rig
+    # Right camera tilted by ~0.3 degrees since the calibration
+    calibration["R"] = cv2.Rodrigues(np.array([0.015, 0.03, 0.005]))[0]
+
+    results = check_rectification_quality(imgPoints_left, imgPoints_right, (640, 480), verbose=False, **calibration)
+
+    assert not results["valid"]
+    assert results["p95"] > 1.0
+
+
+def test_check_rectification_quality_matches_ids(stereo_rig):
+    imgPoints_left, imgPoints_right, calibration = stereo_rig
+    ids = [np.arange(54) for _ in range(5)]
+    # Right view 0 is missing the first 10 corners (and is shuffled)
+    order = np.random.default_rng(0).permutation(np.arange(10, 54))
+    imgPoints_right = [imgPoints_right[0][order]] + imgPoints_right[1:]
+    ids_right = [ids[0][order]] + ids[1:]
+
+    results = check_rectification_quality(
+        imgPoints_left, imgPoints_right, (640, 480), ids_left=ids, ids_right=ids_right, verbose=False, **calibration
+    )
+
+    assert results["count"] == 44 + 4 * 54
+    assert results["valid"]
+
+
+def test_check_rectification_quality_missing_parameters(stereo_rig):
+    imgPoints_left, imgPoints_right, _ = stereo_rig
+    with pytest.raises(MissingParameters):
+        check_rectification_quality(imgPoints_left, imgPoints_right, (640, 480))
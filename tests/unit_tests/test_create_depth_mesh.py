@@ -0,0 +1,59 @@
+import cv2
+import numpy as np
+import pytest
+from zaowr_polsl_kisiel.content_loaders import load_ply_file, write_ply_file
+from zaowr_polsl_kisiel.image_processing import create_depth_mesh
+
+
+@pytest.fixture
+def images(tmp_path):
+    # Two planes - the left half is much closer than the right half (depth discontinuity between columns 4 and 5)
+    disparity = np.full((12, 10), 20, dtype=np.uint8)
+    disparity[:, :5] = 200
+    disparity[0, 0] = 0  # invalid pixel
+    color = np.zeros((12, 10, 3), dtype=np.uint8)
+    color[..., 2] = 255  # red in BGR
+
+    colorPath = str(tmp_path / "color.png")
+    disparityPath = str(tmp_path / "disparity.png")
+    cv2.imwrite(colorPath, color)
+    cv2.imwrite(disparityPath, disparity)
+    return colorPath, disparityPath
+
+
+def test_create_depth_mesh_drops_discontinuities(images):
+    chunks = list(create_depth_mesh(*images, maxDepth=500.0, bandRows=5))
+
+    verts = np.concatenate([chunk[0] for chunk in chunks])
+    colors = np.concatenate([chunk[1] for chunk in chunks])
+    faces = np.concatenate([chunk[2] for chunk in chunks])
+
+    assert len(chunks) == 3
+    assert len(verts) == 12 * 10 - 1
+    np.testing.assert_array_equal(colors, [[255, 0, 0]] * len(verts))
+
+    # 11 rows of quads: 4 quads per row on each plane, no quads across the jump, one triangle lost at the invalid pixel
+    assert len(faces) == 2 * (11 * 4 * 2) - 1
+
+    # Every triangle lies on a single plane
+    depths = -verts[faces][..., 2]
+    np.testing.assert_allclose(depths.min(axis=1), depths.max(axis=1))
+
+
+def test_create_depth_mesh_write_ply(tmp_path, images):
+    path = str(tmp_path / "mesh.ply")
+
+    write_ply_file(path, create_depth_mesh(*images, maxDepth=500.0, bandRows=4), plyFormat="binary_little_endian")
+
+    ply = load_ply_file(path)
+    assert len(ply["vertex"]) == 119
+    assert len(ply["face"]) == 175
+    assert ply["face"]["vertex_indices"].max() < 119
+
+
+def test_create_depth_mesh_invalid_params(images):
+    with pytest.raises(ValueError):
+        create_depth_mesh(*images, maxDepthJump=0.0)
+
+    with pytest.raises(ValueError):
+        create_depth_mesh(*images, step=0)
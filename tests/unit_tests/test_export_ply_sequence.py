@@ -0,0 +1,107 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+from zaowr_polsl_kisiel.content_loaders import load_ply_file
+from zaowr_polsl_kisiel.image_processing import export_ply_sequence
+
+
+def reproject(disparity, focalLengthFactor=0.8):
+    # The same `Q` matrix as in `create_color_point_cloud`
+    h, w = disparity.shape
+    Q = np.float32([
+        [1, 0, 0, -0.5 * w],
+        [0, -1, 0, 0.5 * h],
+        [0, 0, 0, -focalLengthFactor * w],
+        [0, 0, 1, 0],
+    ])
+    return cv2.reprojectImageTo3D(disparity, Q)
+
+
+@pytest.fixture
+def sequence(tmp_path):
+    rng = np.random.default_rng(0)
+    disparityFrames = []
+    for index in range(5):
+        disparity = rng.integers(1, 256, size=(12, 16), dtype=np.uint8)
+        disparity[index, :] = 0  # invalid pixels
+        disparity[:, index] = 1  # too far for `maxDepth`
+        disparityFrames.append(disparity)
+
+    color = np.zeros((12, 16, 3), dtype=np.uint8)
+    color[..., 0] = 255  # blue in BGR
+
+    for folder in ("disparity", "color"):
+        os.makedirs(tmp_path / folder)
+
+    # Written in reverse order - the frames must be exported in the order of the file names
+    for index in reversed(range(5)):
+        cv2.imwrite(str(tmp_path / "disparity" / f"frame_{index:02d}.png"), disparityFrames[index])
+        cv2.imwrite(str(tmp_path / "color" / f"frame_{index:02d}.png"), color)
+
+    return tmp_path, disparityFrames
+
+
+@pytest.mark.parametrize("plyFormat", ["ascii", "binary_little_endian"])
+def test_export_ply_sequence_matches_reproject_image_to_3d(sequence, plyFormat):
+    tmp_path, disparityFrames = sequence
+
+    # A single pending frame and two writers - the producer must wait for the writers
+    plyPaths = export_ply_sequence(
+        str(tmp_path / "disparity"), str(tmp_path / "clouds"), colorSource=str(tmp_path / "color"),
+        maxDepth=10.0, plyFormat=plyFormat, workers=2, maxPendingFrames=1
+    )
+
+    assert plyPaths == [str(tmp_path / "clouds" / f"frame_{index:02d}.ply") for index in range(5)]
+
+    for plyPath, disparity in zip(plyPaths, disparityFrames):
+        expected = reproject(disparity)
+        mask = (disparity > 0) & (np.abs(expected[..., 2]) < 10.0)
+
+        vertices = load_ply_file(plyPath)["vertex"]
+        assert len(vertices) == mask.sum()
+        assert len(vertices) < (disparity > 0).sum()
+
+        points = np.stack([vertices["x"], vertices["y"], vertices["z"]], axis=1)
+        np.testing.assert_allclose(points, expected[mask], rtol=1e-5, atol=1e-4)
+        np.testing.assert_array_equal(vertices["blue"], 255)
+        np.testing.assert_array_equal(vertices["red"], 0)
+
+
+def test_export_ply_sequence_depth_filter(sequence):
+    tmp_path, disparityFrames = sequence
+
+    os.makedirs(tmp_path / "depth")
+    for index in range(5):
+        depth = np.full((12, 16), 10, dtype=np.uint8)
+        depth[:, 8:] = 200  # right half beyond `maxDepth`
+        cv2.imwrite(str(tmp_path / "depth" / f"frame_{index:02d}.png"), depth)
+
+    plyPaths = export_ply_sequence(str(tmp_path / "disparity"), str(tmp_path / "clouds"), depthSource=str(tmp_path / "depth"), maxDepth=50.0)
+
+    for plyPath, disparity in zip(plyPaths, disparityFrames):
+        mask = disparity > 0
+        mask[:, 8:] = False
+
+        vertices = load_ply_file(plyPath)["vertex"]
+        assert len(vertices) == mask.sum()
+
+        # Gray color from the disparity if no color source is provided
+        np.testing.assert_array_equal(vertices["red"], disparity[mask])
+
+
+def test_export_ply_sequence_wrong_params(sequence):
+    tmp_path, _ = sequence
+
+    os.makedirs(tmp_path / "short")
+    cv2.imwrite(str(tmp_path / "short" / "frame_00.png"), np.zeros((12, 16, 3), dtype=np.uint8))
+
+    with pytest.raises(ValueError):
+        export_ply_sequence(str(tmp_path / "disparity"), str(tmp_path / "clouds"), colorSource=str(tmp_path / "short"))
+
+    with pytest.raises(ValueError):
+        export_ply_sequence(str(tmp_path / "disparity"), str(tmp_path / "clouds"), workers=0)
+
+    with pytest.raises(ValueError):
+        export_ply_sequence(str(tmp_path / "missing"), str(tmp_path / "clouds"))
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from zaowr_polsl_kisiel.tools import get_map_value_for_points
+
+
+@pytest.fixture
+def linear_map():
+    # value = 2 * x + 10 * y, so bilinear sampling is exact
+    y, x = np.indices((40, 60), dtype=np.float32)
+    return 2 * x + 10 * y
+
+
+def test_get_map_value_for_points_batch_bilinear(linear_map):
+    points = np.array([[1.25, 2.5], [59.0, 39.0], [-0.5, 3.0], [10.0, 40.5]])
+
+    results = get_map_value_for_points(points, linear_map, mapType="depth", batch=True, interpolation="bilinear")
+
+    assert results.dtype.names == ("index", "x", "y", "value")
+    np.testing.assert_array_equal(results["index"], [1, 2, 3, 4])
+    np.testing.assert_allclose(results["value"][:2], [27.5, 508.0])
+    assert np.isnan(results["value"][2:]).all()
+
+
+def test_get_map_value_for_points_batch_nearest(linear_map):
+    points = np.array([[3.4, 5.6], [60.0, 0.0]])
+
+    results = get_map_value_for_points(points, linear_map, batch=True)
+
+    assert results["value"][0] == 2 * 3 + 10 * 6
+    assert np.isnan(results["value"][1])
+
+
+def test_get_map_value_for_points_batch_invalid(linear_map):
+    with pytest.raises(ValueError):
+        get_map_value_for_points(np.zeros((3, 2)), linear_map, batch=True, interpolation="cubic")
+
+    with pytest.raises(ValueError):
+        get_map_value_for_points(np.zeros((3, 3)), linear_map, batch=True)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from zaowr_polsl_kisiel.content_loaders import load_ply_file, write_ply_file
+
+
+@pytest.fixture
+def point_cloud():
+    rng = np.random.default_rng(0)
+    verts = rng.uniform(-10, 10, (100, 3)).astype(np.float32)
+    colors = rng.integers(0, 256, (100, 3), dtype=np.uint8)
+    return verts, colors
+
+
+@pytest.mark.parametrize("plyFormat", ["ascii", "binary_little_endian"])
+def test_load_ply_file_round_trip(tmp_path, point_cloud, plyFormat):
+    verts, colors = point_cloud
+    path = str(tmp_path / "cloud.ply")
+    write_ply_file(path, verts, colors, plyFormat=plyFormat)
+
+    cloud = load_ply_file(path, chunkSize=30)
+    vertex = cloud["vertex"]
+
+    assert len(vertex) == 100
+    np.testing.assert_allclose(np.stack([vertex["x"], vertex["y"], vertex["z"]], axis=1), verts, atol=1e-5)
+    np.testing.assert_array_equal(np.stack([vertex["red"], vertex["green"], vertex["blue"]], axis=1), colors)
+
+
+def test_load_ply_file_memory_mapped(tmp_path, point_cloud):
+    verts, colors = point_cloud
+    path = str(tmp_path / "cloud.ply")
+    write_ply_file(path, verts, colors, plyFormat="binary_little_endian")
+
+    vertex = load_ply_file(path)["vertex"]
+
+    assert isinstance(vertex, np.memmap)
+    assert np.shares_memory(vertex["x"], vertex)
+
+
+def test_load_ply_file_faces(tmp_path):
+    path = tmp_path / "mesh.ply"
+    vertex = np.zeros(3, dtype=[("x", "<f4"), ("y", "<f4"), ("z", "<f4")])
+    face = np.array([(3, [0, 1, 2]), (3, [2, 1, 0])], dtype=[("n", "u1"), ("idx", "<i4", 3)])
+    with open(path, "wb") as f:
+        f.write(
+            b"ply\nformat binary_little_endian 1.0\n"
+            b"element vertex 3\nproperty float x\nproperty float y\nproperty float z\n"
+            b"element face 2\nproperty list uchar int vertex_indices\nend_header\n"
+        )
+        vertex.tofile(f)
+        face.tofile(f)
+
+    mesh = load_ply_file(str(path))
+
+    np.testing.assert_array_equal(mesh["face"]["vertex_indices"], [[0, 1, 2], [2, 1, 0]])
+
+
+def test_load_ply_file_not_ply(tmp_path):
+    path = tmp_path / "cloud.ply"
+    path.write_bytes(b"not a ply file\n")
+
+    with pytest.raises(ValueError, match="Not a PLY file"):
+        load_ply_file(str(path))
+
+
+def test_load_ply_file_missing():
+    with pytest.raises(FileNotFoundError):
+        load_ply_file("/fake/path/cloud.ply")
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from zaowr_polsl_kisiel.image_processing import voxel_downsample, remove_point_cloud_outliers
+
+
+def test_voxel_downsample_averages_voxels():
+    verts = np.array([
+        [0.1, 0.1, 0.1],
+        [0.3, 0.3, 0.3],
+        [1.5, 0.5, 0.5],
+        [np.inf, 0.0, 0.0],
+    ], dtype=np.float32)
+    colors = np.array([[0, 0, 0], [100, 200, 50], [10, 20, 30], [255, 255, 255]], dtype=np.uint8)
+
+    outVerts, outColors = voxel_downsample(verts, colors, voxelSize=1.0)
+
+    order = np.argsort(outVerts[:, 0])
+    np.testing.assert_allclose(outVerts[order], [[0.2, 0.2, 0.2], [1.5, 0.5, 0.5]], atol=1e-6)
+    np.testing.assert_array_equal(outColors[order], [[50, 100, 25], [10, 20, 30]])
+    assert outColors.dtype == np.uint8
+
+
+def test_voxel_downsample_invalid_voxel_size():
+    verts = np.zeros((10, 3), dtype=np.float32)
+    colors = np.zeros((10, 3), dtype=np.uint8)
+
+    with pytest.raises(ValueError):
+        voxel_downsample(verts, colors, voxelSize=0.0)
+
+    with pytest.raises(TypeError):
+        voxel_downsample(verts, colors, voxelSize=1)
+
+
+def test_remove_point_cloud_outliers():
+    rng = np.random.default_rng(0)
+    cluster = rng.normal(0, 0.5, (1000, 3))
+    outliers = np.array([[50.0, 50.0, 50.0], [-40.0, 10.0, 30.0]])
+    verts = np.vstack([cluster, outliers]).astype(np.float32)
+    colors = np.zeros((len(verts), 3), dtype=np.uint8)
+
+    outVerts, outColors = remove_point_cloud_outliers(verts, colors, cellSize=1.0, stdRatio=None, minNeighbors=1)
+
+    assert len(outVerts) == len(outColors)
+    assert not np.any(np.all(np.isin(outVerts, outliers.astype(np.float32)), axis=1))
+    assert len(outVerts) >= 990
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from zaowr_polsl_kisiel.tools import PointCloudIndex
+
+
+@pytest.fixture
+def cloud():
+    rng = np.random.default_rng(0)
+    verts = rng.uniform(0, 10, (2000, 3)).astype(np.float32)
+    verts[7] = np.inf  # e.g. points with zero disparity
+    queries = rng.uniform(-2, 12, (50, 3))
+    finite = np.where(np.isfinite(verts).all(axis=1)[:, None], verts.astype(np.float64), 1e12)
+    distances = np.linalg.norm(finite[None, :, :] - queries[:, None, :], axis=2)
+    return verts, queries, distances
+
+
+def test_query_knn(cloud):
+    verts, queries, distances = cloud
+    index = PointCloudIndex(verts, cellSize=0.5)
+
+    dist, idx = index.query_knn(queries, k=4)
+
+    expected = np.argsort(distances, axis=1)[:, :4]
+    np.testing.assert_allclose(dist, np.take_along_axis(distances, expected, axis=1))
+    assert 7 not in idx
+
+
+def test_query_radius(cloud):
+    verts, queries, distances = cloud
+    index = PointCloudIndex(verts)
+
+    results = index.query_radius(queries, radius=1.5)
+
+    assert len(results) == len(queries)
+    for result, row in zip(results, distances):
+        assert set(result) == set(np.flatnonzero(row <= 1.5))
+
+
+def test_query_box(cloud):
+    verts, _, _ = cloud
+    index = PointCloudIndex(verts, cellSize=1.0)
+
+    result = index.query_box(np.array([2.0, 2.0, 2.0]), np.array([4.0, 6.0, 5.0]))[0]
+
+    inside = np.all((verts >= [2.0, 2.0, 2.0]) & (verts <= [4.0, 6.0, 5.0]), axis=1)
+    assert set(result) == set(np.flatnonzero(inside))
+
+
+def test_query_box_many_boxes(cloud):
+    verts, queries, _ = cloud
+    index = PointCloudIndex(verts, cellSize=1.0, batchSize=16)
+
+    # Boxes around the queries (some of them partly or fully outside of the cloud), processed in several chunks
+    sizes = np.random.default_rng(1).uniform(0.5, 3.0, (len(queries), 3))
+    results = index.query_box(queries - sizes, queries + sizes)
+
+    assert len(results) == len(queries)
+    for result, boxMin, boxMax in zip(results, queries - sizes, queries + sizes):
+        inside = np.all((verts >= boxMin) & (verts <= boxMax), axis=1)
+        assert set(result) == set(np.flatnonzero(inside))
+
+
+def test_invalid_params(cloud):
+    verts, queries, _ = cloud
+
+    with pytest.raises(TypeError):
+        PointCloudIndex(verts.tolist())
+
+    with pytest.raises(ValueError):
+        PointCloudIndex(verts).query_knn(queries, k=0)
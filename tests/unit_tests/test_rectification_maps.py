@@ -0,0 +1,124 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+from zaowr_polsl_kisiel.content_loaders import load_rectification_maps, rectification_maps_key, save_rectification_maps
+from zaowr_polsl_kisiel.custom_exceptions.exceptions import CalibrationParamsWrongFormat, MissingParameters, \
+    RectificationMapsPathNotProvided
+from zaowr_polsl_kisiel.image_processing import stereo_rectify
+
+
+@pytest.fixture
+def stereo_calibration():
+    cameraMatrix = np.array([[200.0, 0.0, 80.0], [0.0, 200.0, 60.0], [0.0, 0.0, 1.0]])
+    distortionCoefficients = np.array([-0.1, 0.01, 0.0, 0.0, 0.0])
+    R = cv2.Rodrigues(np.array([0.0, 0.02, 0.0]))[0]
+    T = np.array([[-0.1], [0.0], [0.0]])
+    return cameraMatrix, distortionCoefficients, cameraMatrix, distortionCoefficients, R, T
+
+
+@pytest.fixture
+def maps(stereo_calibration):
+    cameraMatrix_left, dist_left, cameraMatrix_right, dist_right, R, T = stereo_calibration
+    R1, R2, P1, P2, *_ = cv2.stereoRectify(cameraMatrix_left, dist_left, cameraMatrix_right, dist_right, (160, 120), R, T)
+    map1_left, map2_left = cv2.initUndistortRectifyMap(cameraMatrix_left, dist_left, R1, P1, (160, 120), cv2.CV_16SC2)
+    map1_right, map2_right = cv2.initUndistortRectifyMap(cameraMatrix_right, dist_right, R2, P2, (160, 120), cv2.CV_16SC2)
+    return {"map1_left": map1_left, "map2_left": map2_left, "map1_right": map1_right, "map2_right": map2_right}
+
+
+def test_save_and_load_rectification_maps(tmp_path, stereo_calibration, maps):
+    key = rectification_maps_key(*stereo_calibration, (160, 120))
+    assert key != rectification_maps_key(*stereo_calibration, (320, 240))
+
+    save_rectification_maps(maps, str(tmp_path), key)
+    loaded = load_rectification_maps(str(tmp_path), key)
+
+    for name, rectificationMap in maps.items():
+        assert isinstance(loaded[name], np.memmap)
+        np.testing.assert_array_equal(loaded[name], rectificationMap)
+
+    # The only set of maps in the store is found without the key
+    np.testing.assert_array_equal(load_rectification_maps(str(tmp_path), mmap=False)["map1_left"], maps["map1_left"])
+
+    with pytest.raises(CalibrationParamsWrongFormat):
+        load_rectification_maps(str(tmp_path), "0" * 16)
+
+    with pytest.raises(MissingParameters):
+        save_rectification_maps({"map1_left": maps["map1_left"]}, str(tmp_path))
+
+
+def test_stereo_rectify_saves_and_loads_maps(tmp_path, stereo_calibration, maps):
+    cameraMatrix_left, dist_left, cameraMatrix_right, dist_right, R, T = stereo_calibration
+    for side in ("left", "right"):
+        os.makedirs(tmp_path / side)
+        cv2.imwrite(str(tmp_path / side / "img.png"), np.full((120, 160, 3), 128, dtype=np.uint8))
+
+    params = dict(
+        calibImgDirPath_left=str(tmp_path / "left"),
+        calibImgDirPath_right=str(tmp_path / "right"),
+        cameraMatrix_left=cameraMatrix_left,
+        cameraMatrix_right=cameraMatrix_right,
+        distortionCoefficients_left=dist_left,
+        distortionCoefficients_right=dist_right,
+        R=R,
+        T=T,
+        F=np.eye(3),
+        imgPoints_left=np.zeros((1, 2)),
+        imgPoints_right=np.zeros((1, 2)),
+        rectificationMapsPath=str(tmp_path / "maps"),
+    )
+
+    stereo_rectify(saveRectificationMaps=True, **params)
+
+    key = rectification_maps_key(*stereo_calibration, (160, 120))
+    np.testing.assert_array_equal(load_rectification_maps(str(tmp_path / "maps"), key)["map1_right"], maps["map1_right"])
+
+    stereo_rectify(loadRectificationMaps=True, **params)
+
+
+def test_save_memory_mapped_maps_to_the_same_store(tmp_path, stereo_calibration, maps):
+    key = rectification_maps_key(*stereo_calibration, (160, 120))
+    save_rectification_maps(maps, str(tmp_path), key)
+
+    # Saving the memory-mapped maps over the files they are mapped from must not truncate them
+    save_rectification_maps(load_rectification_maps(str(tmp_path), key), str(tmp_path), key)
+
+    loaded = load_rectification_maps(str(tmp_path), key, mmap=False)
+    for name, rectificationMap in maps.items():
+        np.testing.assert_array_equal(loaded[name], rectificationMap)
+
+    assert not any(name.endswith(".tmp") for name in os.listdir(tmp_path / key))
+
+
+def test_stereo_rectify_loads_and_saves_maps_repeatedly(tmp_path, stereo_calibration, maps):
+    cameraMatrix_left, dist_left, cameraMatrix_right, dist_right, R, T = stereo_calibration
+    for side in ("left", "right"):
+        os.makedirs(tmp_path / side)
+        cv2.imwrite(str(tmp_path / side / "img.png"), np.full((120, 160, 3), 128, dtype=np.uint8))
+
+    params = dict(
+        calibImgDirPath_left=str(tmp_path / "left"),
+        calibImgDirPath_right=str(tmp_path / "right"),
+        cameraMatrix_left=cameraMatrix_left,
+        cameraMatrix_right=cameraMatrix_right,
+        distortionCoefficients_left=dist_left,
+        distortionCoefficients_right=dist_right,
+        R=R,
+        T=T,
+        F=np.eye(3),
+        imgPoints_left=np.zeros((1, 2)),
+        imgPoints_right=np.zeros((1, 2)),
+    )
+
+    # The first run creates the maps, the next ones load them from the store (and must leave it intact)
+    for _ in range(3):
+        stereo_rectify(loadRectificationMaps=True, saveRectificationMaps=True, rectificationMapsPath=str(tmp_path / "maps"), **params)
+
+    key = rectification_maps_key(*stereo_calibration, (160, 120))
+    loaded = load_rectification_maps(str(tmp_path / "maps"), key, mmap=False)
+    for name, rectificationMap in maps.items():
+        np.testing.assert_array_equal(loaded[name], rectificationMap)
+
+    with pytest.raises(RectificationMapsPathNotProvided):
+        stereo_rectify(loadRectificationMaps=True, rectificationMapsPath="", **params)
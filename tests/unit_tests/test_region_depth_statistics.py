@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from zaowr_polsl_kisiel.tools import RegionDepthStatistics
+
+
+@pytest.fixture
+def depth_map():
+    rng = np.random.default_rng(0)
+    depthMap = rng.uniform(1, 10, (60, 80)).astype(np.float32)
+    depthMap[rng.random(depthMap.shape) < 0.1] = 0  # invalid pixels
+    return depthMap
+
+
+def test_region_statistics_match_numpy(depth_map):
+    stats = RegionDepthStatistics(depth_map, histogramBins=128)
+    rects = np.array([[0, 0, 10, 10], [35, 20, 17, 9], [75, 55, 20, 20]])
+
+    results = stats.query(rects)
+
+    for i, (x, y, w, h) in enumerate(rects):
+        window = depth_map[y:y + h, x:x + w]
+        values = np.sort(window[window > 0])
+        assert results["count"][i] == len(values)
+        assert results["mean"][i] == pytest.approx(values.mean())
+        assert results["std"][i] == pytest.approx(values.std())
+
+        binWidth = 9.0 / 128
+        low, high = values[(len(values) - 1) // 2], values[len(values) // 2]
+        assert low - binWidth <= results["median"][i] <= high + binWidth
+
+
+def test_region_statistics_empty_and_points(depth_map):
+    stats = RegionDepthStatistics(depth_map)
+
+    assert np.isnan(stats.mean(np.array([[100, 100, 5, 5]]))[0])
+
+    results = stats.query_points(np.array([[40, 30]]), windowSize=3)
+    window = depth_map[29:32, 39:42]
+    assert results["mean"][0] == pytest.approx(window[window > 0].mean())
+
+    with pytest.raises(RuntimeError):
+        stats.median(np.array([[0, 0, 5, 5]]))
+
+
+def test_integral_histogram_memory(depth_map):
+    import tracemalloc
+
+    tracemalloc.start()
+    stats = RegionDepthStatistics(depth_map, histogramBins=64)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # The histogram is int32 and its build needs at most about two int32 volumes (no int64 temporaries)
+    assert stats._histogram.dtype == np.int32
+    assert peak < 3 * stats._histogram.nbytes
@@ -1,3 +1,4 @@
+import cv2
 import numpy as np
 import pytest
 from zaowr_polsl_kisiel.custom_exceptions.exceptions import ImgToUndistortPathNotProvided, UndistortedImgPathNotProvided
@@ -83,4 +84,58 @@ def test_remove_distortion_invalid_method(mock_remove_distortion):
             distortionCoefficients=np.zeros(5),
             imgToUndistortPath="/fake/image.png",
             undistortionMethod="invalid_method",
-        )
\ No newline at end of file
+        )
+
+def test_remove_distortion_reuses_cached_maps(mock_remove_distortion, mocker):
+    from zaowr_polsl_kisiel.image_processing.remove_distortion import _cached_undistort_maps
+
+    _cached_undistort_maps.cache_clear()
+    spy = mocker.spy(cv2, "initUndistortRectifyMap")
+    cameraMatrix = np.array([[500.0, 0.0, 320.0], [0.0, 500.0, 240.0], [0.0, 0.0, 1.0]])
+    distortionCoefficients = np.array([-0.2, 0.05, 0.0, 0.0, 0.0])
+
+    for _ in range(3):
+        remove_distortion(
+            cameraMatrix=cameraMatrix,
+            distortionCoefficients=distortionCoefficients,
+            imgToUndistortPath="/fake/image.png",
+            undistortionMethod="remapping",
+        )
+
+    assert spy.call_count == 1
+    assert spy.call_args.args[-1] == cv2.CV_16SC2
+
+
+def test_remove_distortion_undistort_method_builds_no_maps(mock_remove_distortion, mocker):
+    from zaowr_polsl_kisiel.image_processing.remove_distortion import _cached_new_camera_matrix, _cached_undistort_maps
+
+    _cached_new_camera_matrix.cache_clear()
+    _cached_undistort_maps.cache_clear()
+    mapsSpy = mocker.spy(cv2, "initUndistortRectifyMap")
+    matrixSpy = mocker.spy(cv2, "getOptimalNewCameraMatrix")
+
+    for _ in range(3):
+        remove_distortion(
+            cameraMatrix=np.eye(3),
+            distortionCoefficients=np.zeros(5),
+            imgToUndistortPath="/fake/image.png",
+            undistortionMethod="undistort",
+        )
+
+    # `cv.undistort` does not use the remap maps - only the new camera matrix is computed (once)
+    assert mapsSpy.call_count == 0
+    assert matrixSpy.call_count == 1
+
+    # An invalid method is rejected before any work
+    mock_imread, _, _, _ = mock_remove_distortion
+    mock_imread.reset_mock()
+    with pytest.raises(ValueError, match="Invalid undistortion method"):
+        remove_distortion(
+            cameraMatrix=np.eye(3) * 2,
+            distortionCoefficients=np.zeros(5),
+            imgToUndistortPath="/fake/image.png",
+            undistortionMethod="invalid_method",
+        )
+
+    mock_imread.assert_not_called()
+    assert matrixSpy.call_count == 1
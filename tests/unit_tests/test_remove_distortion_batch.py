@@ -0,0 +1,56 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+from zaowr_polsl_kisiel.custom_exceptions.exceptions import ImgToUndistortPathNotProvided
+from zaowr_polsl_kisiel.image_processing import remove_distortion_batch
+
+
+@pytest.fixture
+def calibration():
+    cameraMatrix = np.array([[300.0, 0.0, 80.0], [0.0, 300.0, 60.0], [0.0, 0.0, 1.0]])
+    distortionCoefficients = np.array([-0.3, 0.1, 0.0, 0.0, 0.0])
+    return cameraMatrix, distortionCoefficients
+
+
+@pytest.fixture
+def session(tmp_path):
+    inputDir = tmp_path / "session"
+    inputDir.mkdir()
+    rng = np.random.default_rng(0)
+    for name in ("c.png", "a.png", "b.png"):
+        cv2.imwrite(str(inputDir / name), rng.integers(0, 256, (120, 160, 3), dtype=np.uint8))
+    return str(inputDir), str(tmp_path / "undistorted")
+
+
+def test_remove_distortion_batch(calibration, session):
+    inputDir, outputDir = session
+
+    savedPaths = remove_distortion_batch(*calibration, inputDir, outputDir, workers=2)
+
+    assert [os.path.basename(path) for path in savedPaths] == ["a.png", "b.png", "c.png"]
+    for path in savedPaths:
+        img = cv2.imread(os.path.join(inputDir, os.path.basename(path)))
+        newCameraMatrix, _ = cv2.getOptimalNewCameraMatrix(*calibration, (160, 120), 0.3, (160, 120))
+        expected = cv2.undistort(img, *calibration, None, newCameraMatrix)
+        assert np.abs(cv2.imread(path).astype(int) - expected).mean() < 2.0
+
+
+def test_remove_distortion_batch_crop_to_roi(calibration, session):
+    inputDir, outputDir = session
+
+    savedPaths = remove_distortion_batch(*calibration, inputDir, outputDir, cropToRoi=True)
+
+    _, (x, y, w, h) = cv2.getOptimalNewCameraMatrix(*calibration, (160, 120), 0.3, (160, 120))
+    assert cv2.imread(savedPaths[0]).shape[:2] == (h, w)
+
+
+def test_remove_distortion_batch_invalid_paths(calibration, session):
+    inputDir, _ = session
+
+    with pytest.raises(ImgToUndistortPathNotProvided):
+        remove_distortion_batch(*calibration, "", "/fake/output/")
+
+    with pytest.raises(ValueError):
+        remove_distortion_batch(*calibration, inputDir, inputDir)
@@ -0,0 +1,85 @@
+import cv2
+import numpy as np
+import pytest
+from zaowr_polsl_kisiel.calibration import select_calibration_views
+
+IMAGE_SIZE = (640, 480)
+CAMERA_MATRIX = np.array([[640.0, 0, 320], [0, 640.0, 240], [0, 0, 1]])
+
+
+@pytest.fixture
+def board_views():
+    objP = np.zeros((9 * 6, 3), np.float32)
+    objP[:, :2] = np.mgrid[0:9, 0:6].T.reshape(-1, 2) * 20.0
+    objP -= objP.mean(axis=0)
+
+    # A few distinct poses, every one repeated many times with a small jitter (like frames of a video)
+    rng = np.random.default_rng(0)
+    poses = [
+        ((0.0, 0.0, 0.0), (0.0, 0.0, 600.0)),
+        ((0.5, 0.0, 0.0), (-120.0, -80.0, 700.0)),
+        ((0.0, 0.5, 0.0), (120.0, 80.0, 700.0)),
+        ((-0.5, 0.0, 0.1), (120.0, -80.0, 650.0)),
+        ((0.0, -0.5, -0.1), (-120.0, 80.0, 650.0)),
+    ]
+    objPoints, imgPoints, tilts = [], [], []
+    for rvec, tvec in poses:
+        for _ in range(20):
+            jitter = rng.normal(0.0, 0.005, 3)
+            points, _ = cv2.projectPoints(objP, np.array(rvec) + jitter, np.array(tvec), CAMERA_MATRIX, None)
+            objPoints.append(objP.reshape(-1, 1, 3))
+            imgPoints.append(points.astype(np.float32))
+            tilts.append(rvec[:2])
+
+    return objPoints, imgPoints, np.degrees(tilts)
+
+
+def test_select_calibration_views_minimal_subset(board_views):
+    objPoints, imgPoints, _ = board_views
+
+    results = select_calibration_views(objPoints, imgPoints, IMAGE_SIZE, coverageDepth=1, verbose=False)
+
+    # One view per distinct pose is enough to cover everything the 100 views cover
+    assert len(results["selected"]) <= 5
+    assert len({view // 20 for view in results["selected"]}) == len(results["selected"])
+    assert results["coverageSelected"] == results["coverage"]
+    assert results["poseBinsSelected"] == results["poseBins"]
+    assert results["selected"] == sorted(results["order"])
+
+
+def test_select_calibration_views_heatmaps_and_tilts(board_views):
+    objPoints, imgPoints, tilts = board_views
+
+    results = select_calibration_views(objPoints, imgPoints, IMAGE_SIZE, imgPoints_right=imgPoints, gridSize=(4, 3), verbose=False)
+
+    assert results["heatmap"].shape == (3, 4)
+    assert results["heatmap"].sum() == sum(len(points) for points in imgPoints)
+    assert results["heatmapSelected"].sum() == sum(len(imgPoints[view]) for view in results["selected"])
+    np.testing.assert_array_equal(results["heatmap_right"], results["heatmap"])
+
+    # The tilt is estimated with an approximate camera matrix equal to the true one here
+    np.testing.assert_allclose(np.abs(results["tilts"]), np.abs(tilts), atol=3.0)
+
+
+def test_select_calibration_views_max_views(board_views):
+    objPoints, imgPoints, _ = board_views
+
+    results = select_calibration_views(objPoints, imgPoints, IMAGE_SIZE, maxViews=3, verbose=False)
+
+    assert len(results["selected"]) == 3
+    assert results["coverageSelected"] <= results["coverage"]
+
+
+@pytest.mark.parametrize("kwargs", [{"maxViews": 0}, {"coverageDepth": 0}, {"tiltBinSize": -1.0}, {"gridSize": (0, 3)}])
+def test_select_calibration_views_invalid_params(board_views, kwargs):
+    objPoints, imgPoints, _ = board_views
+
+    with pytest.raises(ValueError):
+        select_calibration_views(objPoints, imgPoints, IMAGE_SIZE, verbose=False, **kwargs)
+
+
+def test_select_calibration_views_mismatched_views(board_views):
+    objPoints, imgPoints, _ = board_views
+
+    with pytest.raises(ValueError):
+        select_calibration_views(objPoints[:-1], imgPoints, IMAGE_SIZE, verbose=False)
@@ -74,3 +74,122 @@ def test_corner_detection_failure(mock_stereo_calibration):
             calibImgDirPath_right="/fake/path/right",
             useCharuco=True,
         )
+
+
+def render_stereo_views(boardImg, outputDir, numViews=6):
+    import cv2
+
+    h, w = boardImg.shape[:2]
+    src = np.float32([[0, 0], [w, 0], [w, h], [0, h]])
+    for side, shift in (("left", 0), ("right", -40)):
+        (outputDir / side).mkdir(parents=True)
+        for i in range(numViews):
+            dx, dy = 25 * (i % 3), 20 * (i % 2)
+            dst = np.float32([[60 + dx, 40 + dy], [560 - 2 * dx, 60 + dy], [540 - dx, 420 - dy], [80 + 2 * dx, 440 - dy]])
+            dst[:, 0] += shift + 5 * i * (side == "right")
+            img = cv2.warpPerspective(boardImg, cv2.getPerspectiveTransform(src, dst), (640, 480), borderValue=255)
+            if side == "left" and i == numViews - 1:
+                img[:] = 255  # board not visible in the LEFT image of the last pair
+            cv2.imwrite(str(outputDir / side / f"{i:02d}.png"), cv2.cvtColor(img, cv2.COLOR_GRAY2BGR))
+    return str(outputDir / "left"), str(outputDir / "right")
+
+
+@pytest.mark.parametrize("useCharuco", [False, True])
+def test_stereo_calibration_workers_same_result(tmp_path, useCharuco, capsys):
+    import json
+    from cv2 import aruco
+
+    if useCharuco:
+        board = aruco.CharucoBoard((7, 5), 40.0, 30.0, aruco.getPredefinedDictionary(aruco.DICT_6X6_250))
+        boardImg = board.generateImage((700, 500), marginSize=20)
+    else:
+        squares = 40
+        board = (np.indices((8, 11)).sum(axis=0) % 2 * 255).astype(np.uint8)
+        boardImg = np.pad(np.kron(board, np.ones((squares, squares), dtype=np.uint8)), squares, constant_values=255)
+    left, right = render_stereo_views(boardImg, tmp_path / "images")
+
+    results = []
+    for workers in (1, 3):
+        paramsPath = str(tmp_path / f"stereo_{workers}.json")
+        stereo_calibration(
+            chessBoardSize=(7, 5) if useCharuco else (10, 7),
+            squareRealDimensions=40.0,
+            calibImgDirPath_left=left,
+            calibImgDirPath_right=right,
+            saveStereoCalibrationParams=True,
+            stereoCalibrationParamsPath=paramsPath,
+            showListOfImagesWithChessboardFound=True,
+            useCharuco=useCharuco,
+            markerLength=30.0,
+            workers=workers,
+        )
+        with open(paramsPath) as file:
+            results.append(json.load(file))
+
+        # The pair without the board in the LEFT image is skipped
+        assert "['05.png']" in capsys.readouterr().out
+
+    assert results[0] == results[1]
+
+
+def test_stereo_calibration_corner_cache(tmp_path, mocker):
+    import json
+    import os
+
+    squares = 40
+    board = (np.indices((8, 11)).sum(axis=0) % 2 * 255).astype(np.uint8)
+    boardImg = np.pad(np.kron(board, np.ones((squares, squares), dtype=np.uint8)), squares, constant_values=255)
+    left, right = render_stereo_views(boardImg, tmp_path / "images")
+
+    cacheDir = tmp_path / "cache"
+    results = []
+    for run, workers in enumerate((3, 1)):
+        if run == 1:
+            findCorners = mocker.patch("cv2.findChessboardCorners", side_effect=AssertionError("corners not cached"))
+
+        paramsPath = str(tmp_path / f"stereo_{run}.json")
+        stereo_calibration(
+            chessBoardSize=(10, 7),
+            squareRealDimensions=40.0,
+            calibImgDirPath_left=left,
+            calibImgDirPath_right=right,
+            saveStereoCalibrationParams=True,
+            stereoCalibrationParamsPath=paramsPath,
+            workers=workers,
+            cornerCacheDirPath=str(cacheDir),
+        )
+        with open(paramsPath) as file:
+            results.append(json.load(file))
+
+    findCorners.assert_not_called()
+    assert results[0] == results[1]
+    assert len(os.listdir(cacheDir)) == 12
+
+
+def test_stereo_calibration_select_views(tmp_path):
+    import json
+
+    squares = 40
+    board = (np.indices((8, 11)).sum(axis=0) % 2 * 255).astype(np.uint8)
+    boardImg = np.pad(np.kron(board, np.ones((squares, squares), dtype=np.uint8)), squares, constant_values=255)
+    left, right = render_stereo_views(boardImg, tmp_path / "images")
+
+    calibrationParamsPath_left = str(tmp_path / "left.json")
+    stereo_calibration(
+        chessBoardSize=(10, 7),
+        squareRealDimensions=40.0,
+        calibImgDirPath_left=left,
+        calibImgDirPath_right=right,
+        saveCalibrationParams=True,
+        calibrationParamsPath_left=calibrationParamsPath_left,
+        calibrationParamsPath_right=str(tmp_path / "right.json"),
+        saveStereoCalibrationParams=True,
+        stereoCalibrationParamsPath=str(tmp_path / "stereo.json"),
+        selectViews=True,
+        maxViews=3,
+    )
+    with open(calibrationParamsPath_left) as file:
+        params_left = json.load(file)
+
+    # Only the selected views (a subset of the 5 pairs with the board found) are used
+    assert 2 <= len(params_left["imgPoints"]) <= 3
@@ -130,3 +130,139 @@ def test_invalid_image_shapes(mock_stereo_rectify):
             T=np.array([1, 0, 0]),
         )
 
+
+
+def test_fused_crop_and_scale_matches_separate_passes():
+    import cv2
+    from zaowr_polsl_kisiel.image_processing.stereo_rectify import _fuse_crop_and_scale
+
+    cameraMatrix = np.array([[300.0, 0.0, 160.0], [0.0, 300.0, 120.0], [0.0, 0.0, 1.0]])
+    distortionCoefficients = np.array([-0.1, 0.02, 0.0, 0.0, 0.0])
+    R = cv2.Rodrigues(np.array([0.0, 0.02, 0.0]))[0]
+    T = np.array([[-0.1], [0.0], [0.0]])
+    imageSize = (320, 240)
+
+    R1, R2, P1, P2, _, roi1, roi2 = cv2.stereoRectify(
+        cameraMatrix, distortionCoefficients, cameraMatrix, distortionCoefficients, imageSize, R, T
+    )
+    fusedP1, _, fusedRoi1, _, outputSize = _fuse_crop_and_scale(P1, P2, roi1, roi2, imageSize, True, 0.5)
+
+    x, y = max(roi1[0], roi2[0]), max(roi1[1], roi2[1])
+    w = min(roi1[0] + roi1[2], roi2[0] + roi2[2]) - x
+    h = min(roi1[1] + roi1[3], roi2[1] + roi2[3]) - y
+    assert outputSize == (round(w * 0.5), round(h * 0.5))
+    assert fusedRoi1 == (0, 0, *outputSize)
+
+    # Smooth image, so the single remap and the three passes differ only by the interpolation error
+    xx, yy = np.meshgrid(np.arange(320), np.arange(240))
+    img = (127 + 60 * np.sin(xx / 15.0) + 60 * np.cos(yy / 11.0)).astype(np.uint8)
+
+    map1, map2 = cv2.initUndistortRectifyMap(cameraMatrix, distortionCoefficients, R1, P1, imageSize, cv2.CV_32FC1)
+    separate = cv2.resize(cv2.remap(img, map1, map2, cv2.INTER_LINEAR)[y:y + h, x:x + w], outputSize, interpolation=cv2.INTER_LINEAR)
+
+    map1, map2 = cv2.initUndistortRectifyMap(cameraMatrix, distortionCoefficients, R1, fusedP1, outputSize, cv2.CV_32FC1)
+    fused = cv2.remap(img, map1, map2, cv2.INTER_LINEAR)
+
+    assert fused.shape == separate.shape
+    assert np.abs(fused.astype(int) - separate.astype(int))[2:-2, 2:-2].mean() < 3.0
+
+
+def test_fused_crop_and_scale_invalid_scale():
+    from zaowr_polsl_kisiel.image_processing.stereo_rectify import _fuse_crop_and_scale
+
+    with pytest.raises(ValueError, match="outputScale"):
+        _fuse_crop_and_scale(np.eye(3, 4), np.eye(3, 4), (0, 0, 10, 10), (0, 0, 10, 10), (10, 10), outputScale=0)
+
+
+def test_interpolation_benchmark_results(tmp_path):
+    import cv2
+    import json
+
+    cameraMatrix = np.array([[300.0, 0.0, 80.0], [0.0, 300.0, 60.0], [0.0, 0.0, 1.0]])
+    distortionCoefficients = np.array([-0.1, 0.02, 0.0, 0.0, 0.0])
+    rng = np.random.default_rng(0)
+    for side in ("left", "right"):
+        (tmp_path / side).mkdir()
+        cv2.imwrite(str(tmp_path / side / "1.png"), rng.integers(0, 256, (120, 160, 3), dtype=np.uint8))
+
+    resultsPath = str(tmp_path / "benchmark" / "interpolation.json")
+    stereo_rectify(
+        calibImgDirPath_left=str(tmp_path / "left"),
+        calibImgDirPath_right=str(tmp_path / "right"),
+        cameraMatrix_left=cameraMatrix,
+        cameraMatrix_right=cameraMatrix,
+        distortionCoefficients_left=distortionCoefficients,
+        distortionCoefficients_right=distortionCoefficients,
+        R=cv2.Rodrigues(np.array([0.0, 0.02, 0.0]))[0],
+        T=np.array([[-0.1], [0.0], [0.0]]),
+        F=np.eye(3),
+        imgPoints_left=np.zeros((1, 4, 1, 2)),
+        imgPoints_right=np.zeros((1, 4, 1, 2)),
+        testInterpolationMethods=True,
+        benchmarkRepeats=5,
+        benchmarkWarmup=1,
+        benchmarkResultsPath=resultsPath,
+    )
+
+    with open(resultsPath) as file:
+        results = json.load(file)
+
+    assert results["imageSize"] == [160, 120]
+    assert results["repeats"] == 5
+    assert set(results["methods"]) == {"INTER_NEAREST", "INTER_LINEAR", "INTER_CUBIC", "INTER_LANCZOS4"}
+    assert results["methods"]["INTER_LANCZOS4"]["meanAbsDiff"] == 0.0
+    assert results["methods"]["INTER_LANCZOS4"]["psnr_dB"] is None
+    for methodResults in results["methods"].values():
+        assert 0 < methodResults["median_ms"] <= methodResults["p95_ms"]
+        assert methodResults["throughput_MPps"] > 0
+    assert results["methods"]["INTER_NEAREST"]["meanAbsDiff"] > results["methods"]["INTER_CUBIC"]["meanAbsDiff"]
+
+
+def test_interpolation_benchmark_report_labels(tmp_path, mocker, capsys):
+    import sys
+
+    import cv2
+
+    cameraMatrix = np.array([[300.0, 0.0, 80.0], [0.0, 300.0, 60.0], [0.0, 0.0, 1.0]])
+    for side in ("left", "right"):
+        (tmp_path / side).mkdir()
+        cv2.imwrite(str(tmp_path / side / "1.png"), np.zeros((120, 160, 3), dtype=np.uint8))
+
+    def method(throughput, psnr):
+        return {"median_ms": 0.0, "p95_ms": 0.0, "mean_ms": 0.0, "min_ms": 0.0, "throughput_MPps": throughput, "meanAbsDiff": 0.0, "psnr_dB": psnr}
+
+    # A method identical to the reference (not the reference itself) and a run too fast for the timer
+    mocker.patch.object(
+        sys.modules["zaowr_polsl_kisiel.image_processing.stereo_rectify"], "_benchmark_interpolation",
+        return_value={
+            "reference": "INTER_LANCZOS4",
+            "methods": {
+                "INTER_NEAREST": method(None, 30.0),
+                "INTER_LINEAR": method(10.0, None),
+                "INTER_LANCZOS4": method(10.0, None),
+            },
+        },
+    )
+    mocker.patch("cv2.imshow")
+    mocker.patch("cv2.waitKey")
+
+    stereo_rectify(
+        calibImgDirPath_left=str(tmp_path / "left"),
+        calibImgDirPath_right=str(tmp_path / "right"),
+        cameraMatrix_left=cameraMatrix,
+        cameraMatrix_right=cameraMatrix,
+        distortionCoefficients_left=np.zeros(5),
+        distortionCoefficients_right=np.zeros(5),
+        R=np.eye(3),
+        T=np.array([[-0.1], [0.0], [0.0]]),
+        F=np.eye(3),
+        imgPoints_left=np.zeros((1, 4, 1, 2)),
+        imgPoints_right=np.zeros((1, 4, 1, 2)),
+        testInterpolationMethods=True,
+    )
+
+    output = capsys.readouterr().out
+    nearest, linear, lanczos = (output.split(f"Interpolation type {name}:")[1].split("Interpolation type")[0] for name in ("INTER_NEAREST", "INTER_LINEAR", "INTER_LANCZOS4"))
+    assert "throughput: n/a" in nearest and "PSNR: 30.00 dB" in nearest
+    assert "PSNR: identical" in linear
+    assert "PSNR: reference" in lanczos
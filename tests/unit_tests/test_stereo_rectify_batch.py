@@ -0,0 +1,98 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+from zaowr_polsl_kisiel.custom_exceptions.exceptions import CalibrationImagesNotFound, MissingParameters
+from zaowr_polsl_kisiel.image_processing import stereo_rectify_batch
+
+
+@pytest.fixture
+def stereo_calibration():
+    cameraMatrix = np.array([[300.0, 0.0, 80.0], [0.0, 300.0, 60.0], [0.0, 0.0, 1.0]])
+    distortionCoefficients = np.array([-0.1, 0.02, 0.0, 0.0, 0.0])
+    R = cv2.Rodrigues(np.array([0.0, 0.02, 0.0]))[0]
+    T = np.array([[-0.1], [0.0], [0.0]])
+    return {
+        "cameraMatrix_left": cameraMatrix,
+        "cameraMatrix_right": cameraMatrix,
+        "distortionCoefficients_left": distortionCoefficients,
+        "distortionCoefficients_right": distortionCoefficients,
+        "R": R,
+        "T": T,
+    }
+
+
+@pytest.fixture
+def session(tmp_path):
+    leftDir, rightDir = tmp_path / "left_cam", tmp_path / "right_cam"
+    leftDir.mkdir()
+    rightDir.mkdir()
+    rng = np.random.default_rng(0)
+    for i in (3, 1, 2):
+        cv2.imwrite(str(leftDir / f"left_{i:03d}.png"), rng.integers(0, 256, (120, 160, 3), dtype=np.uint8))
+        cv2.imwrite(str(rightDir / f"right_{i:03d}.png"), rng.integers(0, 256, (120, 160, 3), dtype=np.uint8))
+    # Image without a counterpart
+    cv2.imwrite(str(leftDir / "left_004.png"), rng.integers(0, 256, (120, 160, 3), dtype=np.uint8))
+    return str(leftDir), str(rightDir), str(tmp_path / "rectified")
+
+
+def test_stereo_rectify_batch_pairs_by_name(stereo_calibration, session):
+    leftDir, rightDir, outputDir = session
+
+    savedPairs = stereo_rectify_batch(leftDir, rightDir, outputDir, workers=2, **stereo_calibration)
+
+    assert [(os.path.basename(left), os.path.basename(right)) for left, right in savedPairs] == [
+        ("left_001.png", "right_001.png"),
+        ("left_002.png", "right_002.png"),
+        ("left_003.png", "right_003.png"),
+    ]
+
+    R1, R2, P1, P2, _, _, _ = cv2.stereoRectify(
+        stereo_calibration["cameraMatrix_left"], stereo_calibration["distortionCoefficients_left"],
+        stereo_calibration["cameraMatrix_right"], stereo_calibration["distortionCoefficients_right"],
+        (160, 120), stereo_calibration["R"], stereo_calibration["T"]
+    )
+    map1, map2 = cv2.initUndistortRectifyMap(
+        stereo_calibration["cameraMatrix_right"], stereo_calibration["distortionCoefficients_right"], R2, P2, (160, 120), cv2.CV_16SC2
+    )
+    img = cv2.imread(os.path.join(rightDir, "right_002.png"))
+    expected = cv2.remap(img, map1, map2, cv2.INTER_LINEAR)
+    np.testing.assert_array_equal(cv2.imread(savedPairs[1][1]), expected)
+
+
+def test_stereo_rectify_batch_grayscale_and_map_store(stereo_calibration, session, tmp_path):
+    leftDir, rightDir, outputDir = session
+    mapsDir = str(tmp_path / "maps")
+
+    savedPairs = stereo_rectify_batch(leftDir, rightDir, outputDir, rectificationMapsPath=mapsDir, grayscale=True, **stereo_calibration)
+
+    assert len(os.listdir(mapsDir)) == 1
+    for left, right in savedPairs:
+        assert cv2.imread(left, cv2.IMREAD_UNCHANGED).shape == (120, 160)
+        assert cv2.imread(right, cv2.IMREAD_UNCHANGED).shape == (120, 160)
+
+    # Second run loads the maps from the store and gives the same result
+    secondPairs = stereo_rectify_batch(leftDir, rightDir, str(tmp_path / "rectified2"), rectificationMapsPath=mapsDir, grayscale=True, **stereo_calibration)
+    np.testing.assert_array_equal(cv2.imread(secondPairs[0][0]), cv2.imread(savedPairs[0][0]))
+
+
+def test_stereo_rectify_batch_missing_parameters(session):
+    leftDir, rightDir, outputDir = session
+    with pytest.raises(MissingParameters):
+        stereo_rectify_batch(leftDir, rightDir, outputDir)
+
+
+def test_stereo_rectify_batch_no_images(stereo_calibration, tmp_path):
+    with pytest.raises(CalibrationImagesNotFound):
+        stereo_rectify_batch(str(tmp_path), str(tmp_path), str(tmp_path / "out"), **stereo_calibration)
+
+
+def test_stereo_rectify_batch_crop_and_scale(stereo_calibration, session):
+    leftDir, rightDir, outputDir = session
+
+    savedPairs = stereo_rectify_batch(leftDir, rightDir, outputDir, cropToValidRoi=True, outputScale=0.5, **stereo_calibration)
+
+    left, right = cv2.imread(savedPairs[0][0]), cv2.imread(savedPairs[0][1])
+    assert left.shape == right.shape
+    assert left.shape[0] <= 60 and left.shape[1] <= 80
@@ -0,0 +1,92 @@
+import cv2
+import numpy as np
+import pytest
+from zaowr_polsl_kisiel.custom_exceptions.exceptions import MissingParameters
+from zaowr_polsl_kisiel.image_processing import stereo_rectify_stream
+from zaowr_polsl_kisiel.image_processing.stereo_rectify_stream import _pair_frames
+
+
+@pytest.fixture
+def stereo_calibration():
+    cameraMatrix = np.array([[300.0, 0.0, 80.0], [0.0, 300.0, 60.0], [0.0, 0.0, 1.0]])
+    distortionCoefficients = np.array([-0.1, 0.02, 0.0, 0.0, 0.0])
+    R = cv2.Rodrigues(np.array([0.0, 0.02, 0.0]))[0]
+    T = np.array([[-0.1], [0.0], [0.0]])
+    return {
+        "cameraMatrix_left": cameraMatrix,
+        "cameraMatrix_right": cameraMatrix,
+        "distortionCoefficients_left": distortionCoefficients,
+        "distortionCoefficients_right": distortionCoefficients,
+        "R": R,
+        "T": T,
+    }
+
+
+def write_video(path, frames):
+    height, width = frames[0].shape[:2]
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, (width, height))
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture
+def videos(tmp_path):
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (120, 160, 3), dtype=np.uint8) for _ in range(6)]
+    left = write_video(tmp_path / "left.avi", frames)
+    right = write_video(tmp_path / "right.avi", frames)
+    sideBySide = write_video(tmp_path / "sbs.avi", [np.hstack((frame, frame)) for frame in frames])
+    return left, right, sideBySide
+
+
+def test_stereo_rectify_stream_two_sources(stereo_calibration, videos):
+    left, right, _ = videos
+
+    pairs = list(stereo_rectify_stream(left, right, queueSize=2, **stereo_calibration))
+
+    assert len(pairs) == 6
+    assert [timestamp for _, _, timestamp in pairs] == pytest.approx([0, 100, 200, 300, 400, 500])
+    for rectified_left, rectified_right, _ in pairs:
+        assert rectified_left.shape == rectified_right.shape == (120, 160, 3)
+
+
+def test_stereo_rectify_stream_side_by_side_matches_two_sources(stereo_calibration, videos):
+    left, right, sideBySide = videos
+
+    pairs = list(stereo_rectify_stream(left, right, grayscale=True, **stereo_calibration))
+    sbsPairs = list(stereo_rectify_stream(sideBySide, grayscale=True, **stereo_calibration))
+
+    assert len(sbsPairs) == len(pairs)
+    assert sbsPairs[0][0].shape == (120, 160)
+    # Both streams are compressed differently (MJPG), so the frames are only approximately equal
+    assert np.abs(sbsPairs[0][0].astype(int) - pairs[0][0].astype(int)).mean() < 15.0
+
+
+def test_stereo_rectify_stream_close_early(stereo_calibration, videos):
+    left, right, _ = videos
+    capture = cv2.VideoCapture(right)
+
+    stream = stereo_rectify_stream(left, capture, queueSize=1, cropToValidRoi=True, outputScale=0.5, **stereo_calibration)
+    rectified_left, _, _ = next(stream)
+    stream.close()
+
+    assert rectified_left.shape[0] <= 60
+    # Captures provided by the caller are not released
+    assert capture.isOpened()
+    capture.release()
+
+
+def test_pair_frames_drops_unmatched_frames():
+    frames_left = iter([(0.0, "l0"), (33.0, "l1"), (66.0, "l2"), (100.0, "l3")])
+    frames_right = iter([(1.0, "r0"), (67.0, "r2"), (99.0, "r3")])
+
+    pairs = list(_pair_frames(frames_left, frames_right, maxTimeDifference=10.0))
+
+    assert [(left, right) for _, left, right in pairs] == [("l0", "r0"), ("l2", "r2"), ("l3", "r3")]
+
+
+def test_stereo_rectify_stream_missing_parameters(videos):
+    with pytest.raises(MissingParameters):
+        stereo_rectify_stream(videos[0], videos[1])
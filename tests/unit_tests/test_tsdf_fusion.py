@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from zaowr_polsl_kisiel.image_processing import TSDFVolume
+
+
+@pytest.fixture
+def frame():
+    cameraMatrix = np.array([[100.0, 0.0, 32.0], [0.0, 100.0, 24.0], [0.0, 0.0, 1.0]])
+    depthMap = np.full((48, 64), 1.0, dtype=np.float32)  # plane at z = 1
+    colorImg = np.zeros((48, 64, 3), dtype=np.uint8)
+    colorImg[..., 2] = 200  # red in BGR
+    return depthMap, cameraMatrix, colorImg
+
+
+def test_tsdf_volume_fuses_frames(frame):
+    depthMap, cameraMatrix, colorImg = frame
+    volume = TSDFVolume(voxelSize=0.01)
+
+    for tx in (0.0, 0.05, -0.05):
+        cameraPose = np.eye(4)
+        cameraPose[0, 3] = tx
+        assert volume.integrate(depthMap, cameraMatrix, cameraPose, colorImg) > 0
+
+    # Overlapping frames reuse the same blocks
+    blocks = len(volume)
+    volume.integrate(depthMap, cameraMatrix, None, colorImg)
+    assert len(volume) == blocks
+
+    verts, colors = volume.extract_point_cloud()
+    np.testing.assert_allclose(verts[:, 2], 1.0, atol=1e-4)
+    np.testing.assert_array_equal(colors, [[200, 0, 0]] * len(verts))
+
+    verts, colors, faces = volume.extract_mesh()
+    np.testing.assert_allclose(verts[:, 2], 1.0, atol=1e-4)
+    assert len(faces) > 0 and faces.max() < len(verts)
+
+
+def test_tsdf_volume_empty_and_invalid(frame):
+    depthMap, cameraMatrix, _ = frame
+    volume = TSDFVolume(voxelSize=0.01)
+
+    assert volume.integrate(np.zeros_like(depthMap), cameraMatrix) == 0
+
+    with pytest.raises(RuntimeError):
+        volume.extract_point_cloud()
+
+    with pytest.raises(ValueError):
+        volume.integrate(depthMap, cameraMatrix[:2])
+
+    with pytest.raises(TypeError):
+        TSDFVolume(voxelSize=1)
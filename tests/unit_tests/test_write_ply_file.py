@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from zaowr_polsl_kisiel.content_loaders import write_ply_file
+
+
+@pytest.fixture
+def point_cloud():
+    rng = np.random.default_rng(0)
+    verts = rng.uniform(-10, 10, (100, 3)).astype(np.float32)
+    colors = rng.integers(0, 256, (100, 3), dtype=np.uint8)
+    return verts, colors
+
+
+def read_header(path):
+    with open(path, "rb") as f:
+        lines = []
+        while True:
+            line = f.readline().decode("ascii").strip()
+            lines.append(line)
+            if line == "end_header":
+                return lines, f.read()
+
+
+def test_write_ply_file_ascii(tmp_path, point_cloud):
+    verts, colors = point_cloud
+    path = str(tmp_path / "cloud.ply")
+
+    write_ply_file(path, verts, colors)
+
+    header, body = read_header(path)
+    assert header[1] == "format ascii 1.0"
+    assert header[2] == "element vertex 100"
+
+    rows = np.loadtxt(body.decode("ascii").splitlines())
+    np.testing.assert_allclose(rows[:, :3], verts, atol=1e-5)
+    np.testing.assert_array_equal(rows[:, 3:], colors)
+
+
+def test_write_ply_file_binary(tmp_path, point_cloud):
+    verts, colors = point_cloud
+    path = str(tmp_path / "cloud.ply")
+
+    write_ply_file(path, verts, colors, plyFormat="binary_little_endian")
+
+    header, body = read_header(path)
+    assert header[1] == "format binary_little_endian 1.0"
+    assert header[2] == "element vertex 100"
+    assert len(body) == 100 * 15
+
+    data = np.frombuffer(body, dtype=[("xyz", "<f4", 3), ("rgb", "u1", 3)])
+    np.testing.assert_array_equal(data["xyz"], verts)
+    np.testing.assert_array_equal(data["rgb"], colors)
+
+
+def test_write_ply_file_binary_chunks(tmp_path, point_cloud):
+    verts, colors = point_cloud
+    path = str(tmp_path / "cloud.ply")
+
+    chunks = ((verts[i:i + 30], colors[i:i + 30]) for i in range(0, len(verts), 30))
+    write_ply_file(path, chunks, plyFormat="binary_little_endian")
+
+    header, body = read_header(path)
+    assert header[2].split() == ["element", "vertex", "100"]
+
+    data = np.frombuffer(body, dtype=[("xyz", "<f4", 3), ("rgb", "u1", 3)])
+    np.testing.assert_array_equal(data["xyz"], verts)
+    np.testing.assert_array_equal(data["rgb"], colors)
+
+
+def test_write_ply_file_invalid_format(tmp_path, point_cloud):
+    verts, colors = point_cloud
+    with pytest.raises(ValueError):
+        write_ply_file(str(tmp_path / "cloud.ply"), verts, colors, plyFormat="binary_big_endian")
+
+
+def test_write_ply_file_length_mismatch(tmp_path, point_cloud):
+    verts, colors = point_cloud
+    with pytest.raises(ValueError):
+        write_ply_file(str(tmp_path / "cloud.ply"), verts, colors[:50])
+
+
+def test_write_ply_file_faces(tmp_path, point_cloud):
+    verts, colors = point_cloud
+    faces = np.array([[0, 1, 2], [2, 1, 3]])
+    path = str(tmp_path / "mesh.ply")
+
+    write_ply_file(path, verts, colors, faces=faces)
+
+    header, body = read_header(path)
+    assert header[9:11] == ["element face 2", "property list uchar int vertex_indices"]
+    assert body.decode("ascii").splitlines()[-2:] == ["3 0 1 2", "3 2 1 3"]
+
+    with pytest.raises(ValueError):
+        write_ply_file(path, verts, colors, faces=np.array([[0, 1, 100]]))